@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from app.api.exchange_rates.conditional import conditional_request_dependency
 from app.core.dependencies import exchange_rate_service_dependency
 from app.schema.date_list_response import DateListResponse
 from app.services.exchange_rate_service import ExchangeRateServiceInterface
@@ -7,7 +8,7 @@ from app.services.exchange_rate_service import ExchangeRateServiceInterface
 router = APIRouter()
 
 
-@router.get("/available_dates")
+@router.get("/available_dates", dependencies=[conditional_request_dependency])
 async def available_dates(
     exchange_rate_service: ExchangeRateServiceInterface = exchange_rate_service_dependency,
 ) -> DateListResponse:
@@ -0,0 +1,63 @@
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import UTC, date
+from email.utils import format_datetime
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from app.api.exchange_rates.negotiation import JSON_MEDIA_TYPE, negotiate_media_type
+from app.core.dependencies import exchange_rate_service_dependency
+from app.services.exchange_rate_service import ExchangeRateServiceInterface
+
+
+def build_etag(version: int, today: date, media_type: str = JSON_MEDIA_TYPE) -> str:
+    # Defaulted date ranges move with the calendar, so responses can change daily without a write
+    tag = f"{version}-{today.isoformat()}"
+    if media_type != JSON_MEDIA_TYPE:
+        # Each representation of a URL gets its own tag, e.g. "7-2025-04-03-csv"
+        tag += "-" + media_type.rsplit("/", 1)[-1].removeprefix("x-")
+    return f'"{tag}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def build_conditional_request(
+    media_types: Sequence[str] = (JSON_MEDIA_TYPE,),
+) -> Callable[[Request, Response, ExchangeRateServiceInterface], Awaitable[None]]:
+    """Build the conditional request dependency for an endpoint serving the given media types."""
+
+    async def conditional_request(
+        request: Request,
+        response: Response,
+        exchange_rate_service: ExchangeRateServiceInterface = exchange_rate_service_dependency,
+    ) -> None:
+        """Tag the response with the current data version, answering 304 if the client already has it.
+
+        Runs before the endpoint, so a matching If-None-Match skips all of the endpoint's work.
+        """
+        data_version = await exchange_rate_service.get_data_version()
+        media_type = negotiate_media_type(request.headers.get("accept"), media_types)
+        etag = build_etag(data_version.version, date.today(), media_type)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": format_datetime(data_version.updated_at.astimezone(UTC), usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+        if len(media_types) > 1:
+            # The representation served from the URL depends on Accept, including for 304s
+            headers["Vary"] = "Accept"
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+
+    return conditional_request
+
+
+conditional_request_dependency = Depends(build_conditional_request())
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from app.api.exchange_rates.conditional import conditional_request_dependency
 from app.core.dependencies import exchange_rate_service_dependency
 from app.schema.currency_pair_response import CurrencyPairData, CurrencyPairResponse
 from app.services.exchange_rate_service import ExchangeRateServiceInterface
@@ -11,6 +12,7 @@ router = APIRouter()
     "/available_currency_pairs",
     summary="Get available currency pairs",
     description="Returns a list of all supported currency pairs for exchange rate conversions.",
+    dependencies=[conditional_request_dependency],
 )
 async def currency_pairs(
     exchange_rate_service: ExchangeRateServiceInterface = exchange_rate_service_dependency,
@@ -0,0 +1,29 @@
+import base64
+import binascii
+from datetime import date
+from typing import Literal
+
+type SortOrder = Literal["asc", "desc"]
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(as_of: date, order: SortOrder) -> str:
+    """Encode the last as_of seen on a page into an opaque cursor for the next page."""
+    return base64.urlsafe_b64encode(f"{order}:{as_of.isoformat()}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: SortOrder) -> date:
+    try:
+        padded_cursor = cursor + "=" * (-len(cursor) % 4)
+        cursor_order, as_of = base64.urlsafe_b64decode(padded_cursor).decode().split(":", 1)
+        cursor_date = date.fromisoformat(as_of)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError("cursor is invalid") from e
+
+    if cursor_order != order:
+        raise InvalidCursorError("cursor does not match order")
+
+    return cursor_date
@@ -0,0 +1,29 @@
+from datetime import date, timedelta
+from typing import cast
+
+from app.models import AvailableDate
+
+
+def get_default_start_date() -> AvailableDate:
+    return cast(AvailableDate, date.today() - timedelta(days=365.25 * 10))
+
+
+def get_default_end_date() -> AvailableDate:
+    return cast(AvailableDate, date.today())
+
+
+def validate_date_range(start_date: date, end_date: date) -> list[str]:
+    """Return the validation errors of a requested date range, which cannot end after today."""
+    today = date.today()
+    validation_errors = []
+
+    if start_date > today:
+        validation_errors.append("start_date must be before or equal to today")
+
+    if end_date > today:
+        validation_errors.append("end_date must be before or equal to today")
+
+    if start_date > end_date:
+        validation_errors.append("start_date must be before or equal to end_date")
+
+    return validation_errors
@@ -0,0 +1,80 @@
+from datetime import date
+from functools import lru_cache
+
+from app.repositories.rate_series import RateSeries
+from app.schema.exchange_rate_response import HistoricalExchangeRateResponse
+from app.utils import RATE_DECIMAL_PLACES
+
+CSV_HEADER = "date,rate\n"
+
+# Same switch points as Decimal.__str__, which pydantic uses to serialize rates
+_MIN_PLAIN_ADJUSTED_EXPONENT = -6
+
+
+def format_fixed_point(value: int) -> str:
+    """Format a fixed-point rate exactly as str(from_fixed_point(value)), without going through Decimal."""
+    if value == 0:
+        return "0"
+
+    digits = str(value)
+    coefficient = digits.rstrip("0")
+    exponent = len(digits) - len(coefficient) - RATE_DECIMAL_PLACES
+    adjusted_exponent = exponent + len(coefficient) - 1
+
+    if exponent > 0 or adjusted_exponent < _MIN_PLAIN_ADJUSTED_EXPONENT:
+        mantissa = coefficient[0] + ("." + coefficient[1:] if len(coefficient) > 1 else "")
+        return f"{mantissa}E{adjusted_exponent:+d}"
+
+    if exponent == 0:
+        return coefficient
+
+    point = len(coefficient) + exponent
+    if point > 0:
+        return coefficient[:point] + "." + coefficient[point:]
+
+    return "0." + "0" * -point + coefficient
+
+
+@lru_cache(maxsize=16_384)
+def _format_date_ordinal(ordinal: int) -> str:
+    return date.fromordinal(ordinal).isoformat()
+
+
+def encode_rate_series(series: RateSeries) -> str:
+    """Encode the series as a JSON array of ExchangeRateData objects, straight from its columns."""
+    return (
+        "["
+        + ",".join(
+            f'{{"rate":"{format_fixed_point(rate)}","date":"{_format_date_ordinal(ordinal)}"}}'
+            for ordinal, rate in zip(series.date_ordinals, series.rates, strict=True)
+        )
+        + "]"
+    )
+
+
+def encode_historical_response(envelope: HistoricalExchangeRateResponse, series: RateSeries) -> bytes:
+    """Encode a historical response whose data is the series, byte for byte as pydantic would.
+
+    The envelope is built with empty data and encoded by pydantic; only the rows, which make up
+    nearly all of the body, are encoded directly from the series.
+    """
+    if envelope.data:
+        raise ValueError("envelope data must be empty")
+
+    return envelope.model_dump_json().replace('"data":[]', f'"data":{encode_rate_series(series)}', 1).encode()
+
+
+def encode_csv_rows(series: RateSeries) -> str:
+    """Encode the series as date,rate CSV lines, to follow CSV_HEADER."""
+    return "".join(
+        f"{_format_date_ordinal(ordinal)},{format_fixed_point(rate)}\n"
+        for ordinal, rate in zip(series.date_ordinals, series.rates, strict=True)
+    )
+
+
+def encode_ndjson_rows(series: RateSeries) -> str:
+    """Encode the series as one ExchangeRateData JSON object per line."""
+    return "".join(
+        f'{{"rate":"{format_fixed_point(rate)}","date":"{_format_date_ordinal(ordinal)}"}}\n'
+        for ordinal, rate in zip(series.date_ordinals, series.rates, strict=True)
+    )
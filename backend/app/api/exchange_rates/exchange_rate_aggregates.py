@@ -0,0 +1,114 @@
+from datetime import date
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from pydantic import BaseModel, Field
+
+from app.api.exchange_rates.conditional import conditional_request_dependency
+from app.api.exchange_rates.cursor import SortOrder
+from app.api.exchange_rates.date_range import get_default_end_date, get_default_start_date, validate_date_range
+from app.api.exchange_rates.response_caching import get_cached_response
+from app.core.dependencies import exchange_rate_service_dependency
+from app.models import AvailableDate, Currency
+from app.repositories.rate_series import AggregateInterval
+from app.schema.exchange_rate_response import RateAggregateData, RateAggregatesResponse
+from app.services.exchange_rate_service import ExchangeRateServiceInterface
+
+router = APIRouter()
+
+
+DEFAULT_WINDOW = 20
+MAX_WINDOW = 365
+
+
+class ExchangeRateAggregatesQueryParams(BaseModel):
+    start_date: AvailableDate = Field(default_factory=get_default_start_date)
+    end_date: AvailableDate = Field(default_factory=get_default_end_date)
+    interval: AggregateInterval = Field(default="monthly")
+    window: int = Field(default=DEFAULT_WINDOW, ge=2, le=MAX_WINDOW, description="Intervals per rolling window")
+    order: SortOrder = Field(default="desc")
+
+
+@router.get(
+    "/{base_currency_code}/{quote_currency_code}/aggregates",
+    response_model=RateAggregatesResponse,
+    dependencies=[conditional_request_dependency],
+)
+async def exchange_rate_aggregates(
+    base_currency_code: Currency,
+    quote_currency_code: Currency,
+    query_params: Annotated[ExchangeRateAggregatesQueryParams, Query()],
+    response: Response,
+    exchange_rate_service: ExchangeRateServiceInterface = exchange_rate_service_dependency,
+) -> Response:
+    start_date = query_params.start_date
+    end_date = query_params.end_date
+
+    validation_errors = validate_date_range(start_date, end_date)
+    if validation_errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="; ".join(validation_errors),
+        )
+
+    cache_key = (
+        "aggregates",
+        str(base_currency_code),
+        str(quote_currency_code),
+        start_date,
+        end_date,
+        query_params.interval,
+        query_params.window,
+        query_params.order,
+    )
+    content = await get_cached_response(
+        exchange_rate_service,
+        cache_key,
+        lambda: _encode_exchange_rate_aggregates(
+            exchange_rate_service,
+            base_currency_code=base_currency_code,
+            quote_currency_code=quote_currency_code,
+            start_date=start_date,
+            end_date=end_date,
+            interval=query_params.interval,
+            window=query_params.window,
+            order=query_params.order,
+        ),
+    )
+
+    # Returning a Response skips model validation, so carry over headers set by dependencies (e.g. ETag)
+    return Response(content=content, media_type="application/json", headers=dict(response.headers))
+
+
+async def _encode_exchange_rate_aggregates(
+    exchange_rate_service: ExchangeRateServiceInterface,
+    base_currency_code: Currency,
+    quote_currency_code: Currency,
+    start_date: date,
+    end_date: date,
+    interval: AggregateInterval,
+    window: int,
+    order: SortOrder,
+) -> bytes:
+    aggregates = await exchange_rate_service.get_rate_aggregates(
+        base_currency_code=base_currency_code,
+        quote_currency_code=quote_currency_code,
+        start_date=start_date,
+        end_date=end_date,
+        interval=interval,
+        window=window,
+    )
+    if order == "desc":
+        aggregates.reverse()
+
+    return (
+        RateAggregatesResponse(
+            base_currency_code=base_currency_code,
+            quote_currency_code=quote_currency_code,
+            interval=interval,
+            window=window,
+            data=[RateAggregateData.from_aggregate(aggregate) for aggregate in aggregates],
+        )
+        .model_dump_json()
+        .encode()
+    )
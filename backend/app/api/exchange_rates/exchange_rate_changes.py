@@ -0,0 +1,26 @@
+from fastapi import APIRouter, HTTPException, status
+
+from app.api.exchange_rates.conditional import conditional_request_dependency
+from app.core.dependencies import exchange_rate_service_dependency
+from app.models import Currency
+from app.schema.exchange_rate_response import ExchangeRateChangesResponse
+from app.services.exchange_rate_service import ExchangeRateServiceInterface
+
+router = APIRouter()
+
+
+@router.get("/{base_currency_code}/{quote_currency_code}/changes", dependencies=[conditional_request_dependency])
+async def exchange_rate_changes(
+    base_currency_code: Currency,
+    quote_currency_code: Currency,
+    exchange_rate_service: ExchangeRateServiceInterface = exchange_rate_service_dependency,
+) -> ExchangeRateChangesResponse:
+    changes = await exchange_rate_service.get_rate_changes(base_currency_code, quote_currency_code)
+
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No exchange rate changes found for {base_currency_code}/{quote_currency_code}",
+        )
+
+    return ExchangeRateChangesResponse.from_models(base_currency_code, quote_currency_code, changes)
@@ -1,11 +1,31 @@
-from datetime import date, timedelta
-from typing import Annotated, Literal, cast
+from collections.abc import AsyncIterator
+from datetime import date
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from app.api.exchange_rates.conditional import build_conditional_request
+from app.api.exchange_rates.cursor import InvalidCursorError, SortOrder, decode_cursor, encode_cursor
+from app.api.exchange_rates.date_range import get_default_end_date, get_default_start_date, validate_date_range
+from app.api.exchange_rates.encoding import (
+    CSV_HEADER,
+    encode_csv_rows,
+    encode_historical_response,
+    encode_ndjson_rows,
+)
+from app.api.exchange_rates.negotiation import (
+    CSV_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    negotiate_media_type,
+)
+from app.api.exchange_rates.response_caching import get_cached_response
+from app.core.config import settings
 from app.core.dependencies import exchange_rate_service_dependency
 from app.models import AvailableDate, Currency
+from app.repositories.rate_series import DEFAULT_LTTB_POINTS, RateSeries, Resolution
 from app.schema.exchange_rate_response import (
     ExchangeRateData,
     HistoricalExchangeRateResponse,
@@ -15,17 +35,12 @@ from app.services.exchange_rate_service import ExchangeRateServiceInterface
 router = APIRouter()
 
 
-def get_default_start_date() -> AvailableDate:
-    return cast(AvailableDate, date.today() - timedelta(days=365.25 * 10))
-
-
-def get_default_end_date() -> AvailableDate:
-    return cast(AvailableDate, date.today())
-
-
 DEFAULT_PAGE = 1
 DEFAULT_SIZE = 1_000
 MAX_RECORDS_PER_REQUEST = DEFAULT_SIZE
+EXPORT_MEDIA_TYPES = (CSV_MEDIA_TYPE, NDJSON_MEDIA_TYPE)
+# JSON first, as the default when Accept names none of them
+MEDIA_TYPES = (JSON_MEDIA_TYPE, *EXPORT_MEDIA_TYPES)
 
 
 class HistoricalExchangeRatesQueryParams(BaseModel):
@@ -33,46 +48,124 @@ class HistoricalExchangeRatesQueryParams(BaseModel):
     end_date: AvailableDate = Field(default_factory=get_default_end_date)
     page: int = Field(default=DEFAULT_PAGE, ge=1)
     size: int = Field(default=DEFAULT_SIZE, ge=1, le=MAX_RECORDS_PER_REQUEST)
-    order: Literal["asc", "desc"] = Field(default="desc")
-
-
-@router.get("/{base_currency_code}/{quote_currency_code}/historical")
+    order: SortOrder = Field(default="desc")
+    cursor: str | None = Field(default=None)
+    include_total: bool = Field(default=True)
+    resolution: Resolution = Field(default="daily")
+    points: int = Field(default=DEFAULT_LTTB_POINTS, ge=3, le=MAX_RECORDS_PER_REQUEST)
+
+
+@router.get(
+    "/{base_currency_code}/{quote_currency_code}/historical",
+    response_model=HistoricalExchangeRateResponse,
+    responses={200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES}}},
+    dependencies=[Depends(build_conditional_request(MEDIA_TYPES))],
+)
 async def historical_exchange_rates(
     base_currency_code: Currency,
     quote_currency_code: Currency,
     query_params: Annotated[HistoricalExchangeRatesQueryParams, Query()],
+    request: Request,
+    response: Response,
     exchange_rate_service: ExchangeRateServiceInterface = exchange_rate_service_dependency,
-) -> HistoricalExchangeRateResponse:
+) -> Response:
     start_date = query_params.start_date
     end_date = query_params.end_date
     size = query_params.size
     page = query_params.page
     order = query_params.order
+    cursor = query_params.cursor
 
-    offset = (page - 1) * size
-
-    today = date.today()
     validation_errors = []
 
-    if base_currency_code != Currency("USD") and quote_currency_code != Currency("USD"):
-        validation_errors.append("At least one currency must be USD")
-
-    if start_date > today:
-        validation_errors.append("start_date must be before or equal to today")
-
-    if end_date > today:
-        validation_errors.append("end_date must be before or equal to today")
-
-    if start_date > end_date:
-        validation_errors.append("start_date must be before or equal to end_date")
-
+    after: date | None = None
+    offset: int | None = (page - 1) * size
+    if cursor is not None:
+        offset = None
+        if page != DEFAULT_PAGE:
+            validation_errors.append("page cannot be combined with cursor")
+        try:
+            after = decode_cursor(cursor, order)
+        except InvalidCursorError as e:
+            validation_errors.append(str(e))
+
+    validation_errors.extend(validate_date_range(start_date, end_date))
     if validation_errors:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="; ".join(validation_errors),
         )
 
-    exchange_rates, total = await exchange_rate_service.get_historical_rates(
+    # JSON and the exports are served from the same URL; the conditional request dependency sets Vary
+    media_type = negotiate_media_type(request.headers.get("accept"), MEDIA_TYPES)
+    if media_type in EXPORT_MEDIA_TYPES:
+        # Bulk export: the whole date range in one streamed response, without pagination
+        chunks = exchange_rate_service.iter_historical_rates(
+            base_currency_code=base_currency_code,
+            quote_currency_code=quote_currency_code,
+            start_date=start_date,
+            end_date=end_date,
+            sort_order=order,
+        )
+        headers = dict(response.headers)
+        if media_type == CSV_MEDIA_TYPE:
+            filename = f"{base_currency_code}-{quote_currency_code}-{start_date}-{end_date}.csv"
+            headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return StreamingResponse(_encode_export(chunks, media_type), media_type=media_type, headers=headers)
+
+    cache_key = (
+        str(base_currency_code),
+        str(quote_currency_code),
+        start_date,
+        end_date,
+        page,
+        size,
+        order,
+        cursor,
+        query_params.include_total,
+        query_params.resolution,
+        query_params.points,
+    )
+    content = await get_cached_response(
+        exchange_rate_service,
+        cache_key,
+        lambda: _encode_historical_exchange_rates(
+            exchange_rate_service,
+            base_currency_code=base_currency_code,
+            quote_currency_code=quote_currency_code,
+            start_date=start_date,
+            end_date=end_date,
+            page=page,
+            size=size,
+            offset=offset,
+            order=order,
+            after=after,
+            include_total=query_params.include_total,
+            resolution=query_params.resolution,
+            points=query_params.points,
+        ),
+    )
+
+    # Returning a Response skips model validation, so carry over headers set by dependencies (e.g. ETag)
+    return Response(content=content, media_type=JSON_MEDIA_TYPE, headers=dict(response.headers))
+
+
+async def _encode_historical_exchange_rates(
+    exchange_rate_service: ExchangeRateServiceInterface,
+    base_currency_code: Currency,
+    quote_currency_code: Currency,
+    start_date: date,
+    end_date: date,
+    page: int,
+    size: int,
+    offset: int | None,
+    order: SortOrder,
+    after: date | None,
+    include_total: bool,
+    resolution: Resolution,
+    points: int,
+) -> bytes:
+    series, total = await exchange_rate_service.get_historical_series(
         base_currency_code=base_currency_code,
         quote_currency_code=quote_currency_code,
         start_date=start_date,
@@ -80,16 +173,37 @@ async def historical_exchange_rates(
         limit=size,
         offset=offset,
         sort_order=order,
+        after=after,
+        include_total=include_total,
+        resolution=resolution,
+        points=points,
     )
 
-    exchange_rate_data = [ExchangeRateData.from_model(exchange_rate) for exchange_rate in exchange_rates]
-
-    return HistoricalExchangeRateResponse(
+    last_date = series.last_date
+    next_cursor = encode_cursor(last_date, order) if last_date is not None and len(series) == size else None
+    envelope = HistoricalExchangeRateResponse(
         base_currency_code=base_currency_code,
         quote_currency_code=quote_currency_code,
-        data=exchange_rate_data,
+        data=[],
         total=total,
         page=page,
         size=size,
-        pages=(total + size - 1) // size,
+        pages=(total + size - 1) // size if total is not None else None,
+        next_cursor=next_cursor,
     )
+
+    if settings.fast_json_responses:
+        return encode_historical_response(envelope, series)
+
+    envelope.data = [ExchangeRateData(rate=rate, date=as_of) for as_of, rate in series]
+    return envelope.model_dump_json().encode()
+
+
+async def _encode_export(chunks: AsyncIterator[RateSeries], media_type: str) -> AsyncIterator[str]:
+    if media_type == CSV_MEDIA_TYPE:
+        yield CSV_HEADER
+        async for chunk in chunks:
+            yield encode_csv_rows(chunk)
+    else:
+        async for chunk in chunks:
+            yield encode_ndjson_rows(chunk)
@@ -4,6 +4,7 @@ from typing import Annotated, cast
 from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel, Field
 
+from app.api.exchange_rates.conditional import conditional_request_dependency
 from app.core.dependencies import exchange_rate_service_dependency
 from app.models import AvailableDate, Currency
 from app.schema.exchange_rate_response import ExchangeRateResponse
@@ -20,7 +21,7 @@ class LatestExchangeRateQueryParams(BaseModel):
     desired_date: AvailableDate = Field(default_factory=get_default_desired_date)
 
 
-@router.get("/{base_currency_code}/{quote_currency_code}/latest")
+@router.get("/{base_currency_code}/{quote_currency_code}/latest", dependencies=[conditional_request_dependency])
 async def latest_exchange_rate(
     base_currency_code: Currency,
     quote_currency_code: Currency,
@@ -29,18 +30,7 @@ async def latest_exchange_rate(
 ) -> ExchangeRateResponse:
     desired_date = query_params.desired_date
 
-    validation_errors = []
-
-    if base_currency_code != Currency("USD") and quote_currency_code != Currency("USD"):
-        validation_errors.append("At least one currency must be USD")
-
-    if validation_errors:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="; ".join(validation_errors),
-        )
-
-    result = await exchange_rate_service.get_latest_rate(base_currency_code, quote_currency_code, desired_date)
+    result = await exchange_rate_service.get_latest_rate_value(base_currency_code, quote_currency_code, desired_date)
 
     if result is None:
         raise HTTPException(
@@ -48,4 +38,4 @@ async def latest_exchange_rate(
             detail=f"No exchange rate found for {base_currency_code} to {quote_currency_code} on {desired_date}",
         )
 
-    return ExchangeRateResponse.from_model(result)
+    return ExchangeRateResponse.from_value(result)
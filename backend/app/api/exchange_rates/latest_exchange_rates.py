@@ -0,0 +1,62 @@
+from datetime import date
+from typing import Annotated, cast
+
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import BaseModel, Field
+
+from app.api.exchange_rates.conditional import conditional_request_dependency
+from app.core.dependencies import exchange_rate_service_dependency
+from app.models import AvailableDate, Currency
+from app.schema.exchange_rate_response import LatestExchangeRatesData, LatestExchangeRatesResponse
+from app.services.exchange_rate_service import ExchangeRateServiceInterface
+
+router = APIRouter()
+
+
+def get_default_desired_date() -> AvailableDate:
+    return cast(AvailableDate, date.today())
+
+
+class LatestExchangeRatesQueryParams(BaseModel):
+    desired_date: AvailableDate = Field(default_factory=get_default_desired_date)
+    quotes: str | None = Field(default=None, description="Comma-separated quote currency codes (default: all)")
+
+
+@router.get("/{base_currency_code}/latest", dependencies=[conditional_request_dependency])
+async def latest_exchange_rates(
+    base_currency_code: Currency,
+    query_params: Annotated[LatestExchangeRatesQueryParams, Query()],
+    exchange_rate_service: ExchangeRateServiceInterface = exchange_rate_service_dependency,
+) -> LatestExchangeRatesResponse:
+    desired_date = query_params.desired_date
+
+    validation_errors = []
+
+    quote_currency_codes: list[Currency] | None = None
+    if query_params.quotes is not None:
+        quote_currency_codes = []
+        for code in query_params.quotes.split(","):
+            quote_currency_code = Currency(code.strip().upper())
+            if not quote_currency_code.is_valid():
+                validation_errors.append(f"Invalid quote currency code: {code.strip()}")
+            elif quote_currency_code not in quote_currency_codes:
+                quote_currency_codes.append(quote_currency_code)
+
+    if validation_errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="; ".join(validation_errors),
+        )
+
+    results = await exchange_rate_service.get_latest_rate_values(base_currency_code, quote_currency_codes, desired_date)
+
+    if not results:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No exchange rates found for {base_currency_code} on {desired_date}",
+        )
+
+    return LatestExchangeRatesResponse(
+        base_currency_code=base_currency_code,
+        data=[LatestExchangeRatesData.from_value(result) for result in results],
+    )
@@ -0,0 +1,62 @@
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import BaseModel, Field
+
+from app.api.exchange_rates.conditional import conditional_request_dependency
+from app.api.exchange_rates.cursor import SortOrder
+from app.api.exchange_rates.date_range import get_default_end_date, get_default_start_date, validate_date_range
+from app.core.dependencies import exchange_rate_service_dependency
+from app.models import AvailableDate, Currency, CurrencyPair
+from app.schema.exchange_rate_response import MultiPairHistoricalExchangeRateResponse
+from app.services.exchange_rate_service import ExchangeRateServiceInterface
+
+router = APIRouter()
+
+
+MAX_PAIRS_PER_REQUEST = 25
+
+
+class MultiPairHistoricalExchangeRatesQueryParams(BaseModel):
+    pairs: str = Field(description="Comma-separated currency pairs, e.g. USD-EUR,EUR-JPY")
+    start_date: AvailableDate = Field(default_factory=get_default_start_date)
+    end_date: AvailableDate = Field(default_factory=get_default_end_date)
+    order: SortOrder = Field(default="desc")
+
+
+@router.get("/historical", dependencies=[conditional_request_dependency])
+async def multi_pair_historical_exchange_rates(
+    query_params: Annotated[MultiPairHistoricalExchangeRatesQueryParams, Query()],
+    exchange_rate_service: ExchangeRateServiceInterface = exchange_rate_service_dependency,
+) -> MultiPairHistoricalExchangeRateResponse:
+    start_date = query_params.start_date
+    end_date = query_params.end_date
+
+    validation_errors = []
+
+    currency_pairs: list[CurrencyPair] = []
+    for pair in query_params.pairs.split(","):
+        currency_codes = [Currency(code.strip().upper()) for code in pair.split("-")]
+        if len(currency_codes) != 2 or not all(currency_code.is_valid() for currency_code in currency_codes):
+            validation_errors.append(f"Invalid currency pair: {pair.strip()}")
+            continue
+
+        currency_pair = CurrencyPair(base_currency_code=currency_codes[0], quote_currency_code=currency_codes[1])
+        if currency_pair not in currency_pairs:
+            currency_pairs.append(currency_pair)
+
+    if len(currency_pairs) > MAX_PAIRS_PER_REQUEST:
+        validation_errors.append(f"At most {MAX_PAIRS_PER_REQUEST} currency pairs can be requested")
+
+    validation_errors.extend(validate_date_range(start_date, end_date))
+    if validation_errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="; ".join(validation_errors),
+        )
+
+    series_list = await exchange_rate_service.get_historical_series_for_pairs(currency_pairs, start_date, end_date)
+
+    return MultiPairHistoricalExchangeRateResponse.from_series(
+        currency_pairs, series_list, descending=query_params.order == "desc"
+    )
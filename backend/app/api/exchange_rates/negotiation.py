@@ -0,0 +1,56 @@
+from collections.abc import Sequence
+
+JSON_MEDIA_TYPE = "application/json"
+CSV_MEDIA_TYPE = "text/csv"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def parse_accept(accept: str | None) -> dict[str, float]:
+    """Parse an Accept header into {media range: q-value}, lowercased. Ranges with an invalid q-value get 0."""
+    ranges: dict[str, float] = {}
+    for part in (accept or "").split(","):
+        media_range, *parameters = (item.strip() for item in part.split(";"))
+        if not media_range:
+            continue
+
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+                if not 0 <= quality <= 1:
+                    quality = 0.0
+        ranges[media_range.lower()] = quality
+
+    return ranges
+
+
+def negotiate_media_type(accept: str | None, media_types: Sequence[str]) -> str:
+    """Return the offered media type the Accept header prefers.
+
+    Each offer takes the q-value of the most specific range matching it (type/subtype, then type/*,
+    then */*). The highest q-value wins, then the more specific range, then the earlier offer. When
+    no offer is acceptable, or there is no Accept header, the first offer is the default.
+    """
+    ranges = parse_accept(accept)
+    best_media_type = media_types[0]
+    best_preference: tuple[float, int] | None = None
+    for media_type in media_types:
+        preference = _preference(ranges, media_type)
+        if preference is not None and preference[0] > 0 and (best_preference is None or preference > best_preference):
+            best_media_type, best_preference = media_type, preference
+
+    return best_media_type
+
+
+def _preference(ranges: dict[str, float], media_type: str) -> tuple[float, int] | None:
+    """Return (q-value, specificity) of the most specific range matching the media type, if any."""
+    main_type = media_type.split("/", 1)[0]
+    for specificity, media_range in ((2, media_type), (1, f"{main_type}/*"), (0, "*/*")):
+        if media_range in ranges:
+            return ranges[media_range], specificity
+
+    return None
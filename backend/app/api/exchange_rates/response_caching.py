@@ -0,0 +1,32 @@
+from collections.abc import Awaitable, Callable, Hashable
+
+from app.repositories.response_cache import historical_response_cache
+from app.repositories.shared_response_cache import shared_response_cache
+from app.services.exchange_rate_service import ExchangeRateServiceInterface
+
+
+async def get_cached_response(
+    exchange_rate_service: ExchangeRateServiceInterface,
+    key: tuple[Hashable, ...],
+    encode: Callable[[], Awaitable[bytes]],
+) -> bytes:
+    """Return the encoded response cached under the key at the current data version, encoding it on a miss.
+
+    The per-worker cache is checked first, then the shared cache, whose hits are copied into the
+    per-worker cache. Responses encoded on a miss are stored in both.
+    """
+    data_version = await exchange_rate_service.get_data_version()
+    cache_key = (*key, data_version.version)
+
+    content = historical_response_cache.get(cache_key)
+    if content is None and shared_response_cache is not None:
+        content = await shared_response_cache.get(cache_key)
+        if content is not None:
+            historical_response_cache.put(cache_key, content)
+    if content is None:
+        content = await encode()
+        historical_response_cache.put(cache_key, content)
+        if shared_response_cache is not None:
+            await shared_response_cache.put(cache_key, content)
+
+    return content
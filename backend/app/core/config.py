@@ -37,6 +37,10 @@ class Settings(BaseSettings):
         default_log_level = "DEBUG" if self.debug_mode else "INFO"
         return os.getenv("LOG_LEVEL", default_log_level).upper()
 
+    @cached_property
+    def fast_json_responses(self) -> bool:
+        return os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+
     @cached_property
     def open_exchange_rates_app_id(self) -> str | None:
         if self.is_test:
@@ -162,3 +166,35 @@ class FirebaseSettings(BaseSettings):
 
 
 firebase_settings = FirebaseSettings()
+
+
+class CacheSettings(BaseSettings):
+    @cached_property
+    def currency_pair_catalog_ttl_seconds(self) -> float:
+        return float(os.getenv("CURRENCY_PAIR_CATALOG_TTL_SECONDS", "300"))
+
+    @cached_property
+    def data_version_ttl_seconds(self) -> float:
+        return float(os.getenv("DATA_VERSION_TTL_SECONDS", "5"))
+
+    @cached_property
+    def response_cache_max_bytes(self) -> int:
+        return int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+    @cached_property
+    def shared_response_cache_enabled(self) -> bool:
+        return os.getenv("SHARED_RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+
+    @cached_property
+    def shared_response_cache_url(self) -> str:
+        # Database 1, so cached responses stay apart from the Celery broker in database 0
+        return os.getenv(
+            "SHARED_RESPONSE_CACHE_URL", f"redis://{celery_settings.redis_host}:{celery_settings.redis_port}/1"
+        )
+
+    @cached_property
+    def shared_response_cache_ttl_seconds(self) -> int:
+        return int(os.getenv("SHARED_RESPONSE_CACHE_TTL_SECONDS", "86400"))
+
+
+cache_settings = CacheSettings()
@@ -8,7 +8,7 @@ from typing import Any, Literal
 
 from app.core.config import settings
 
-type LogDomain = Literal["default", "celery", "email", "rate_refresh", "heartbeat", "firebase"]
+type LogDomain = Literal["default", "celery", "email", "rate_refresh", "heartbeat", "firebase", "cache"]
 
 
 class JSONLogFormatter(logging.Formatter):
@@ -1,10 +1,13 @@
-from datetime import date
-from typing import Any, cast
+import asyncio
+from datetime import date, timedelta
+from types import TracebackType
+from typing import Any, Self, cast
 
 import httpx
 from pydantic import BaseModel
 
 from app.core.config import settings
+from app.integrations.retry_policy import RequestMetrics, RetryPolicy, TokenBucket, parse_retry_after
 
 
 class OpenExchangeRatesError(Exception):
@@ -20,7 +23,9 @@ class RequestError(OpenExchangeRatesError):
 
 
 class RequestLimitError(OpenExchangeRatesError):
-    pass
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 class NotFoundError(OpenExchangeRatesError):
@@ -35,12 +40,58 @@ class HistoricalRatesResponse(BaseModel):
     rates: dict[str, float]
 
 
+class TimeSeriesResponse(BaseModel):
+    disclaimer: str
+    license: str
+    start_date: date
+    end_date: date
+    base: str
+    rates: dict[date, dict[str, float]]
+
+
 class OpenExchangeRatesClient:
-    def __init__(self, timeout: float = 30.0) -> None:
+    """Client for the Open Exchange Rates API.
+
+    Requests share one pooled, keep-alive connection pool. Use the client as an async
+    context manager (or call aclose()) to release the pool once a batch of requests is done:
+
+        async with OpenExchangeRatesClient() as client:
+            await client.historical_rates_for(date(2025, 1, 31))
+
+    Requests are paced by a token bucket, and timeouts, connection errors, 5xx responses
+    and RequestLimitError are retried according to the retry policy. Counters for requests,
+    retries and time spent waiting are kept in `metrics`.
+    """
+
+    MAX_CONNECTIONS = 10
+    MAX_KEEPALIVE_CONNECTIONS = 10
+    KEEPALIVE_EXPIRY_SECONDS = 30.0
+    TIME_SERIES_MAX_DAYS = 31
+    REQUESTS_PER_SECOND = 10.0
+    RETRYABLE_ERRORS = (httpx.TransportError, httpx.HTTPStatusError, RequestLimitError)
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_connections: int = MAX_CONNECTIONS,
+        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY_SECONDS,
+        http2: bool = False,
+        time_series_max_days: int = TIME_SERIES_MAX_DAYS,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: TokenBucket | None = None,
+    ) -> None:
         """Initialize the Open Exchange Rates API client.
 
         Args:
             timeout: Request timeout in seconds.
+            max_connections: Maximum number of concurrent connections in the pool.
+            max_keepalive_connections: Maximum number of idle connections kept open for reuse.
+            keepalive_expiry: Seconds an idle connection is kept open.
+            http2: Negotiate HTTP/2 when the server supports it (requires the h2 package).
+            time_series_max_days: Longest date range the plan allows in one time-series request.
+            retry_policy: Backoff policy for transient failures (default: RetryPolicy()).
+            rate_limiter: Token bucket pacing requests (default: REQUESTS_PER_SECOND, burst of max_connections).
 
         Raises:
             ValueError: If the API key is not set in the environment.
@@ -48,10 +99,51 @@ class OpenExchangeRatesClient:
         self.base_url = "https://openexchangerates.org/api"
         self.headers = {"Content-Type": "application/json"}
         self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.time_series_max_days = time_series_max_days
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter or TokenBucket(rate=self.REQUESTS_PER_SECOND, capacity=max_connections)
+        self.metrics = RequestMetrics()
         self.api_key = str(settings.open_exchange_rates_app_id)
         if not self.api_key:
             raise ValueError("OPEN_EXCHANGE_RATES_APP_ID is not set")
 
+        self._http_client: httpx.AsyncClient | None = None
+
+    async def __aenter__(self) -> Self:
+        self._get_http_client()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the connection pool. A new pool is opened on the next request."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+
+        return self._http_client
+
     async def historical_rates_for(self, date: date) -> HistoricalRatesResponse:
         """Fetch historical exchange rates for a specific date.
 
@@ -70,23 +162,94 @@ class OpenExchangeRatesClient:
         response = await self.get(f"historical/{date.strftime('%Y-%m-%d')}.json")
         return HistoricalRatesResponse.model_validate(response)
 
-    async def get(self, path: str) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            request_url = f"{self.base_url}/{path}"
-            params = {"app_id": self.api_key}
-            response = await client.get(request_url, headers=self.headers, params=params)
-
-            if response.status_code == 400:
-                error_data = response.json()
-                raise RequestError(f"{error_data['message']}: {error_data['description']}")
-            elif response.status_code in (401, 403):
-                error_data = response.json()
-                raise AuthenticationError(error_data["description"])
-            elif response.status_code in (404, 405):
-                raise NotFoundError(f"/api/{path} not found: {response.text}")
-            elif response.status_code == 429:
-                error_data = response.json()
-                raise RequestLimitError(error_data["description"])
-
-            response.raise_for_status()
-            return cast(dict[str, Any], response.json())
+    async def time_series_for(self, start_date: date, end_date: date) -> TimeSeriesResponse:
+        """Fetch daily historical exchange rates for a date range.
+
+        Ranges longer than time_series_max_days are split into consecutive requests
+        and merged into a single response.
+
+        Args:
+            start_date: The first date to fetch rates for.
+            end_date: The last date to fetch rates for (inclusive).
+
+        Returns:
+            TimeSeriesResponse: The parsed response with exchange rates keyed by date.
+
+        Raises:
+            AuthenticationError: If authentication fails or the plan does not include time-series.
+            RequestError: If the request is invalid.
+            NotFoundError: If the resource is not found.
+            RequestLimitError: If the API rate limit has been exceeded.
+        """
+        if start_date > end_date:
+            raise ValueError("start_date must be before or equal to end_date")
+
+        merged_response: TimeSeriesResponse | None = None
+        window_start = start_date
+        while window_start <= end_date:
+            window_end = min(window_start + timedelta(days=self.time_series_max_days - 1), end_date)
+            response = await self.get(
+                "time-series.json",
+                params={"start": window_start.strftime("%Y-%m-%d"), "end": window_end.strftime("%Y-%m-%d")},
+            )
+            window_response = TimeSeriesResponse.model_validate(response)
+
+            if merged_response is None:
+                merged_response = window_response
+            else:
+                merged_response.rates.update(window_response.rates)
+                merged_response.end_date = window_response.end_date
+
+            window_start = window_end + timedelta(days=1)
+
+        return cast(TimeSeriesResponse, merged_response)
+
+    async def get(self, path: str, params: dict[str, str] | None = None) -> dict[str, Any]:
+        attempt = 1
+        while True:
+            self.metrics.throttle_seconds += await self.rate_limiter.acquire()
+            self.metrics.requests += 1
+            try:
+                return await self._get_once(path, params)
+            except self.RETRYABLE_ERRORS as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+
+                self.metrics.retries += 1
+                self.metrics.backoff_seconds += delay
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float | None:
+        retry_after = None
+        if isinstance(error, httpx.HTTPStatusError):
+            if error.response.status_code < 500:
+                return None
+            retry_after = parse_retry_after(error.response.headers.get("Retry-After"))
+        elif isinstance(error, RequestLimitError):
+            retry_after = error.retry_after
+
+        return self.retry_policy.delay_for(attempt, retry_after)
+
+    async def _get_once(self, path: str, params: dict[str, str] | None = None) -> dict[str, Any]:
+        request_url = f"{self.base_url}/{path}"
+        params = {"app_id": self.api_key, **(params or {})}
+        response = await self._get_http_client().get(request_url, params=params)
+
+        if response.status_code == 400:
+            error_data = response.json()
+            raise RequestError(f"{error_data['message']}: {error_data['description']}")
+        elif response.status_code in (401, 403):
+            error_data = response.json()
+            raise AuthenticationError(error_data["description"])
+        elif response.status_code in (404, 405):
+            raise NotFoundError(f"/api/{path} not found: {response.text}")
+        elif response.status_code == 429:
+            error_data = response.json()
+            raise RequestLimitError(
+                error_data["description"], retry_after=parse_retry_after(response.headers.get("Retry-After"))
+            )
+
+        response.raise_for_status()
+        return cast(dict[str, Any], response.json())
@@ -0,0 +1,98 @@
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with jitter for transient request failures.
+
+    The n-th retry waits base_delay * 2^(n-1) seconds (capped at max_delay), scaled by a
+    random factor in [1 - jitter, 1 + jitter]. A server-provided Retry-After is used as-is,
+    unless it exceeds max_delay, in which case the request is not retried.
+    """
+
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    jitter: float = 0.5
+
+    def delay_for(self, attempt: int, retry_after: float | None = None) -> float | None:
+        """Return how long to wait before retrying after the given failed attempt, or None to give up."""
+        if attempt >= self.max_attempts:
+            return None
+
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+
+        delay: float = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((retry_at - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+class TokenBucket:
+    """Async token bucket limiting requests to `rate` per second with bursts of up to `capacity`."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take one token, waiting for the bucket to refill if needed. Returns the seconds spent waiting."""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+
+                delay = (1 - self.tokens) / self.rate
+                await self._sleep(delay)
+                waited += delay
+
+
+@dataclass
+class RequestMetrics:
+    requests: int = 0
+    retries: int = 0
+    backoff_seconds: float = 0.0
+    throttle_seconds: float = 0.0
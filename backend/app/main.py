@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 import os
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
@@ -12,6 +14,7 @@ from app.core.config import settings
 from app.core.database import register_orm
 from app.core.logger import default_logger, setup_logging
 from app.middleware.logging import LoggingMiddleware
+from app.repositories.shared_response_cache import listen_for_invalidations
 
 
 @asynccontextmanager
@@ -25,8 +28,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
         try:
             async with register_orm(app):
                 # db connected
+                invalidation_listener = asyncio.create_task(listen_for_invalidations())
                 yield
                 # app teardown
+                invalidation_listener.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await invalidation_listener
             # db connections closed
         except Exception as e:
             default_logger.error(
@@ -1,11 +1,26 @@
 from .available_date import AvailableDate
 from .currency import Currency
 from .currency_pair import CurrencyPair
+from .currency_pair_catalog_entry import CurrencyPairCatalogEntry
+from .data_version import DataVersion
 from .exchange_rate import ExchangeRate
+from .exchange_rate_change import CHANGE_PERIOD_DAYS, ChangePeriod, ExchangeRateChange
+from .exchange_rate_date import ExchangeRateDate
+from .exchange_rate_value import ExchangeRateValue
+from .refresh_ledger_entry import RefreshLedgerEntry, RefreshStatus
 
 __all__ = [
+    "CHANGE_PERIOD_DAYS",
     "AvailableDate",
+    "ChangePeriod",
     "Currency",
     "CurrencyPair",
+    "CurrencyPairCatalogEntry",
+    "DataVersion",
     "ExchangeRate",
+    "ExchangeRateChange",
+    "ExchangeRateDate",
+    "ExchangeRateValue",
+    "RefreshLedgerEntry",
+    "RefreshStatus",
 ]
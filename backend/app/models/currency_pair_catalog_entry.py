@@ -0,0 +1,21 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class CurrencyPairCatalogEntry(Model):
+    """
+    Model listing each stored currency pair with the date range of its rates.
+
+    Maintained alongside exchange_rates so pairs are listed without scanning it.
+    """
+
+    id: fields.IntField = fields.IntField(primary_key=True)
+    base_currency_code: fields.CharField = fields.CharField(max_length=3, null=False)
+    quote_currency_code: fields.CharField = fields.CharField(max_length=3, null=False)
+    first_date: fields.DateField = fields.DateField(null=False)
+    last_date: fields.DateField = fields.DateField(null=False)
+    updated_at: fields.DatetimeField = fields.DatetimeField(auto_now=True, null=False)
+
+    class Meta:
+        table = "currency_pairs"
+        unique_together = ("base_currency_code", "quote_currency_code")
@@ -0,0 +1,19 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class DataVersion(Model):
+    """
+    Model holding a single counter bumped whenever exchange rates are written.
+
+    Lets API responses be validated with ETags without reading the rates themselves.
+    """
+
+    CURRENT_ID = 1
+
+    id: fields.IntField = fields.IntField(primary_key=True)
+    version: fields.BigIntField = fields.BigIntField(default=0, null=False)
+    updated_at: fields.DatetimeField = fields.DatetimeField(auto_now=True, null=False)
+
+    class Meta:
+        table = "data_version"
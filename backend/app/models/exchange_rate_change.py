@@ -0,0 +1,34 @@
+from typing import Literal
+
+from tortoise import fields
+from tortoise.models import Model
+
+type ChangePeriod = Literal["1d", "7d", "30d", "ytd"]
+
+# Days before as_of to compare with; None compares with the previous year end
+CHANGE_PERIOD_DAYS: dict[ChangePeriod, int | None] = {"1d": 1, "7d": 7, "30d": 30, "ytd": None}
+
+
+class ExchangeRateChange(Model):
+    """
+    Model holding the change of each currency pair's latest rate over a period.
+
+    Maintained alongside exchange_rates so changes are read without scanning it. The comparison
+    rate is the last one on or before as_of minus the period (1d: the previous stored date, ytd:
+    the previous year end); periods without an earlier rate have no row.
+    """
+
+    id: fields.IntField = fields.IntField(primary_key=True)
+    base_currency_code: fields.CharField = fields.CharField(max_length=3, null=False)
+    quote_currency_code: fields.CharField = fields.CharField(max_length=3, null=False)
+    period: fields.CharField = fields.CharField(max_length=3, null=False)
+    as_of: fields.DateField = fields.DateField(null=False)
+    rate: fields.DecimalField = fields.DecimalField(max_digits=18, decimal_places=8, null=False)
+    previous_as_of: fields.DateField = fields.DateField(null=False)
+    previous_rate: fields.DecimalField = fields.DecimalField(max_digits=18, decimal_places=8, null=False)
+    change_percent: fields.DecimalField = fields.DecimalField(max_digits=18, decimal_places=8, null=False)
+    updated_at: fields.DatetimeField = fields.DatetimeField(auto_now=True, null=False)
+
+    class Meta:
+        table = "exchange_rate_changes"
+        unique_together = ("base_currency_code", "quote_currency_code", "period")
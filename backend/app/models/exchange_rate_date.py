@@ -0,0 +1,17 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class ExchangeRateDate(Model):
+    """
+    Model listing every date that has exchange rates stored.
+
+    Maintained alongside exchange_rates so available dates are read without scanning it.
+    """
+
+    as_of: fields.DateField = fields.DateField(primary_key=True)
+    # When rates on the date were last written, so readers can tell rewritten dates apart
+    updated_at: fields.DatetimeField = fields.DatetimeField(auto_now=True, null=False)
+
+    class Meta:
+        table = "available_dates"
@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+from app.models.currency import Currency
+from app.models.exchange_rate import ExchangeRate
+
+
+@dataclass(frozen=True, slots=True)
+class ExchangeRateValue:
+    """The fields responses read from an exchange rate, without hydrating an ExchangeRate model."""
+
+    base_currency_code: Currency
+    quote_currency_code: Currency
+    as_of: date
+    rate: Decimal
+
+    @classmethod
+    def from_model(cls, model: ExchangeRate) -> "ExchangeRateValue":
+        return cls(
+            base_currency_code=Currency(model.base_currency_code),
+            quote_currency_code=Currency(model.quote_currency_code),
+            as_of=model.as_of,
+            rate=model.rate,
+        )
+
+    def to_model(self) -> ExchangeRate:
+        return ExchangeRate(
+            rate=self.rate,
+            as_of=self.as_of,
+            base_currency_code=self.base_currency_code,
+            quote_currency_code=self.quote_currency_code,
+        )
@@ -0,0 +1,30 @@
+from enum import StrEnum
+
+from tortoise import fields
+from tortoise.models import Model
+
+
+class RefreshStatus(StrEnum):
+    PENDING = "pending"
+    SAVED = "saved"
+    FAILED = "failed"
+
+
+class RefreshLedgerEntry(Model):
+    """
+    Model recording the refresh progress of each date.
+
+    Lets interrupted refreshes resume without rescanning dates that are already saved.
+    """
+
+    as_of: fields.DateField = fields.DateField(primary_key=True)
+    status: RefreshStatus = fields.CharEnumField(RefreshStatus, max_length=10, null=False)
+    attempts: fields.IntField = fields.IntField(default=0, null=False)
+    fetched_at: fields.DatetimeField = fields.DatetimeField(null=True)
+    error: fields.TextField = fields.TextField(null=True)
+    created_at: fields.DatetimeField = fields.DatetimeField(auto_now_add=True, null=False)
+    updated_at: fields.DatetimeField = fields.DatetimeField(auto_now=True, null=False)
+
+    class Meta:
+        table = "refresh_ledger"
+        indexes = (("status", "as_of"),)
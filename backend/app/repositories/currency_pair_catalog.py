@@ -0,0 +1,78 @@
+import asyncio
+import time
+from datetime import date
+
+from app.core.config import cache_settings
+from app.models import Currency, CurrencyPair, CurrencyPairCatalogEntry
+
+type PairKey = tuple[str, str]
+
+
+class CurrencyPairCatalog:
+    """Per-worker, in-memory copy of the currency_pairs table.
+
+    Pairs are validated once per load, so listing them or looking up the date range of a
+    pair's rates does not touch the database until the catalog is invalidated or older than
+    the configured TTL.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.reset()
+
+    def reset(self) -> None:
+        self.pairs: list[CurrencyPair] = []
+        self.date_ranges: dict[PairKey, tuple[date, date]] = {}
+        self.loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl_seconds
+
+    def invalidate(self) -> None:
+        self.loaded_at = None
+
+    async def ensure_loaded(self) -> None:
+        if not self.is_stale:
+            return
+
+        async with self._lock:
+            if self.is_stale:
+                await self._load()
+
+    async def get_pairs(self) -> list[CurrencyPair]:
+        await self.ensure_loaded()
+        return self.pairs
+
+    async def get_date_range(self, base_currency_code: str, quote_currency_code: str) -> tuple[date, date] | None:
+        """Return the (first, last) dates with a stored rate for the pair, if it has any."""
+        await self.ensure_loaded()
+        # Currency overrides __eq__ without __hash__, so key on plain strings
+        return self.date_ranges.get((str(base_currency_code), str(quote_currency_code)))
+
+    async def _load(self) -> None:
+        entries = await CurrencyPairCatalogEntry.all().order_by("base_currency_code", "quote_currency_code")
+
+        pairs = []
+        date_ranges: dict[PairKey, tuple[date, date]] = {}
+        for entry in entries:
+            # Rates of pairs with invalid currencies are stored and served all the same
+            date_ranges[(entry.base_currency_code, entry.quote_currency_code)] = (entry.first_date, entry.last_date)
+            try:
+                pairs.append(
+                    CurrencyPair(
+                        base_currency_code=Currency(entry.base_currency_code),
+                        quote_currency_code=Currency(entry.quote_currency_code),
+                    )
+                )
+            except ValueError:
+                # Skip invalid currency pairs
+                continue
+
+        self.pairs = pairs
+        self.date_ranges = date_ranges
+        self.loaded_at = time.monotonic()
+
+
+currency_pair_catalog = CurrencyPairCatalog(ttl_seconds=cache_settings.currency_pair_catalog_ttl_seconds)
@@ -0,0 +1,82 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from app.core.config import cache_settings
+from app.models import DataVersion
+from app.repositories.currency_pair_catalog import currency_pair_catalog
+from app.repositories.rate_matrix import rate_matrix
+
+
+@dataclass(frozen=True)
+class DataVersionSnapshot:
+    version: int
+    updated_at: datetime
+
+
+EMPTY_DATA_VERSION = DataVersionSnapshot(version=0, updated_at=datetime(1970, 1, 1, tzinfo=UTC))
+
+
+class DataVersionCache:
+    """Per-worker copy of the data version, re-read at most once per TTL.
+
+    When a re-read finds a newer version (written by another worker or the refresh task),
+    the other in-memory caches are invalidated so they reload on their next use. The rate matrix
+    keeps serving the previous version's rates while it reloads in the background, so until it
+    is done the previous version is returned, and responses are neither tagged nor cached as the
+    newer version with older rates.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.reset()
+
+    def reset(self) -> None:
+        self.snapshot: DataVersionSnapshot | None = None
+        # Version the rate matrix serves while it reloads the newer one
+        self.previous_snapshot: DataVersionSnapshot | None = None
+        self.loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl_seconds
+
+    def invalidate(self) -> None:
+        self.loaded_at = None
+
+    async def get(self) -> DataVersionSnapshot:
+        if self.is_stale:
+            async with self._lock:
+                if self.is_stale:
+                    await self._load()
+
+        if self.previous_snapshot is not None and rate_matrix.is_stale:
+            # Starts the background reload when no read has yet
+            await rate_matrix.ensure_loaded()
+            if rate_matrix.is_stale:
+                return self.previous_snapshot
+
+        self.previous_snapshot = None
+        return self.snapshot or EMPTY_DATA_VERSION
+
+    async def _load(self) -> None:
+        data_version = await DataVersion.get_or_none(id=DataVersion.CURRENT_ID)
+        snapshot = (
+            DataVersionSnapshot(version=data_version.version, updated_at=data_version.updated_at)
+            if data_version is not None
+            else EMPTY_DATA_VERSION
+        )
+
+        if self.snapshot is not None and snapshot.version != self.snapshot.version:
+            if rate_matrix.loaded and self.previous_snapshot is None:
+                self.previous_snapshot = self.snapshot
+            rate_matrix.invalidate()
+            currency_pair_catalog.invalidate()
+
+        self.snapshot = snapshot
+        self.loaded_at = time.monotonic()
+
+
+data_version_cache = DataVersionCache(ttl_seconds=cache_settings.data_version_ttl_seconds)
@@ -0,0 +1,357 @@
+import asyncio
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import cast
+
+from app.core.logger import get_logger
+from app.models import ExchangeRate, ExchangeRateDate
+from app.repositories.rate_series import RateSeries
+from app.utils import cross_fixed_point, from_fixed_point, to_fixed_point
+
+type PairKey = tuple[str, str]
+
+
+class RateMatrix:
+    """Per-worker, in-memory snapshot of every stored exchange rate.
+
+    Rates are kept in a dense matrix indexed by currency pair ordinal x date ordinal. Each cell
+    holds the rate as a fixed-point integer (see app.utils.RATE_SCALE); 0 marks a missing rate.
+    Each row is also kept compacted as a RateSeries of only the dates with a rate, which serves
+    range queries and latest lookups with a binary search.
+
+    Rates are only stored against USD, so pairs without a row of their own are cross rates
+    derived from the two USD legs on the dates where both exist. Each leg is taken from its
+    USD -> currency row or, when that is too small to be precise (e.g. BTC), its currency -> USD row.
+
+    The snapshot is loaded lazily from the database and updated once it has been invalidated,
+    which happens whenever the data version changes. The update only loads the dates after the
+    snapshot's last date, unless the dates it already holds were added to, removed or rewritten
+    (or no date was added at all, so existing rates changed); then everything is reloaded.
+    Only the first load is waited for: after that, a stale snapshot keeps being served while a
+    single background task builds its replacement, which is swapped in once complete. Pivoting
+    rows into the matrix runs in a thread, so loads do not block the event loop.
+    """
+
+    LOAD_CHUNK_DAYS = 92
+    MISSING = 0
+    PIVOT_CURRENCY = "USD"
+
+    def __init__(self) -> None:
+        self.logger = get_logger("cache")
+        self.reset()
+
+    def reset(self) -> None:
+        self.date_ordinals: array[int] = array("l")
+        self.pair_ordinals: dict[PairKey, int] = {}
+        self.rows: list[array[int]] = []
+        self.series: list[RateSeries] = []
+        # Latest available_dates.updated_at in the snapshot, to detect rewritten dates
+        self.dates_updated_at: datetime | None = None
+        self.loaded = False
+        self._generation = 0
+        self._loaded_generation: int | None = None
+        self._lock = asyncio.Lock()
+        self._reload_task: asyncio.Task[None] | None = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_generation != self._generation
+
+    def invalidate(self) -> None:
+        self._generation += 1
+
+    async def ensure_loaded(self) -> None:
+        """Load the snapshot on first use, or start reloading it in the background once it is stale."""
+        if not self.is_stale:
+            return
+
+        if not self.loaded:
+            await self._reload()
+        elif self._reload_task is None or self._reload_task.done():
+            self._reload_task = asyncio.create_task(self._reload_in_background())
+
+    async def reload(self) -> None:
+        """Bring a stale snapshot up to date, after any reload already running in the background."""
+        if self._reload_task is not None:
+            await self._reload_task
+
+        await self._reload()
+
+    async def _reload(self) -> None:
+        async with self._lock:
+            if self.is_stale:
+                generation = self._generation
+                await self._load(append=await self._can_append())
+                # Invalidations during the load leave the snapshot stale
+                self._loaded_generation = generation
+
+    async def _reload_in_background(self) -> None:
+        try:
+            await self._reload()
+        except Exception as e:
+            # The previous snapshot keeps being served, and the next read retries
+            self.logger.warning(f"Rate matrix reload failed: {str(e)}")
+
+    async def get_latest_rate(
+        self, base_currency_code: str, quote_currency_code: str, as_of: date
+    ) -> tuple[date, Decimal] | None:
+        """Return the (date, rate) of the most recent rate on or before as_of, if any."""
+        await self.ensure_loaded()
+
+        # Currency overrides __eq__ without __hash__, so key on plain strings
+        return self._latest_rate(str(base_currency_code), str(quote_currency_code), as_of.toordinal())
+
+    async def get_latest_rates(
+        self, base_currency_code: str, quote_currency_codes: list[str] | None, as_of: date
+    ) -> dict[str, tuple[date, Decimal]]:
+        """Return the (date, rate) of the most recent rate on or before as_of for each quote currency.
+
+        Quote currencies without a rate are left out; None means every quote stored for the base,
+        plus the cross rates available through USD.
+        """
+        await self.ensure_loaded()
+
+        base_currency_code = str(base_currency_code)
+        if quote_currency_codes is None:
+            quote_codes = sorted(
+                {quote for base, quote in self.pair_ordinals if base in (base_currency_code, self.PIVOT_CURRENCY)}
+                - {base_currency_code}
+            )
+        else:
+            quote_codes = [str(quote_currency_code) for quote_currency_code in quote_currency_codes]
+
+        latest_rates = {}
+        for quote_code in quote_codes:
+            latest_rate = self._latest_rate(base_currency_code, quote_code, as_of.toordinal())
+            if latest_rate is not None:
+                latest_rates[quote_code] = latest_rate
+
+        return latest_rates
+
+    async def count_rates(
+        self, base_currency_code: str, quote_currency_code: str, start_date: date, end_date: date
+    ) -> int:
+        """Return the number of stored rates for the pair between start_date and end_date (inclusive)."""
+        return len(await self.get_series(base_currency_code, quote_currency_code, start_date, end_date))
+
+    async def get_series(
+        self, base_currency_code: str, quote_currency_code: str, start_date: date, end_date: date
+    ) -> RateSeries:
+        """Return the pair's rates between start_date and end_date (inclusive), ordered by date.
+
+        Pairs without a row of their own are derived through USD, on the dates where both legs exist.
+        """
+        await self.ensure_loaded()
+
+        return self._series(str(base_currency_code), str(quote_currency_code), start_date, end_date)
+
+    async def get_series_for_pairs(
+        self, pair_keys: list[PairKey], start_date: date, end_date: date
+    ) -> list[RateSeries]:
+        """Return get_series for each (base, quote) pair, all sliced from the same snapshot."""
+        await self.ensure_loaded()
+
+        return [
+            self._series(str(base_currency_code), str(quote_currency_code), start_date, end_date)
+            for base_currency_code, quote_currency_code in pair_keys
+        ]
+
+    def _series(
+        self, base_currency_code: str, quote_currency_code: str, start_date: date, end_date: date
+    ) -> RateSeries:
+        pair_ordinal = self.pair_ordinals.get((base_currency_code, quote_currency_code))
+        if pair_ordinal is not None:
+            return self.series[pair_ordinal].between(start_date, end_date)
+
+        start_index = bisect_left(self.date_ordinals, start_date.toordinal())
+        end_index = bisect_right(self.date_ordinals, end_date.toordinal())
+        return self._cross_series(base_currency_code, quote_currency_code, start_index, end_index)
+
+    def _latest_rate(
+        self, base_currency_code: str, quote_currency_code: str, as_of_ordinal: int
+    ) -> tuple[date, Decimal] | None:
+        pair_ordinal = self.pair_ordinals.get((base_currency_code, quote_currency_code))
+        if pair_ordinal is not None:
+            return self.series[pair_ordinal].last_on_or_before(as_of_ordinal)
+
+        legs = self._pivot_legs(base_currency_code, quote_currency_code)
+        if legs is None:
+            return None
+
+        base_row, quote_row, base_inverse_row, quote_inverse_row = legs
+        index = bisect_right(self.date_ordinals, as_of_ordinal) - 1
+        while index >= 0:
+            if base_row[index] != self.MISSING and quote_row[index] != self.MISSING:
+                rate = cross_fixed_point(
+                    base_row[index],
+                    quote_row[index],
+                    base_inverse_row[index] if base_inverse_row is not None else self.MISSING,
+                    quote_inverse_row[index] if quote_inverse_row is not None else self.MISSING,
+                )
+                return date.fromordinal(self.date_ordinals[index]), from_fixed_point(rate)
+            index -= 1
+
+        return None
+
+    def _cross_series(
+        self, base_currency_code: str, quote_currency_code: str, start_index: int, end_index: int
+    ) -> RateSeries:
+        """Derive the cross rates for every date index in the range where both USD legs exist."""
+        series = RateSeries()
+        legs = self._pivot_legs(base_currency_code, quote_currency_code)
+        if legs is None:
+            return series
+
+        base_row, quote_row, base_inverse_row, quote_inverse_row = legs
+        ordinals = self.date_ordinals[start_index:end_index]
+        missing = array("q", bytes(array("q").itemsize * len(ordinals)))
+        base_inverses = base_inverse_row[start_index:end_index] if base_inverse_row is not None else missing
+        quote_inverses = quote_inverse_row[start_index:end_index] if quote_inverse_row is not None else missing
+        # Single pass over the aligned slices of the rows, in integer arithmetic
+        for ordinal, base_value, quote_value, base_inverse, quote_inverse in zip(
+            ordinals,
+            base_row[start_index:end_index],
+            quote_row[start_index:end_index],
+            base_inverses,
+            quote_inverses,
+            strict=True,
+        ):
+            if base_value != self.MISSING and quote_value != self.MISSING:
+                series.date_ordinals.append(ordinal)
+                series.rates.append(cross_fixed_point(base_value, quote_value, base_inverse, quote_inverse))
+
+        return series
+
+    def _pivot_legs(
+        self, base_currency_code: str, quote_currency_code: str
+    ) -> tuple[array[int], array[int], array[int] | None, array[int] | None] | None:
+        """Return the USD -> base and USD -> quote rows, if both currencies are stored against USD.
+
+        Also returns the base -> USD and quote -> USD rows, or None for each that is not stored.
+        """
+        if self.PIVOT_CURRENCY in (base_currency_code, quote_currency_code):
+            return None
+
+        base_ordinal = self.pair_ordinals.get((self.PIVOT_CURRENCY, base_currency_code))
+        quote_ordinal = self.pair_ordinals.get((self.PIVOT_CURRENCY, quote_currency_code))
+        if base_ordinal is None or quote_ordinal is None:
+            return None
+
+        base_inverse_ordinal = self.pair_ordinals.get((base_currency_code, self.PIVOT_CURRENCY))
+        quote_inverse_ordinal = self.pair_ordinals.get((quote_currency_code, self.PIVOT_CURRENCY))
+        return (
+            self.rows[base_ordinal],
+            self.rows[quote_ordinal],
+            self.rows[base_inverse_ordinal] if base_inverse_ordinal is not None else None,
+            self.rows[quote_inverse_ordinal] if quote_inverse_ordinal is not None else None,
+        )
+
+    async def _can_append(self) -> bool:
+        """Whether the dates in the snapshot are unchanged and new dates were added after them."""
+        if not self.loaded or not self.date_ordinals:
+            return False
+
+        last_date = date.fromordinal(self.date_ordinals[-1])
+        loaded_dates = ExchangeRateDate.filter(as_of__lte=last_date)
+        return (
+            await loaded_dates.count() == len(self.date_ordinals)
+            and not await loaded_dates.filter(updated_at__gt=self.dates_updated_at).exists()
+            and await ExchangeRateDate.filter(as_of__gt=last_date).exists()
+        )
+
+    async def _load(self, append: bool) -> None:
+        """Load the rates of every date, or with append only those after the snapshot's last date."""
+        available_dates = ExchangeRateDate.all()
+        if append:
+            available_dates = available_dates.filter(as_of__gt=date.fromordinal(self.date_ordinals[-1]))
+        new_dates = cast(
+            list[tuple[date, datetime]], await available_dates.order_by("as_of").values_list("as_of", "updated_at")
+        )
+
+        start_index = len(self.date_ordinals) if append else 0
+        date_ordinals = (self.date_ordinals if append else array("l")) + array(
+            "l", (as_of.toordinal() for as_of, _updated_at in new_dates)
+        )
+        date_indexes = {ordinal: index for index, ordinal in enumerate(date_ordinals) if index >= start_index}
+        pair_ordinals = dict(self.pair_ordinals) if append else {}
+        rows = await asyncio.to_thread(_extend_rows, self.rows if append else [], len(new_dates))
+
+        chunk_start = new_dates[0][0] if new_dates else None
+        while chunk_start is not None and chunk_start <= new_dates[-1][0]:
+            # Dates committed after the date list was read are left for the next load
+            chunk_end = min(chunk_start + timedelta(days=self.LOAD_CHUNK_DAYS - 1), new_dates[-1][0])
+            records = await ExchangeRate.filter(as_of__gte=chunk_start, as_of__lte=chunk_end).values_list(
+                "as_of", "base_currency_code", "quote_currency_code", "rate"
+            )
+            await asyncio.to_thread(_pivot, records, date_indexes, pair_ordinals, rows, len(date_ordinals))
+            chunk_start = chunk_end + timedelta(days=1)
+
+        series = await asyncio.to_thread(
+            _extend_series, self.series if append else [], rows, date_ordinals, start_index
+        )
+
+        self.date_ordinals = date_ordinals
+        self.pair_ordinals = pair_ordinals
+        self.rows = rows
+        self.series = series
+        updated_ats = [updated_at for _as_of, updated_at in new_dates]
+        if append and self.dates_updated_at is not None:
+            updated_ats.append(self.dates_updated_at)
+        self.dates_updated_at = max(updated_ats, default=None)
+        self.loaded = True
+
+
+def _extend_rows(rows: list[array[int]], added_dates: int) -> list[array[int]]:
+    """Copy each row with room for the added dates, leaving the rows being served untouched while they are pivoted."""
+    padding = array("q", bytes(array("q").itemsize * added_dates))
+    return [row + padding for row in rows]
+
+
+def _pivot(
+    records: Sequence[tuple[date, str, str, Decimal]],
+    date_indexes: dict[int, int],
+    pair_ordinals: dict[PairKey, int],
+    rows: list[array[int]],
+    row_length: int,
+) -> None:
+    """Place each rate in its pair's row, adding rows for new pairs. Rates for unknown dates are skipped."""
+    empty_row = bytes(array("q").itemsize * row_length)
+    for as_of, base_currency_code, quote_currency_code, rate in records:
+        date_index = date_indexes.get(as_of.toordinal())
+        if date_index is None:
+            continue
+
+        key = (base_currency_code, quote_currency_code)
+        pair_ordinal = pair_ordinals.get(key)
+        if pair_ordinal is None:
+            pair_ordinal = pair_ordinals[key] = len(rows)
+            rows.append(array("q", empty_row))
+        rows[pair_ordinal][date_index] = to_fixed_point(rate)
+
+
+def _extend_series(
+    series: list[RateSeries], rows: list[array[int]], date_ordinals: array[int], start_index: int
+) -> list[RateSeries]:
+    """Compact each row from start_index onwards, after the pair's existing series if it has one."""
+    extended_series = []
+    for pair_ordinal, row in enumerate(rows):
+        added_ordinals = array("l")
+        added_rates = array("q")
+        for index in range(start_index, len(row)):
+            if row[index] != RateMatrix.MISSING:
+                added_ordinals.append(date_ordinals[index])
+                added_rates.append(row[index])
+
+        if pair_ordinal < len(series):
+            existing = series[pair_ordinal]
+            extended_series.append(RateSeries(existing.date_ordinals + added_ordinals, existing.rates + added_rates))
+        else:
+            extended_series.append(RateSeries(added_ordinals, added_rates))
+
+    return extended_series
+
+
+rate_matrix = RateMatrix()
@@ -0,0 +1,240 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from math import isqrt
+from typing import Literal
+
+from app.utils import RATE_SCALE, from_fixed_point, to_fixed_point
+
+type Resolution = Literal["daily", "weekly", "monthly", "lttb"]
+type AggregateInterval = Literal["daily", "weekly", "monthly"]
+
+DEFAULT_LTTB_POINTS = 500
+
+
+@dataclass(frozen=True)
+class RateSeries:
+    """Columnar rates for one currency pair: parallel date ordinals and fixed-point rates.
+
+    Slicing returns new arrays rather than per-row objects, so paging through years of rates
+    stays cheap until the rows are encoded.
+    """
+
+    date_ordinals: array[int] = field(default_factory=lambda: array("l"))
+    rates: array[int] = field(default_factory=lambda: array("q"))
+
+    @classmethod
+    def from_rates(cls, rates: Iterable[tuple[date, Decimal]]) -> "RateSeries":
+        series = cls()
+        for as_of, rate in rates:
+            series.date_ordinals.append(as_of.toordinal())
+            series.rates.append(to_fixed_point(rate))
+        return series
+
+    def __len__(self) -> int:
+        return len(self.date_ordinals)
+
+    def __iter__(self) -> Iterator[tuple[date, Decimal]]:
+        for ordinal, rate in zip(self.date_ordinals, self.rates, strict=True):
+            yield date.fromordinal(ordinal), from_fixed_point(rate)
+
+    def __getitem__(self, index: slice) -> "RateSeries":
+        return RateSeries(self.date_ordinals[index], self.rates[index])
+
+    @property
+    def last_date(self) -> date | None:
+        return date.fromordinal(self.date_ordinals[-1]) if self.date_ordinals else None
+
+    def between(self, start_date: date, end_date: date) -> "RateSeries":
+        """Return the rates from start_date to end_date (inclusive). Expects ascending dates."""
+        start_index = bisect_left(self.date_ordinals, start_date.toordinal())
+        end_index = bisect_right(self.date_ordinals, end_date.toordinal())
+        return self[start_index:end_index]
+
+    def after(self, as_of: date) -> "RateSeries":
+        """Return the rates strictly after as_of. Expects ascending dates."""
+        return self[bisect_right(self.date_ordinals, as_of.toordinal()) :]
+
+    def before(self, as_of: date) -> "RateSeries":
+        """Return the rates strictly before as_of. Expects ascending dates."""
+        return self[: bisect_left(self.date_ordinals, as_of.toordinal())]
+
+    def resample(self, resolution: Resolution, points: int = DEFAULT_LTTB_POINTS) -> "RateSeries":
+        """Downsample for charting. Expects ascending dates.
+
+        weekly and monthly keep the last rate of each calendar week (Monday to Sunday) or month;
+        lttb keeps up to points rates chosen by Largest-Triangle-Three-Buckets, which preserves the
+        visual shape of the series. daily returns the series unchanged.
+        """
+        if resolution == "lttb":
+            return self._take(_lttb_indexes(self.date_ordinals, self.rates, points))
+        if resolution == "daily":
+            return self
+        return self._take(_period_ends(_periods(self.date_ordinals, resolution)))
+
+    def _take(self, indexes: list[int]) -> "RateSeries":
+        return RateSeries(
+            array("l", (self.date_ordinals[index] for index in indexes)),
+            array("q", (self.rates[index] for index in indexes)),
+        )
+
+    def last_on_or_before(self, as_of_ordinal: int) -> tuple[date, Decimal] | None:
+        index = bisect_right(self.date_ordinals, as_of_ordinal) - 1
+        if index < 0:
+            return None
+
+        return date.fromordinal(self.date_ordinals[index]), from_fixed_point(self.rates[index])
+
+
+@dataclass(frozen=True, slots=True)
+class RateAggregate:
+    """Statistics for one interval of a series, as date ordinals and fixed-point values.
+
+    open/high/low/close cover the rates within the interval. change_percent compares close with the
+    previous interval's close; rolling_mean and rolling_stdev (sample) cover the closes of the last
+    window intervals, including this one. Each is None until enough intervals precede it.
+    """
+
+    start_ordinal: int
+    end_ordinal: int
+    open: int
+    high: int
+    low: int
+    close: int
+    change_percent: int | None
+    rolling_mean: int | None
+    rolling_stdev: int | None
+
+
+def aggregate_series(series: RateSeries, interval: AggregateInterval, window: int) -> list[RateAggregate]:
+    """Aggregate the series per interval, in one pass with running window sums. Expects ascending dates.
+
+    Sums stay exact integers, so sliding the window never accumulates rounding error; mean and
+    change_percent are rounded half up and stdev is truncated to the rate precision.
+    """
+    if window < 2:
+        raise ValueError("window must be at least 2")
+
+    aggregates: list[RateAggregate] = []
+    closes: list[int] = []
+    window_sum = 0
+    window_sum_of_squares = 0
+    start_index = 0
+    for end_index in _period_ends(_periods(series.date_ordinals, interval)):
+        rates = series.rates[start_index : end_index + 1]
+        close = rates[-1]
+
+        change_percent = None
+        if closes:
+            change_percent = _divide_half_up((close - closes[-1]) * 100 * RATE_SCALE, closes[-1])
+
+        closes.append(close)
+        window_sum += close
+        window_sum_of_squares += close * close
+        if len(closes) > window:
+            dropped = closes[-window - 1]
+            window_sum -= dropped
+            window_sum_of_squares -= dropped * dropped
+
+        rolling_mean = rolling_stdev = None
+        if len(closes) >= window:
+            rolling_mean = _divide_half_up(window_sum, window)
+            rolling_stdev = isqrt((window * window_sum_of_squares - window_sum * window_sum) // (window * (window - 1)))
+
+        aggregates.append(
+            RateAggregate(
+                start_ordinal=series.date_ordinals[start_index],
+                end_ordinal=series.date_ordinals[end_index],
+                open=rates[0],
+                high=max(rates),
+                low=min(rates),
+                close=close,
+                change_percent=change_percent,
+                rolling_mean=rolling_mean,
+                rolling_stdev=rolling_stdev,
+            )
+        )
+        start_index = end_index + 1
+
+    return aggregates
+
+
+def _periods(date_ordinals: array[int], interval: AggregateInterval) -> list[int]:
+    """Return a key per date that is shared by the dates of the same interval."""
+    if interval == "weekly":
+        # Ordinal 1 (0001-01-01) is a Monday
+        return [(ordinal - 1) // 7 for ordinal in date_ordinals]
+    if interval == "monthly":
+        months = []
+        for ordinal in date_ordinals:
+            as_of = date.fromordinal(ordinal)
+            months.append(as_of.year * 12 + as_of.month)
+        return months
+    return list(date_ordinals)
+
+
+def _period_ends(periods: list[int]) -> list[int]:
+    """Return the index of the last date of each interval."""
+    return [index for index, period in enumerate(periods) if index + 1 == len(periods) or periods[index + 1] != period]
+
+
+def _divide_half_up(numerator: int, denominator: int) -> int:
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def _lttb_indexes(xs: array[int], ys: array[int], points: int) -> list[int]:
+    """Return the indexes of the points kept by Largest-Triangle-Three-Buckets, including both ends."""
+    size = len(xs)
+    if points >= size or points < 3:
+        return list(range(size))
+
+    bucket_size = (size - 2) / (points - 2)
+    indexes = [0]
+    selected = 0
+    for bucket in range(points - 2):
+        # Average of the next bucket, the third corner of the triangles
+        next_start = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, size)
+        next_count = next_end - next_start
+        average_x = sum(xs[next_start:next_end]) / next_count
+        average_y = sum(ys[next_start:next_end]) / next_count
+
+        selected_x = xs[selected]
+        selected_y = ys[selected]
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        largest_area = -1.0
+        for index in range(start, end):
+            area = abs(
+                (selected_x - average_x) * (ys[index] - selected_y)
+                - (selected_x - xs[index]) * (average_y - selected_y)
+            )
+            if area > largest_area:
+                largest_area = area
+                selected = index
+        indexes.append(selected)
+
+    indexes.append(size - 1)
+    return indexes
+
+
+def align_series(series_list: list[RateSeries], descending: bool = False) -> tuple[list[int], list[list[int | None]]]:
+    """Align several series on the union of their dates.
+
+    Returns the date ordinals and, for each series, its fixed-point rate on each of those dates
+    (None where it has no rate).
+    """
+    date_ordinals = sorted({ordinal for series in series_list for ordinal in series.date_ordinals}, reverse=descending)
+    date_indexes = {ordinal: index for index, ordinal in enumerate(date_ordinals)}
+
+    aligned_rates: list[list[int | None]] = []
+    for series in series_list:
+        rates: list[int | None] = [None] * len(date_ordinals)
+        for ordinal, rate in zip(series.date_ordinals, series.rates, strict=True):
+            rates[date_indexes[ordinal]] = rate
+        aligned_rates.append(rates)
+
+    return date_ordinals, aligned_rates
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+from app.core.config import cache_settings
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+
+class ResponseCache:
+    """Per-worker LRU cache of encoded response bodies, bounded by their total size in bytes.
+
+    Keys should include the data version, so entries for superseded data are never served
+    and simply age out.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.reset()
+
+    def reset(self) -> None:
+        self.entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> bytes | None:
+        content = self.entries.get(key)
+        if content is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return content
+
+    def put(self, key: Hashable, content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= len(previous)
+
+        self.entries[key] = content
+        self.size_bytes += len(content)
+
+        while self.size_bytes > self.max_bytes:
+            _evicted_key, evicted = self.entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+            self.evictions += 1
+
+    def stats(self) -> ResponseCacheStats:
+        return ResponseCacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            entries=len(self.entries),
+            size_bytes=self.size_bytes,
+        )
+
+
+historical_response_cache = ResponseCache(max_bytes=cache_settings.response_cache_max_bytes)
@@ -0,0 +1,123 @@
+import asyncio
+from collections.abc import Callable, Hashable
+
+from redis.asyncio import Redis
+
+from app.core.config import cache_settings
+from app.core.logger import get_logger
+from app.repositories.data_version import data_version_cache
+
+
+class SharedResponseCache:
+    """Redis tier for encoded responses, shared by every API worker.
+
+    Keys should include the data version, like the per-worker cache, so entries for
+    superseded data are never served and expire after ttl_seconds. Errors are logged and
+    treated as cache misses, so an unavailable Redis only costs performance.
+
+    redis.asyncio clients are bound to the event loop they first ran on, and Celery tasks
+    run each invocation in a new loop (asyncio.run), so a client is created per loop.
+
+    Writers publish on INVALIDATION_CHANNEL after saving rates; every worker listening
+    drops its cached data version and picks up the new data on its next request instead
+    of waiting for the version TTL.
+    """
+
+    KEY_PREFIX = "exchange_house:responses:"
+    INVALIDATION_CHANNEL = "exchange_house:invalidations"
+    RECONNECT_DELAY_SECONDS = 5.0
+
+    def __init__(self, client_factory: Callable[[], Redis], ttl_seconds: int) -> None:
+        self.client_factory = client_factory
+        self.ttl_seconds = ttl_seconds
+        self.logger = get_logger("cache")
+        self._client: Redis | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def client(self) -> Redis:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = self.client_factory()
+            self._client_loop = loop
+        return self._client
+
+    async def get(self, key: tuple[Hashable, ...]) -> bytes | None:
+        try:
+            content: bytes | None = await self.client.get(self._redis_key(key))
+            return content
+        except Exception as e:
+            self.logger.warning(f"Shared response cache read failed: {str(e)}")
+            return None
+
+    async def put(self, key: tuple[Hashable, ...], content: bytes) -> None:
+        try:
+            await self.client.set(self._redis_key(key), content, ex=self.ttl_seconds)
+        except Exception as e:
+            self.logger.warning(f"Shared response cache write failed: {str(e)}")
+
+    async def publish_invalidation(self) -> None:
+        try:
+            await self.client.publish(self.INVALIDATION_CHANNEL, "data_changed")
+        except Exception as e:
+            self.logger.warning(f"Shared response cache invalidation failed: {str(e)}")
+
+    async def close(self) -> None:
+        """Close the current loop's client, e.g. before the loop itself is closed."""
+        client, self._client, self._client_loop = self._client, None, None
+        if client is None:
+            return
+
+        try:
+            await client.aclose()
+        except Exception as e:
+            self.logger.warning(f"Shared response cache close failed: {str(e)}")
+
+    async def listen(self, on_invalidation: Callable[[], None]) -> None:
+        """Call on_invalidation for every published invalidation, reconnecting after errors. Runs until cancelled."""
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        on_invalidation()
+            except Exception as e:
+                self.logger.warning(f"Shared response cache subscription failed: {str(e)}")
+                # Anything published while disconnected was missed
+                on_invalidation()
+                await asyncio.sleep(self.RECONNECT_DELAY_SECONDS)
+            finally:
+                await pubsub.aclose()  # type: ignore[no-untyped-call]
+
+    def _redis_key(self, key: tuple[Hashable, ...]) -> str:
+        return self.KEY_PREFIX + ":".join(str(part) for part in key)
+
+
+def build_shared_response_cache() -> SharedResponseCache | None:
+    if not cache_settings.shared_response_cache_enabled:
+        return None
+
+    return SharedResponseCache(
+        client_factory=lambda: Redis.from_url(cache_settings.shared_response_cache_url),
+        ttl_seconds=cache_settings.shared_response_cache_ttl_seconds,
+    )
+
+
+shared_response_cache = build_shared_response_cache()
+
+
+async def publish_invalidation() -> None:
+    """Tell every API worker that rates changed, if the shared cache is enabled."""
+    if shared_response_cache is not None:
+        await shared_response_cache.publish_invalidation()
+
+
+async def close_shared_response_cache() -> None:
+    if shared_response_cache is not None:
+        await shared_response_cache.close()
+
+
+async def listen_for_invalidations() -> None:
+    if shared_response_cache is not None:
+        await shared_response_cache.listen(data_version_cache.invalidate)
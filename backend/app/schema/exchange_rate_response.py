@@ -1,9 +1,12 @@
 from datetime import date
 from decimal import Decimal
+from typing import cast
 
 from pydantic import BaseModel, Field
 
-from app.models import Currency, ExchangeRate
+from app.models import ChangePeriod, Currency, CurrencyPair, ExchangeRate, ExchangeRateChange, ExchangeRateValue
+from app.repositories.rate_series import AggregateInterval, RateAggregate, RateSeries, align_series
+from app.utils import from_fixed_point
 
 
 class ExchangeRateData(BaseModel):
@@ -32,12 +35,148 @@ class ExchangeRateResponse(BaseModel):
             data=data,
         )
 
+    @classmethod
+    def from_value(cls, value: ExchangeRateValue) -> "ExchangeRateResponse":
+        return cls(
+            base_currency_code=value.base_currency_code,
+            quote_currency_code=value.quote_currency_code,
+            data=ExchangeRateData(rate=value.rate, date=value.as_of),
+        )
+
+
+class LatestExchangeRatesData(BaseModel):
+    quote_currency_code: Currency
+    rate: Decimal = Field(gt=0)
+    date: date
+
+    @classmethod
+    def from_model(cls, model: ExchangeRate) -> "LatestExchangeRatesData":
+        return cls(
+            quote_currency_code=Currency(model.quote_currency_code),
+            rate=model.rate,
+            date=model.as_of,
+        )
+
+    @classmethod
+    def from_value(cls, value: ExchangeRateValue) -> "LatestExchangeRatesData":
+        return cls(
+            quote_currency_code=value.quote_currency_code,
+            rate=value.rate,
+            date=value.as_of,
+        )
+
+
+class LatestExchangeRatesResponse(BaseModel):
+    base_currency_code: Currency
+    data: list[LatestExchangeRatesData]
+
 
 class HistoricalExchangeRateResponse(BaseModel):
     base_currency_code: Currency
     quote_currency_code: Currency
     data: list[ExchangeRateData]
-    total: int
+    total: int | None
     page: int
     size: int
-    pages: int
+    pages: int | None
+    next_cursor: str | None = None
+
+
+class ExchangeRateSeries(BaseModel):
+    base_currency_code: Currency
+    quote_currency_code: Currency
+    rates: list[Decimal | None]
+
+
+class MultiPairHistoricalExchangeRateResponse(BaseModel):
+    dates: list[date]
+    series: list[ExchangeRateSeries]
+
+    @classmethod
+    def from_series(
+        cls, currency_pairs: list[CurrencyPair], series_list: list[RateSeries], descending: bool = False
+    ) -> "MultiPairHistoricalExchangeRateResponse":
+        """Build the response with every pair's rates aligned on the union of their dates."""
+        date_ordinals, aligned_rates = align_series(series_list, descending=descending)
+        return cls(
+            dates=[date.fromordinal(ordinal) for ordinal in date_ordinals],
+            series=[
+                ExchangeRateSeries(
+                    base_currency_code=pair.base_currency_code,
+                    quote_currency_code=pair.quote_currency_code,
+                    rates=[from_fixed_point(rate) if rate is not None else None for rate in rates],
+                )
+                for pair, rates in zip(currency_pairs, aligned_rates, strict=True)
+            ],
+        )
+
+
+class RateAggregateData(BaseModel):
+    start_date: date
+    end_date: date
+    open: Decimal
+    high: Decimal
+    low: Decimal
+    close: Decimal
+    change_percent: Decimal | None
+    rolling_mean: Decimal | None
+    rolling_stdev: Decimal | None
+
+    @classmethod
+    def from_aggregate(cls, aggregate: RateAggregate) -> "RateAggregateData":
+        return cls(
+            start_date=date.fromordinal(aggregate.start_ordinal),
+            end_date=date.fromordinal(aggregate.end_ordinal),
+            open=from_fixed_point(aggregate.open),
+            high=from_fixed_point(aggregate.high),
+            low=from_fixed_point(aggregate.low),
+            close=from_fixed_point(aggregate.close),
+            change_percent=from_fixed_point(aggregate.change_percent) if aggregate.change_percent is not None else None,
+            rolling_mean=from_fixed_point(aggregate.rolling_mean) if aggregate.rolling_mean is not None else None,
+            rolling_stdev=from_fixed_point(aggregate.rolling_stdev) if aggregate.rolling_stdev is not None else None,
+        )
+
+
+class RateAggregatesResponse(BaseModel):
+    base_currency_code: Currency
+    quote_currency_code: Currency
+    interval: AggregateInterval
+    window: int
+    data: list[RateAggregateData]
+
+
+class ExchangeRateChangeData(BaseModel):
+    period: ChangePeriod
+    previous_date: date
+    previous_rate: Decimal = Field(gt=0)
+    change_percent: Decimal
+
+    @classmethod
+    def from_model(cls, model: ExchangeRateChange) -> "ExchangeRateChangeData":
+        return cls(
+            period=cast(ChangePeriod, model.period),
+            previous_date=model.previous_as_of,
+            previous_rate=model.previous_rate,
+            change_percent=model.change_percent,
+        )
+
+
+class ExchangeRateChangesResponse(BaseModel):
+    base_currency_code: Currency
+    quote_currency_code: Currency
+    rate: Decimal = Field(gt=0)
+    date: date
+    data: list[ExchangeRateChangeData]
+
+    @classmethod
+    def from_models(
+        cls, base_currency_code: Currency, quote_currency_code: Currency, models: list[ExchangeRateChange]
+    ) -> "ExchangeRateChangesResponse":
+        """Build the response from one pair's changes, which all share the latest rate."""
+        return cls(
+            base_currency_code=base_currency_code,
+            quote_currency_code=quote_currency_code,
+            rate=models[0].rate,
+            date=models[0].as_of,
+            data=[ExchangeRateChangeData.from_model(model) for model in models],
+        )
@@ -1,10 +1,21 @@
+import asyncio
+from collections import deque
+from collections.abc import Callable
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 
 from app.core.logger import get_logger
-from app.integrations.open_exchange_rates import HistoricalRatesResponse, OpenExchangeRatesClient
+from app.integrations.open_exchange_rates import AuthenticationError, NotFoundError, OpenExchangeRatesClient
 from app.models import Currency
+from app.repositories.currency_pair_catalog import currency_pair_catalog
+from app.repositories.data_version import data_version_cache
+from app.repositories.rate_matrix import rate_matrix
+from app.repositories.shared_response_cache import publish_invalidation
 from app.services.exchange_rate_service import CreateRateParams, ExchangeRateServiceInterface
+from app.services.refresh_ledger_service import RefreshLedgerService
+
+type ProgressCallback = Callable[[int, int], None]
+type FetchedRates = tuple[date, dict[str, float]]
 
 
 class ExchangeRateRefresh:
@@ -17,12 +28,20 @@ class ExchangeRateRefresh:
     SAMPLE_CURRENCY = Currency("EUR")
     BASE_CURRENCY = Currency("USD")
     DATA_SOURCE = "openexchangerates.org"
+    MAX_CONCURRENCY = 4
+    WRITE_BATCH_SIZE = 30
+    TIME_SERIES_MIN_DAYS = 7
 
     def __init__(
         self,
         exchange_rate_service: ExchangeRateServiceInterface,
         start_date: date | None = None,
         end_date: date | None = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        progress_callback: ProgressCallback | None = None,
+        time_series_min_days: int | None = TIME_SERIES_MIN_DAYS,
+        api_client: OpenExchangeRatesClient | None = None,
+        refresh_ledger: RefreshLedgerService | None = None,
     ):
         """Initialize the exchange rate refresh service.
 
@@ -30,35 +49,191 @@ class ExchangeRateRefresh:
             exchange_rate_service: Service to store exchange rates
             start_date: Start date for rate retrieval (default: 8 days ago)
             end_date: End date for rate retrieval (default: yesterday)
+            max_concurrency: Maximum number of API requests in flight at once
+            progress_callback: Called with (saved, total) dates after each batch is written
+            time_series_min_days: Contiguous runs of at least this many missing dates are fetched
+                with time-series requests instead of one request per date (None to disable)
+            api_client: Client for the Open Exchange Rates API (default: pooled to max_concurrency)
+            refresh_ledger: Records per-date progress so interrupted refreshes can resume
         """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
         self.start_date = start_date or (datetime.now().date() - timedelta(days=8))
         self.end_date = end_date or (datetime.now().date() - timedelta(days=1))
-        self.api_client = OpenExchangeRatesClient()
+        self.max_concurrency = max_concurrency
+        self.progress_callback = progress_callback
+        self.time_series_min_days = time_series_min_days
+        self.api_client = api_client or OpenExchangeRatesClient(max_connections=max_concurrency)
         self.exchange_rate_service = exchange_rate_service
+        self.refresh_ledger = refresh_ledger or RefreshLedgerService()
         self.logger = get_logger("rate_refresh")
 
     async def save(self) -> bool:
         """Fetch and save exchange rates for all required dates.
 
         Retrieves historical exchange rates for each date in the date range
-        that doesn't already have rates stored. Saves each currency pair rate.
+        that doesn't already have rates stored. Long contiguous runs of missing
+        dates are fetched with time-series requests, the rest one date at a time.
+        Up to max_concurrency requests run in parallel and hand their rates to a
+        single writer, which saves them in batches of WRITE_BATCH_SIZE dates.
+
+        If a request fails (e.g. RequestLimitError), no further requests are
+        started; rates already fetched are still saved before the error is raised.
+        Progress is recorded in the refresh ledger, so the next run only fetches
+        dates that were not saved.
 
         Raises:
             Exception: If there's an error retrieving or saving the rates.
         """
         dates = await self._get_all_dates()
+        pending_requests = deque(self._plan_requests(dates))
+        fetched_rates: asyncio.Queue[FetchedRates | None] = asyncio.Queue()
+        errors: list[Exception] = []
+        running_fetchers = 0
 
-        for target_date in dates:
+        def request_daily(request_dates: list[date]) -> None:
+            pending_requests.extendleft([target_date] for target_date in reversed(request_dates))
+            # Fetchers that ran out of requests have stopped, so start more for the added ones
+            start_fetchers()
+
+        def start_fetchers() -> None:
+            """Start fetchers until max_concurrency run or every pending request has one."""
+            nonlocal running_fetchers
+            while running_fetchers < min(self.max_concurrency, len(pending_requests)):
+                running_fetchers += 1
+                fetchers.create_task(fetch())
+
+        async def fetch() -> None:
+            nonlocal running_fetchers
             try:
-                data = await self.api_client.historical_rates_for(target_date)
-                await self._save_rates(target_date, data)
+                while pending_requests and not errors:
+                    request_dates = pending_requests.popleft()
+                    if len(request_dates) > 1 and self.time_series_min_days is None:
+                        # Planned before the fallback: fetch each date on its own, so one failure only fails its date
+                        request_daily(request_dates)
+                        continue
+
+                    try:
+                        await self.refresh_ledger.mark_pending(request_dates)
+                        for fetched in await self._fetch_rates(request_dates):
+                            await fetched_rates.put(fetched)
+                    except (AuthenticationError, NotFoundError) as e:
+                        if len(request_dates) == 1:
+                            await self._record_fetch_error(request_dates, e)
+                            errors.append(e)
+                            return
+                        # The plan does not include time-series requests: fetch these dates one by one
+                        self.logger.warning(f"Time-series request failed, falling back to daily requests: {str(e)}")
+                        self.time_series_min_days = None
+                        request_daily(request_dates)
+                    except Exception as e:
+                        await self._record_fetch_error(request_dates, e)
+                        errors.append(e)
+                        return
+            finally:
+                running_fetchers -= 1
+
+        async def write() -> None:
+            saved_count = 0
+            batch: list[FetchedRates] = []
+            try:
+                while (item := await fetched_rates.get()) is not None:
+                    batch.append(item)
+                    if len(batch) >= self.WRITE_BATCH_SIZE:
+                        saved_count = await self._write_batch(batch, saved_count, len(dates))
+                        batch = []
+                if batch:
+                    await self._write_batch(batch, saved_count, len(dates))
             except Exception as e:
-                self.logger.error(f"Error processing rates for date {target_date}: {str(e)}", exc_info=True)
-                raise
+                errors.append(e)
+
+        writer = asyncio.create_task(write())
+        async with self.api_client, asyncio.TaskGroup() as fetchers:
+            start_fetchers()
+        await fetched_rates.put(None)
+        await writer
+
+        metrics = self.api_client.metrics
+        self.logger.info(
+            f"Made {metrics.requests} API requests with {metrics.retries} retries, "
+            f"{metrics.backoff_seconds:.1f}s backing off and {metrics.throttle_seconds:.1f}s throttled"
+        )
+
+        if errors:
+            raise errors[0]
 
         return True
 
-    async def _save_rates(self, target_date: date, data: HistoricalRatesResponse) -> None:
+    def _plan_requests(self, dates: list[date]) -> list[list[date]]:
+        """Group sorted dates into API requests.
+
+        Each contiguous run of at least time_series_min_days dates becomes time-series
+        requests of up to the client's time_series_max_days; other dates are requested
+        individually.
+        """
+        runs: list[list[date]] = []
+        for target_date in dates:
+            if runs and runs[-1][-1] + timedelta(days=1) == target_date:
+                runs[-1].append(target_date)
+            else:
+                runs.append([target_date])
+
+        requests: list[list[date]] = []
+        window = self.api_client.time_series_max_days
+        for run in runs:
+            if self.time_series_min_days is not None and len(run) >= self.time_series_min_days:
+                requests.extend(run[index : index + window] for index in range(0, len(run), window))
+            else:
+                requests.extend([target_date] for target_date in run)
+
+        return requests
+
+    async def _fetch_rates(self, request_dates: list[date]) -> list[FetchedRates]:
+        if len(request_dates) == 1:
+            historical_rates = await self.api_client.historical_rates_for(request_dates[0])
+            return [(request_dates[0], historical_rates.rates)]
+
+        time_series = await self.api_client.time_series_for(request_dates[0], request_dates[-1])
+        missing_dates = [target_date for target_date in request_dates if target_date not in time_series.rates]
+        if missing_dates:
+            self.logger.warning(f"Time-series response is missing dates: {', '.join(map(str, missing_dates))}")
+            await self.refresh_ledger.mark_failed(missing_dates, "Missing from time-series response")
+
+        return [
+            (target_date, time_series.rates[target_date])
+            for target_date in request_dates
+            if target_date not in missing_dates
+        ]
+
+    async def _record_fetch_error(self, request_dates: list[date], error: Exception) -> None:
+        dates_description = (
+            f"date {request_dates[0]}"
+            if len(request_dates) == 1
+            else f"dates {request_dates[0]} to {request_dates[-1]}"
+        )
+        self.logger.error(f"Error processing rates for {dates_description}: {str(error)}", exc_info=True)
+        try:
+            await self.refresh_ledger.mark_failed(request_dates, str(error))
+        except Exception as e:
+            self.logger.error(f"Error recording failure for {dates_description}: {str(e)}")
+
+    async def _write_batch(self, batch: list[FetchedRates], saved_count: int, total_count: int) -> int:
+        try:
+            await self._save_rates(batch)
+        except Exception as e:
+            batch_dates = ", ".join(str(target_date) for target_date, _ in batch)
+            self.logger.error(f"Error saving rates for dates {batch_dates}: {str(e)}", exc_info=True)
+            raise
+
+        saved_count += len(batch)
+        self.logger.info(f"Saved rates for {saved_count}/{total_count} dates")
+        if self.progress_callback is not None:
+            self.progress_callback(saved_count, total_count)
+
+        return saved_count
+
+    async def _save_rates(self, batch: list[FetchedRates]) -> None:
         params = [
             CreateRateParams(
                 as_of=target_date,
@@ -67,15 +242,24 @@ class ExchangeRateRefresh:
                 rate=Decimal(rate),
                 source=self.DATA_SOURCE,
             )
-            for to_currency, rate in data.rates.items()
+            for target_date, rates in batch
+            for to_currency, rate in rates.items()
         ]
         await self.exchange_rate_service.bulk_create_rates(params)
+        rate_matrix.invalidate()
+        currency_pair_catalog.invalidate()
+        data_version_cache.invalidate()
+        await publish_invalidation()
+        await self.refresh_ledger.mark_saved([target_date for target_date, _ in batch])
 
     async def _get_all_dates(self) -> list[date]:
         """Get a list of dates that need exchange rates to be fetched.
 
         Returns only dates in the specified range that don't already have
-        exchange rates stored.
+        exchange rates stored. Dates the refresh ledger marks as saved are skipped
+        without querying the rates table; dates found in the rates table but not
+        yet in the ledger (e.g. seeded or saved before the ledger existed) are
+        recorded as saved so later runs skip them too.
 
         Returns:
             A sorted list of dates requiring exchange rate data.
@@ -83,10 +267,26 @@ class ExchangeRateRefresh:
         frequency_dates = [
             self.start_date + timedelta(days=x) for x in range((self.end_date - self.start_date).days + 1)
         ]
-        existing_dates = await self.exchange_rate_service.get_available_dates()
-        # start_date and end_date are already included in frequency_dates
-        all_dates = set(frequency_dates)
-        return sorted(all_dates - set(existing_dates))
+        saved_dates = await self.refresh_ledger.get_saved_dates(self.start_date, self.end_date)
+        unconfirmed_dates = sorted(set(frequency_dates) - saved_dates)
+        if not unconfirmed_dates:
+            return []
+
+        existing_dates = set(
+            await self.exchange_rate_service.get_available_dates(
+                start_date=unconfirmed_dates[0], end_date=unconfirmed_dates[-1]
+            )
+        )
+        confirmed_dates = [target_date for target_date in unconfirmed_dates if target_date in existing_dates]
+        if confirmed_dates:
+            await self.refresh_ledger.mark_saved(confirmed_dates)
+
+        missing_dates = [target_date for target_date in unconfirmed_dates if target_date not in existing_dates]
+        self.logger.info(
+            f"{len(missing_dates)} of {len(frequency_dates)} dates need fetching "
+            f"({len(saved_dates)} already saved according to the refresh ledger)"
+        )
+        return missing_dates
 
 
 def build_exchange_rate_refresh(exchange_rate_service: ExchangeRateServiceInterface) -> ExchangeRateRefresh:
@@ -1,11 +1,55 @@
+from collections import defaultdict
+from collections.abc import AsyncIterator
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Literal, TypedDict
+from typing import Any, Literal, TypedDict, cast
 
+from tortoise import Tortoise, timezone
 from tortoise.backends.base.client import BaseDBAsyncClient
 
 from app.decorators.database_transactional import database_transactional
-from app.models import Currency, CurrencyPair, ExchangeRate
+from app.models import (
+    CHANGE_PERIOD_DAYS,
+    Currency,
+    CurrencyPair,
+    CurrencyPairCatalogEntry,
+    DataVersion,
+    ExchangeRate,
+    ExchangeRateChange,
+    ExchangeRateDate,
+    ExchangeRateValue,
+)
+from app.repositories.currency_pair_catalog import currency_pair_catalog
+from app.repositories.data_version import DataVersionSnapshot, data_version_cache
+from app.repositories.rate_matrix import rate_matrix
+from app.repositories.rate_series import (
+    DEFAULT_LTTB_POINTS,
+    AggregateInterval,
+    RateAggregate,
+    RateSeries,
+    Resolution,
+    aggregate_series,
+)
+from app.utils import cross_fixed_point, from_fixed_point, quantize_decimal, to_fixed_point
+
+UPSERT_COLUMNS = (
+    "id",
+    "as_of",
+    "base_currency_code",
+    "quote_currency_code",
+    "rate",
+    "data_source",
+    "created_at",
+    "updated_at",
+)
+UPSERT_CONFLICT_COLUMNS = ("as_of", "base_currency_code", "quote_currency_code")
+UPSERT_UPDATE_COLUMNS = ("rate", "data_source", "updated_at")
+# Postgres allows at most 32,767 bind parameters per statement
+MAX_UPSERT_ROWS = 32_767 // len(UPSERT_COLUMNS)
+# Rows fetched per round trip when streaming historical exports
+EXPORT_CHUNK_ROWS = 1_000
+
+type PairKey = tuple[str, str]
 
 
 class CreateRateParams(TypedDict):
@@ -20,17 +64,41 @@ class ExchangeRateServiceInterface:
     class Meta:
         abstract = True
 
-    async def get_available_dates(self) -> list[date]:
+    async def get_available_dates(self, start_date: date | None = None, end_date: date | None = None) -> list[date]:
         raise RuntimeError("Must be implemented")
 
     async def get_currency_pairs(self) -> list[CurrencyPair]:
         raise RuntimeError("Must be implemented")
 
+    async def get_data_version(self) -> DataVersionSnapshot:
+        raise RuntimeError("Must be implemented")
+
     async def get_latest_rate(
         self, base_currency_code: Currency, quote_currency_code: Currency, as_of: date | None = None
     ) -> ExchangeRate | None:
         raise RuntimeError("Must be implemented")
 
+    async def get_latest_rates(
+        self,
+        base_currency_code: Currency,
+        quote_currency_codes: list[Currency] | None = None,
+        as_of: date | None = None,
+    ) -> list[ExchangeRate]:
+        raise RuntimeError("Must be implemented")
+
+    async def get_latest_rate_value(
+        self, base_currency_code: Currency, quote_currency_code: Currency, as_of: date | None = None
+    ) -> ExchangeRateValue | None:
+        raise RuntimeError("Must be implemented")
+
+    async def get_latest_rate_values(
+        self,
+        base_currency_code: Currency,
+        quote_currency_codes: list[Currency] | None = None,
+        as_of: date | None = None,
+    ) -> list[ExchangeRateValue]:
+        raise RuntimeError("Must be implemented")
+
     async def get_historical_rates(
         self,
         base_currency_code: Currency,
@@ -40,7 +108,60 @@ class ExchangeRateServiceInterface:
         limit: int | None = None,
         offset: int | None = None,
         sort_order: Literal["asc", "desc"] = "asc",
-    ) -> tuple[list[ExchangeRate], int]:
+        after: date | None = None,
+        include_total: bool = True,
+    ) -> tuple[list[ExchangeRate], int | None]:
+        raise RuntimeError("Must be implemented")
+
+    async def get_historical_series(
+        self,
+        base_currency_code: Currency,
+        quote_currency_code: Currency,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        sort_order: Literal["asc", "desc"] = "asc",
+        after: date | None = None,
+        include_total: bool = True,
+        resolution: Resolution = "daily",
+        points: int = DEFAULT_LTTB_POINTS,
+    ) -> tuple[RateSeries, int | None]:
+        raise RuntimeError("Must be implemented")
+
+    async def get_historical_series_for_pairs(
+        self,
+        currency_pairs: list[CurrencyPair],
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[RateSeries]:
+        raise RuntimeError("Must be implemented")
+
+    async def get_rate_aggregates(
+        self,
+        base_currency_code: Currency,
+        quote_currency_code: Currency,
+        start_date: date,
+        end_date: date,
+        interval: AggregateInterval = "monthly",
+        window: int = 2,
+    ) -> list[RateAggregate]:
+        raise RuntimeError("Must be implemented")
+
+    async def get_rate_changes(
+        self, base_currency_code: Currency, quote_currency_code: Currency
+    ) -> list[ExchangeRateChange]:
+        raise RuntimeError("Must be implemented")
+
+    def iter_historical_rates(
+        self,
+        base_currency_code: Currency,
+        quote_currency_code: Currency,
+        start_date: date,
+        end_date: date,
+        sort_order: Literal["asc", "desc"] = "asc",
+        chunk_size: int = EXPORT_CHUNK_ROWS,
+    ) -> AsyncIterator[RateSeries]:
         raise RuntimeError("Must be implemented")
 
     async def bulk_create_rates(self, params_set: list[CreateRateParams]) -> None:
@@ -51,71 +172,104 @@ class ExchangeRateServiceInterface:
     ) -> list[ExchangeRate]:
         raise RuntimeError("Must be implemented")
 
+    async def rebuild_catalogs(self) -> None:
+        raise RuntimeError("Must be implemented")
+
 
 class ExchangeRateService(ExchangeRateServiceInterface):
-    async def get_available_dates(self) -> list[date]:
-        distinct_dates = await ExchangeRate.all().distinct().order_by("as_of").values("as_of")
-        return [d["as_of"] for d in distinct_dates]
+    async def get_available_dates(self, start_date: date | None = None, end_date: date | None = None) -> list[date]:
+        # Read from the available_dates index rather than a DISTINCT over exchange_rates
+        query = ExchangeRateDate.all()
+        if start_date is not None:
+            query = query.filter(as_of__gte=start_date)
+        if end_date is not None:
+            query = query.filter(as_of__lte=end_date)
 
-    async def get_currency_pairs(self) -> list[CurrencyPair]:
-        distinct_pairs = (
-            await ExchangeRate.all()
-            .distinct()
-            .order_by("base_currency_code", "quote_currency_code")
-            .values("base_currency_code", "quote_currency_code")
-        )
+        available_dates = await query.order_by("as_of").values_list("as_of", flat=True)
+        return cast(list[date], available_dates)
 
-        valid_pairs = []
-        for pair in distinct_pairs:
-            try:
-                valid_pairs.append(CurrencyPair(**pair))
-            except ValueError:
-                # Skip invalid currency pairs
-                continue
+    async def get_currency_pairs(self) -> list[CurrencyPair]:
+        # Served from the cached currency_pairs catalog rather than a DISTINCT over exchange_rates
+        return await currency_pair_catalog.get_pairs()
 
-        return valid_pairs
+    async def get_data_version(self) -> DataVersionSnapshot:
+        return await data_version_cache.get()
 
     async def get_latest_rate(
         self, base_currency_code: Currency, quote_currency_code: Currency, as_of: date | None = None
     ) -> ExchangeRate | None:
+        latest_rate = await self.get_latest_rate_value(base_currency_code, quote_currency_code, as_of)
+        return latest_rate.to_model() if latest_rate is not None else None
+
+    async def get_latest_rates(
+        self,
+        base_currency_code: Currency,
+        quote_currency_codes: list[Currency] | None = None,
+        as_of: date | None = None,
+    ) -> list[ExchangeRate]:
+        latest_rates = await self.get_latest_rate_values(base_currency_code, quote_currency_codes, as_of)
+        return [latest_rate.to_model() for latest_rate in latest_rates]
+
+    async def get_latest_rate_value(
+        self, base_currency_code: Currency, quote_currency_code: Currency, as_of: date | None = None
+    ) -> ExchangeRateValue | None:
         if as_of is None:
             as_of = date.today()
 
         if base_currency_code == quote_currency_code:
-            return ExchangeRate(
-                rate=Decimal("1.00000000"),
-                as_of=as_of,
+            return ExchangeRateValue(
                 base_currency_code=base_currency_code,
                 quote_currency_code=quote_currency_code,
+                as_of=as_of,
+                rate=Decimal("1.00000000"),
             )
 
-        exchange_rate = (
-            await ExchangeRate.filter(
-                base_currency_code=base_currency_code,
-                quote_currency_code=quote_currency_code,
-                as_of__lte=as_of,
-            )
-            .order_by("-as_of")
-            .first()
-        )
+        latest_rate = await rate_matrix.get_latest_rate(base_currency_code, quote_currency_code, as_of)
+        if latest_rate is None:
+            return None
 
-        return exchange_rate
+        rate_as_of, rate = latest_rate
+        return ExchangeRateValue(
+            base_currency_code=base_currency_code,
+            quote_currency_code=quote_currency_code,
+            as_of=rate_as_of,
+            rate=rate,
+        )
 
-    async def get_latest_rates(self, base_currency_code: Currency) -> list[ExchangeRate]:
-        available_dates = await self.get_available_dates()
-        if not available_dates:
-            return []
+    async def get_latest_rate_values(
+        self,
+        base_currency_code: Currency,
+        quote_currency_codes: list[Currency] | None = None,
+        as_of: date | None = None,
+    ) -> list[ExchangeRateValue]:
+        """Return the latest rate on or before as_of for each quote currency, ordered by quote currency.
+
+        Each quote falls back to its own most recent date, as in get_latest_rate. Without
+        quote_currency_codes, every valid quote currency stored for the base is returned.
+        """
+        if as_of is None:
+            as_of = date.today()
 
-        as_of = available_dates[-1]
+        latest_rates = await rate_matrix.get_latest_rates(
+            base_currency_code,
+            [str(quote_currency_code) for quote_currency_code in quote_currency_codes]
+            if quote_currency_codes is not None
+            else None,
+            as_of,
+        )
+        if quote_currency_codes is not None and base_currency_code in quote_currency_codes:
+            latest_rates[str(base_currency_code)] = (as_of, Decimal("1.00000000"))
 
-        return (
-            await ExchangeRate.filter(
+        return [
+            ExchangeRateValue(
                 base_currency_code=base_currency_code,
-                as_of=as_of,
+                quote_currency_code=Currency(quote_currency_code),
+                as_of=rate_as_of,
+                rate=rate,
             )
-            .order_by("quote_currency_code")
-            .all()
-        )
+            for quote_currency_code, (rate_as_of, rate) in sorted(latest_rates.items())
+            if Currency(quote_currency_code).is_valid()
+        ]
 
     async def get_historical_rates(
         self,
@@ -126,7 +280,51 @@ class ExchangeRateService(ExchangeRateServiceInterface):
         limit: int | None = None,
         offset: int | None = None,
         sort_order: Literal["asc", "desc"] = "asc",
-    ) -> tuple[list[ExchangeRate], int]:
+        after: date | None = None,
+        include_total: bool = True,
+    ) -> tuple[list[ExchangeRate], int | None]:
+        series, total = await self.get_historical_series(
+            base_currency_code=base_currency_code,
+            quote_currency_code=quote_currency_code,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            offset=offset,
+            sort_order=sort_order,
+            after=after,
+            include_total=include_total,
+        )
+
+        data = [
+            ExchangeRate(
+                rate=rate,
+                as_of=as_of,
+                base_currency_code=base_currency_code,
+                quote_currency_code=quote_currency_code,
+            )
+            for as_of, rate in series
+        ]
+        return data, total
+
+    async def get_historical_series(
+        self,
+        base_currency_code: Currency,
+        quote_currency_code: Currency,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        sort_order: Literal["asc", "desc"] = "asc",
+        after: date | None = None,
+        include_total: bool = True,
+        resolution: Resolution = "daily",
+        points: int = DEFAULT_LTTB_POINTS,
+    ) -> tuple[RateSeries, int | None]:
+        """Return one page of the pair's rates as columns, sliced from the cached rate matrix.
+
+        Pairs where neither side is USD are derived through USD, since only USD-based pairs are stored.
+        A resolution other than daily downsamples the whole range before paging (see RateSeries.resample).
+        """
         if end_date is None:
             end_date = date.today()
 
@@ -136,37 +334,425 @@ class ExchangeRateService(ExchangeRateServiceInterface):
         if start_date > end_date:
             raise ValueError("start_date must be before or equal to today")
 
-        query_unlimited = ExchangeRate.filter(
-            base_currency_code=base_currency_code,
-            quote_currency_code=quote_currency_code,
-            as_of__lte=end_date,
-            as_of__gte=start_date,
+        series = await rate_matrix.get_series(base_currency_code, quote_currency_code, start_date, end_date)
+        series = series.resample(resolution, points)
+        total = len(series) if include_total else None
+
+        # Keyset pagination: seek past the last as_of seen instead of skipping rows
+        if after is not None:
+            if sort_order == "desc":
+                series = series.before(after)
+            else:
+                series = series.after(after)
+
+        if sort_order == "desc":
+            series = series[::-1]
+
+        start_index = offset if offset is not None else 0
+        end_index = start_index + limit if limit is not None else None
+        return series[start_index:end_index], total
+
+    async def get_historical_series_for_pairs(
+        self,
+        currency_pairs: list[CurrencyPair],
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[RateSeries]:
+        """Return each pair's rates over one date range, in the order of currency_pairs and by ascending date.
+
+        All pairs are sliced from the same rate matrix snapshot, so they are consistent with each other.
+        Pairs where neither side is USD are derived through USD.
+        """
+        if end_date is None:
+            end_date = date.today()
+
+        if start_date is None:
+            start_date = end_date - timedelta(days=365.25 * 10)
+
+        if start_date > end_date:
+            raise ValueError("start_date must be before or equal to today")
+
+        return await rate_matrix.get_series_for_pairs(
+            [(str(pair.base_currency_code), str(pair.quote_currency_code)) for pair in currency_pairs],
+            start_date,
+            end_date,
         )
 
-        query = query_unlimited
+    async def get_rate_aggregates(
+        self,
+        base_currency_code: Currency,
+        quote_currency_code: Currency,
+        start_date: date,
+        end_date: date,
+        interval: AggregateInterval = "monthly",
+        window: int = 2,
+    ) -> list[RateAggregate]:
+        """Return OHLC, percent change and rolling statistics per interval, by ascending date.
+
+        Computed from the cached rate matrix, so only the aggregates leave the service. Rolling
+        statistics only see intervals within the date range.
+        """
+        if start_date > end_date:
+            raise ValueError("start_date must be before or equal to end_date")
 
-        if limit is not None:
-            query = query.limit(limit)
+        series = await rate_matrix.get_series(base_currency_code, quote_currency_code, start_date, end_date)
+        return aggregate_series(series, interval, window)
 
-        if offset is not None:
-            query = query.offset(offset)
+    async def get_rate_changes(
+        self, base_currency_code: Currency, quote_currency_code: Currency
+    ) -> list[ExchangeRateChange]:
+        """Return the change of the pair's latest rate over each period in CHANGE_PERIOD_DAYS that has data.
 
-        if sort_order == "desc":
-            query = query.order_by("-as_of")
-        else:
-            query = query.order_by("as_of")
+        Stored pairs are read from exchange_rate_changes, which is refreshed whenever rates are saved.
+        Pairs without changes of their own are derived from the cached rate matrix, through USD if needed.
+        """
+        changes = await ExchangeRateChange.filter(
+            base_currency_code=base_currency_code, quote_currency_code=quote_currency_code
+        )
+        if not changes:
+            series = await rate_matrix.get_series(base_currency_code, quote_currency_code, date.min, date.today())
+            changes = self._derive_rate_changes(base_currency_code, quote_currency_code, series)
 
-        data = await query.all()
-        total = await query_unlimited.count()
+        periods: list[str] = list(CHANGE_PERIOD_DAYS)
+        return sorted(changes, key=lambda change: periods.index(change.period))
 
-        return data, total
+    async def iter_historical_rates(
+        self,
+        base_currency_code: Currency,
+        quote_currency_code: Currency,
+        start_date: date,
+        end_date: date,
+        sort_order: Literal["asc", "desc"] = "asc",
+        chunk_size: int = EXPORT_CHUNK_ROWS,
+    ) -> AsyncIterator[RateSeries]:
+        """Yield the pair's rates between start_date and end_date (inclusive) in chunks of up to chunk_size.
+
+        Each chunk is read with its own query, continuing after the previous chunk's last date, so an
+        export of any length holds one chunk in memory and a database connection only while a chunk
+        is read, not while the client consumes it. Pairs where neither side is USD are joined on their
+        USD legs by date.
+        """
+        stored_date_range = await self._get_stored_date_range(base_currency_code, quote_currency_code)
+        if stored_date_range is None:
+            return
+
+        # Skip the parts of the range before the pair's first rate and after its last
+        start_date = max(start_date, stored_date_range[0])
+        end_date = min(end_date, stored_date_range[1])
+
+        rates_table = ExchangeRate._meta.db_table
+        direction = "DESC" if sort_order == "desc" else "ASC"
+        cross = Currency("USD") not in (base_currency_code, quote_currency_code)
+        if cross:
+            sql = (
+                f'SELECT b."as_of", b."rate" AS "base_rate", q."rate" AS "quote_rate", '
+                'bi."rate" AS "base_inverse_rate", qi."rate" AS "quote_inverse_rate" '
+                f'FROM "{rates_table}" b JOIN "{rates_table}" q ON q."as_of" = b."as_of" '
+                """AND q."base_currency_code" = 'USD' AND q."quote_currency_code" = $2 """
+                # The inverse legs keep the precision of small USD legs such as BTC
+                f'LEFT JOIN "{rates_table}" bi ON bi."as_of" = b."as_of" '
+                """AND bi."base_currency_code" = $1 AND bi."quote_currency_code" = 'USD' """
+                f'LEFT JOIN "{rates_table}" qi ON qi."as_of" = b."as_of" '
+                """AND qi."base_currency_code" = $2 AND qi."quote_currency_code" = 'USD' """
+                """WHERE b."base_currency_code" = 'USD' AND b."quote_currency_code" = $1 """
+                f'AND b."as_of" BETWEEN $3 AND $4 ORDER BY b."as_of" {direction} LIMIT $5'
+            )
+        else:
+            sql = (
+                f'SELECT "as_of", "rate" FROM "{rates_table}" '
+                'WHERE "base_currency_code" = $1 AND "quote_currency_code" = $2 '
+                f'AND "as_of" BETWEEN $3 AND $4 ORDER BY "as_of" {direction} LIMIT $5'
+            )
+
+        client = Tortoise.get_connection("default")
+        while start_date <= end_date:
+            _count, records = await client.execute_query(
+                sql, [str(base_currency_code), str(quote_currency_code), start_date, end_date, chunk_size]
+            )
+            if not records:
+                return
+
+            series = RateSeries()
+            for record in records:
+                series.date_ordinals.append(record["as_of"].toordinal())
+                if cross:
+                    rate = cross_fixed_point(
+                        to_fixed_point(record["base_rate"]),
+                        to_fixed_point(record["quote_rate"]),
+                        to_fixed_point(record["base_inverse_rate"]) if record["base_inverse_rate"] is not None else 0,
+                        to_fixed_point(record["quote_inverse_rate"]) if record["quote_inverse_rate"] is not None else 0,
+                    )
+                else:
+                    rate = to_fixed_point(record["rate"])
+                series.rates.append(rate)
+            yield series
+
+            if len(records) < chunk_size:
+                return
+            # A pair has at most one rate per date, so the next chunk starts past the last date read
+            if sort_order == "desc":
+                end_date = records[-1]["as_of"] - timedelta(days=1)
+            else:
+                start_date = records[-1]["as_of"] + timedelta(days=1)
+
+    async def _get_stored_date_range(
+        self, base_currency_code: Currency, quote_currency_code: Currency
+    ) -> tuple[date, date] | None:
+        """Return the dates between which the pair can have rates, from the pair catalog.
+
+        Pairs where neither side is USD only have rates where the date ranges of both USD legs overlap.
+        """
+        pivot_currency_code = Currency("USD")
+        if pivot_currency_code in (base_currency_code, quote_currency_code):
+            return await currency_pair_catalog.get_date_range(base_currency_code, quote_currency_code)
+
+        base_date_range = await currency_pair_catalog.get_date_range(pivot_currency_code, base_currency_code)
+        quote_date_range = await currency_pair_catalog.get_date_range(pivot_currency_code, quote_currency_code)
+        if base_date_range is None or quote_date_range is None:
+            return None
+
+        first_date = max(base_date_range[0], quote_date_range[0])
+        last_date = min(base_date_range[1], quote_date_range[1])
+        return (first_date, last_date) if first_date <= last_date else None
 
     @database_transactional
     async def bulk_create_rates(
         self, params_set: list[CreateRateParams], db_connection: BaseDBAsyncClient | None = None
     ) -> None:
+        rates_by_date: dict[date, dict[PairKey, ExchangeRate]] = defaultdict(dict)
         for params in params_set:
-            await self.create_rate(**params, db_connection=db_connection)
+            for exchange_rate in self._build_rate_pair(**params):
+                key = (str(exchange_rate.base_currency_code), str(exchange_rate.quote_currency_code))
+                rates_by_date[params["as_of"]][key] = exchange_rate
+
+        pair_dates: dict[PairKey, tuple[date, date]] = {}
+        for as_of, exchange_rates in sorted(rates_by_date.items()):
+            try:
+                await self._upsert_rates(list(exchange_rates.values()), db_connection=db_connection)
+            except Exception as e:
+                raise ValueError(f"Failed to save exchange rates on {as_of} with error {e}") from e
+
+            for key in exchange_rates:
+                first_date, _last_date = pair_dates.get(key, (as_of, as_of))
+                pair_dates[key] = (first_date, as_of)
+
+        await self._index_dates(sorted(rates_by_date), db_connection=db_connection)
+        await self._update_pair_catalog(pair_dates, db_connection=db_connection)
+        await self._update_rate_changes(sorted(pair_dates), db_connection=db_connection)
+        if rates_by_date:
+            await self._bump_data_version(db_connection=db_connection)
+
+    @database_transactional
+    async def rebuild_catalogs(self, db_connection: BaseDBAsyncClient | None = None) -> None:
+        """Rebuild the available_dates, currency_pairs and exchange_rate_changes tables from exchange_rates.
+
+        Only needed when rates are written without going through this service, e.g. by scripts/seed.sh.
+        Bumps the data version, so every worker drops its cached rates and responses.
+        """
+        if db_connection is None:
+            raise ValueError("A database connection is required")
+
+        dates_table = ExchangeRateDate._meta.db_table
+        pairs_table = CurrencyPairCatalogEntry._meta.db_table
+        rates_table = ExchangeRate._meta.db_table
+        now = timezone.now()
+
+        await db_connection.execute_query(f'DELETE FROM "{dates_table}"')
+        await db_connection.execute_query(
+            f'INSERT INTO "{dates_table}" ("as_of", "updated_at") '
+            f'SELECT DISTINCT "as_of", $1::timestamptz FROM "{rates_table}"',
+            [now],
+        )
+        await db_connection.execute_query(f'DELETE FROM "{pairs_table}"')
+        await db_connection.execute_query(
+            f'INSERT INTO "{pairs_table}" '
+            '("base_currency_code", "quote_currency_code", "first_date", "last_date", "updated_at") '
+            'SELECT "base_currency_code", "quote_currency_code", MIN("as_of"), MAX("as_of"), '
+            f'$1::timestamptz FROM "{rates_table}" GROUP BY "base_currency_code", "quote_currency_code"',
+            [now],
+        )
+        await db_connection.execute_query(f'DELETE FROM "{ExchangeRateChange._meta.db_table}"')
+        _count, pairs = await db_connection.execute_query(
+            f'SELECT "base_currency_code", "quote_currency_code" FROM "{pairs_table}"'
+        )
+        await self._update_rate_changes(
+            [(pair["base_currency_code"], pair["quote_currency_code"]) for pair in pairs], db_connection=db_connection
+        )
+        await self._bump_data_version(db_connection=db_connection)
+        rate_matrix.invalidate()
+        currency_pair_catalog.invalidate()
+        data_version_cache.invalidate()
+
+    async def _index_dates(self, dates: list[date], db_connection: BaseDBAsyncClient | None) -> None:
+        """Add the dates to the available_dates index, marking dates already present as rewritten."""
+        if db_connection is None:
+            raise ValueError("A database connection is required")
+        if not dates:
+            return
+
+        await db_connection.execute_query(
+            f'INSERT INTO "{ExchangeRateDate._meta.db_table}" ("as_of", "updated_at") '
+            'SELECT as_of, $2 FROM unnest($1::date[]) AS as_of ON CONFLICT ("as_of") DO UPDATE SET '
+            '"updated_at" = EXCLUDED."updated_at"',
+            [dates, timezone.now()],
+        )
+
+    async def _bump_data_version(self, db_connection: BaseDBAsyncClient | None) -> None:
+        if db_connection is None:
+            raise ValueError("A database connection is required")
+
+        table = DataVersion._meta.db_table
+        await db_connection.execute_query(
+            f'INSERT INTO "{table}" ("id", "version", "updated_at") VALUES ($1, 1, $2) '
+            f'ON CONFLICT ("id") DO UPDATE SET "version" = "{table}"."version" + 1, '
+            '"updated_at" = EXCLUDED."updated_at"',
+            [DataVersion.CURRENT_ID, timezone.now()],
+        )
+
+    async def _update_pair_catalog(
+        self, pair_dates: dict[PairKey, tuple[date, date]], db_connection: BaseDBAsyncClient | None
+    ) -> None:
+        """Add each written pair to currency_pairs, or widen its date range."""
+        if db_connection is None:
+            raise ValueError("A database connection is required")
+        if not pair_dates:
+            return
+
+        keys = sorted(pair_dates)
+        table = CurrencyPairCatalogEntry._meta.db_table
+        await db_connection.execute_query(
+            f'INSERT INTO "{table}" '
+            '("base_currency_code", "quote_currency_code", "first_date", "last_date", "updated_at") '
+            "SELECT base_currency_code, quote_currency_code, first_date, last_date, $5 "
+            "FROM unnest($1::varchar[], $2::varchar[], $3::date[], $4::date[]) "
+            "AS pairs(base_currency_code, quote_currency_code, first_date, last_date) "
+            'ON CONFLICT ("base_currency_code", "quote_currency_code") DO UPDATE SET '
+            f'"first_date" = LEAST("{table}"."first_date", EXCLUDED."first_date"), '
+            f'"last_date" = GREATEST("{table}"."last_date", EXCLUDED."last_date"), '
+            '"updated_at" = EXCLUDED."updated_at"',
+            [
+                [base_currency_code for base_currency_code, _ in keys],
+                [quote_currency_code for _, quote_currency_code in keys],
+                [pair_dates[key][0] for key in keys],
+                [pair_dates[key][1] for key in keys],
+                timezone.now(),
+            ],
+        )
+
+    async def _update_rate_changes(self, keys: list[PairKey], db_connection: BaseDBAsyncClient | None) -> None:
+        """Recompute exchange_rate_changes for the pairs, in one statement over all pairs and periods."""
+        if db_connection is None:
+            raise ValueError("A database connection is required")
+        if not keys:
+            return
+
+        table = ExchangeRateChange._meta.db_table
+        rates_table = ExchangeRate._meta.db_table
+        pair_condition = (
+            '"base_currency_code" = pairs.base_currency_code AND "quote_currency_code" = pairs.quote_currency_code'
+        )
+        await db_connection.execute_query(
+            f'INSERT INTO "{table}" '
+            '("base_currency_code", "quote_currency_code", "period", "as_of", "rate", "previous_as_of", '
+            '"previous_rate", "change_percent", "updated_at") '
+            "SELECT pairs.base_currency_code, pairs.quote_currency_code, periods.period, latest.as_of, latest.rate, "
+            "previous.as_of, previous.rate, ROUND((latest.rate - previous.rate) / previous.rate * 100, 8), $5 "
+            "FROM unnest($1::varchar[], $2::varchar[]) AS pairs(base_currency_code, quote_currency_code) "
+            f'CROSS JOIN LATERAL (SELECT "as_of", "rate" FROM "{rates_table}" WHERE {pair_condition} '
+            'ORDER BY "as_of" DESC LIMIT 1) AS latest '
+            "CROSS JOIN unnest($3::varchar[], $4::int[]) AS periods(period, days) "
+            # Without a number of days, compare with the previous year end
+            f'CROSS JOIN LATERAL (SELECT "as_of", "rate" FROM "{rates_table}" WHERE {pair_condition} '
+            "AND \"as_of\" <= COALESCE(latest.as_of - periods.days, DATE_TRUNC('year', latest.as_of)::date - 1) "
+            'ORDER BY "as_of" DESC LIMIT 1) AS previous '
+            'ON CONFLICT ("base_currency_code", "quote_currency_code", "period") DO UPDATE SET '
+            '"as_of" = EXCLUDED."as_of", "rate" = EXCLUDED."rate", "previous_as_of" = EXCLUDED."previous_as_of", '
+            '"previous_rate" = EXCLUDED."previous_rate", "change_percent" = EXCLUDED."change_percent", '
+            '"updated_at" = EXCLUDED."updated_at"',
+            [
+                [base_currency_code for base_currency_code, _ in keys],
+                [quote_currency_code for _, quote_currency_code in keys],
+                list(CHANGE_PERIOD_DAYS),
+                list(CHANGE_PERIOD_DAYS.values()),
+                timezone.now(),
+            ],
+        )
+
+    def _derive_rate_changes(
+        self, base_currency_code: Currency, quote_currency_code: Currency, series: RateSeries
+    ) -> list[ExchangeRateChange]:
+        """Compute the rows _update_rate_changes would store for the series, without saving them."""
+        latest_date = series.last_date
+        if latest_date is None:
+            return []
+
+        latest_ordinal = latest_date.toordinal()
+        latest_rate = from_fixed_point(series.rates[-1])
+
+        changes = []
+        for period, days in CHANGE_PERIOD_DAYS.items():
+            if days is not None:
+                cutoff = latest_ordinal - days
+            else:
+                cutoff = date(latest_date.year, 1, 1).toordinal() - 1
+
+            previous = series.last_on_or_before(cutoff)
+            if previous is None:
+                continue
+
+            previous_as_of, previous_rate = previous
+            changes.append(
+                ExchangeRateChange(
+                    base_currency_code=base_currency_code,
+                    quote_currency_code=quote_currency_code,
+                    period=period,
+                    as_of=latest_date,
+                    rate=latest_rate,
+                    previous_as_of=previous_as_of,
+                    previous_rate=previous_rate,
+                    change_percent=quantize_decimal((latest_rate - previous_rate) / previous_rate * 100).normalize(),
+                )
+            )
+
+        return changes
+
+    async def _upsert_rates(self, exchange_rates: list[ExchangeRate], db_connection: BaseDBAsyncClient | None) -> None:
+        """Write rates with one multi-row INSERT ... ON CONFLICT DO UPDATE statement per chunk."""
+        if db_connection is None:
+            raise ValueError("A database connection is required")
+
+        columns = ", ".join(f'"{column}"' for column in UPSERT_COLUMNS)
+        conflict_columns = ", ".join(f'"{column}"' for column in UPSERT_CONFLICT_COLUMNS)
+        updates = ", ".join(f'"{column}" = EXCLUDED."{column}"' for column in UPSERT_UPDATE_COLUMNS)
+        now = timezone.now()
+
+        for chunk_start in range(0, len(exchange_rates), MAX_UPSERT_ROWS):
+            chunk = exchange_rates[chunk_start : chunk_start + MAX_UPSERT_ROWS]
+            placeholders = []
+            values: list[Any] = []
+            for exchange_rate in chunk:
+                offset = len(values)
+                placeholders.append(
+                    "(" + ", ".join(f"${offset + index + 1}" for index in range(len(UPSERT_COLUMNS))) + ")"
+                )
+                values.extend(
+                    [
+                        exchange_rate.id,
+                        exchange_rate.as_of,
+                        str(exchange_rate.base_currency_code),
+                        str(exchange_rate.quote_currency_code),
+                        exchange_rate.rate,
+                        exchange_rate.data_source,
+                        now,
+                        now,
+                    ]
+                )
+
+            await db_connection.execute_query(
+                f'INSERT INTO "{ExchangeRate._meta.db_table}" ({columns}) VALUES {", ".join(placeholders)} '
+                f"ON CONFLICT ({conflict_columns}) DO UPDATE SET {updates}",
+                values,
+            )
 
     @database_transactional
     async def create_rate(
@@ -177,6 +763,36 @@ class ExchangeRateService(ExchangeRateServiceInterface):
         rate: Decimal,
         source: str,
         db_connection: BaseDBAsyncClient | None = None,
+    ) -> list[ExchangeRate]:
+        rate_pair = self._build_rate_pair(as_of, base_currency_code, quote_currency_code, rate, source)
+        if not rate_pair:
+            return []
+
+        forward_rate, inverse_rate = rate_pair
+
+        try:
+            await forward_rate.save(using_db=db_connection)
+            await inverse_rate.save(using_db=db_connection)
+            await self._index_dates([as_of], db_connection=db_connection)
+            await self._update_pair_catalog(
+                {(str(rate.base_currency_code), str(rate.quote_currency_code)): (as_of, as_of) for rate in rate_pair},
+                db_connection=db_connection,
+            )
+            await self._update_rate_changes(
+                sorted((str(rate.base_currency_code), str(rate.quote_currency_code)) for rate in rate_pair),
+                db_connection=db_connection,
+            )
+            await self._bump_data_version(db_connection=db_connection)
+        except Exception as e:
+            raise ValueError(
+                f"Failed to create exchange rate for {base_currency_code} to "
+                f"{quote_currency_code} on {as_of} with error {e}"
+            ) from e
+
+        return [forward_rate, inverse_rate]
+
+    def _build_rate_pair(
+        self, as_of: date, base_currency_code: Currency, quote_currency_code: Currency, rate: Decimal, source: str
     ) -> list[ExchangeRate]:
         if base_currency_code == quote_currency_code:
             return []
@@ -196,13 +812,4 @@ class ExchangeRateService(ExchangeRateServiceInterface):
             data_source=source,
         )
 
-        try:
-            await forward_rate.save(using_db=db_connection)
-            await inverse_rate.save(using_db=db_connection)
-        except Exception as e:
-            raise ValueError(
-                f"Failed to create exchange rate for {base_currency_code} to "
-                f"{quote_currency_code} on {as_of} with error {e}"
-            ) from e
-
         return [forward_rate, inverse_rate]
@@ -0,0 +1,82 @@
+from datetime import date, datetime
+from typing import cast
+
+from tortoise import timezone
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from app.decorators.database_transactional import database_transactional
+from app.models import RefreshLedgerEntry, RefreshStatus
+
+
+class RefreshLedgerService:
+    """Durable record of which dates a refresh has claimed, saved or failed.
+
+    A date is only skipped by later refreshes once it is marked as saved; pending dates
+    (e.g. from a refresh that was interrupted) and failed dates are fetched again.
+    """
+
+    async def get_saved_dates(self, start_date: date, end_date: date) -> set[date]:
+        saved_dates = await RefreshLedgerEntry.filter(
+            as_of__gte=start_date, as_of__lte=end_date, status=RefreshStatus.SAVED
+        ).values_list("as_of", flat=True)
+        return set(cast(list[date], saved_dates))
+
+    async def get_entries(self, start_date: date, end_date: date) -> list[RefreshLedgerEntry]:
+        return await RefreshLedgerEntry.filter(as_of__gte=start_date, as_of__lte=end_date).order_by("as_of")
+
+    @database_transactional
+    async def mark_pending(self, dates: list[date], db_connection: BaseDBAsyncClient | None = None) -> None:
+        """Record that the dates are being fetched, counting an attempt for each."""
+        await self._upsert(
+            dates,
+            RefreshStatus.PENDING,
+            updates='"attempts" = "refresh_ledger"."attempts" + 1, "error" = NULL',
+            db_connection=db_connection,
+        )
+
+    @database_transactional
+    async def mark_saved(
+        self, dates: list[date], fetched_at: datetime | None = None, db_connection: BaseDBAsyncClient | None = None
+    ) -> None:
+        await self._upsert(
+            dates,
+            RefreshStatus.SAVED,
+            fetched_at=fetched_at or timezone.now(),
+            updates='"fetched_at" = EXCLUDED."fetched_at", "error" = NULL',
+            db_connection=db_connection,
+        )
+
+    @database_transactional
+    async def mark_failed(self, dates: list[date], error: str, db_connection: BaseDBAsyncClient | None = None) -> None:
+        await self._upsert(
+            dates,
+            RefreshStatus.FAILED,
+            error=error,
+            updates='"error" = EXCLUDED."error"',
+            db_connection=db_connection,
+        )
+
+    async def _upsert(
+        self,
+        dates: list[date],
+        status: RefreshStatus,
+        updates: str,
+        db_connection: BaseDBAsyncClient | None,
+        fetched_at: datetime | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Insert or update one ledger row per date with a single statement."""
+        if db_connection is None:
+            raise ValueError("A database connection is required")
+        if not dates:
+            return
+
+        table = RefreshLedgerEntry._meta.db_table
+        attempts = 1 if status == RefreshStatus.PENDING else 0
+        await db_connection.execute_query(
+            f'INSERT INTO "{table}" ("as_of", "status", "attempts", "fetched_at", "error", "created_at", "updated_at") '
+            "SELECT as_of, $2, $3, $4, $5, $6, $6 FROM unnest($1::date[]) AS as_of "
+            f'ON CONFLICT ("as_of") DO UPDATE SET "status" = EXCLUDED."status", "updated_at" = EXCLUDED."updated_at", '
+            f"{updates}",
+            [sorted(set(dates)), status.value, attempts, fetched_at, error, timezone.now()],
+        )
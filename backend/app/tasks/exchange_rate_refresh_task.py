@@ -6,6 +6,7 @@ from app.celery_app import celery_app
 from app.core.database import TORTOISE_ORM
 from app.core.dependencies import get_exchange_rate_service
 from app.core.logger import get_logger
+from app.repositories.shared_response_cache import close_shared_response_cache
 from app.services.exchange_rate_refresh import build_exchange_rate_refresh
 from app.services.exchange_rate_service import ExchangeRateServiceInterface
 from app.services.healthchecks_service import NoURLSetError, get_healthchecks_service
@@ -68,6 +69,7 @@ async def _exchange_rate_refresh() -> TaskResult:
     except Exception as e:
         return failure_result(message=f"Unexpected error: {str(e)}")
     finally:
+        await close_shared_response_cache()
         await Tortoise.close_connections()
 
 
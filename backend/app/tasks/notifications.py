@@ -20,25 +20,20 @@ async def send_exchange_rate_refresh_email(
         logger.warning("No admin email found")
         return
 
-    exchange_rates, _total = await exchange_rate_service.get_historical_rates(
-        base_currency_code=base_currency,
-        quote_currency_code=quote_currency,
-        limit=2,
-        sort_order="desc",
-    )
-
-    if len(exchange_rates) < 2:
+    changes = await exchange_rate_service.get_rate_changes(base_currency, quote_currency)
+    daily_change = next((change for change in changes if change.period == "1d"), None)
+
+    if daily_change is None:
         logger.warning("Not enough exchange rates found")
         return
 
-    latest_exchange_rate, previous_exchange_rate = exchange_rates
-    current_date = latest_exchange_rate.as_of
-    change = (latest_exchange_rate.rate - previous_exchange_rate.rate) / previous_exchange_rate.rate
+    current_date = daily_change.as_of
+    change = daily_change.change_percent / 100
 
     subject = f"[ExchangeHouse] Exchange rates for {current_date}"
     body = f"""
-      {base_currency}{quote_currency} rate for {current_date} = {latest_exchange_rate.rate:.4f}
-      ({change:.2%} from {previous_exchange_rate.as_of})
+      {base_currency}{quote_currency} rate for {current_date} = {daily_change.rate:.4f}
+      ({change:.2%} from {daily_change.previous_as_of})
     """
 
     email_service = EmailService(recipient=email_settings.admin_email, subject=subject, body=body)
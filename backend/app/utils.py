@@ -4,3 +4,41 @@ from decimal import ROUND_HALF_UP, Decimal
 def quantize_decimal(value: str | int | float | Decimal) -> Decimal:
     """Helper function to round Decimal values consistently for comparison."""
     return Decimal(value).quantize(Decimal("0.00000001"), rounding=ROUND_HALF_UP)
+
+
+RATE_DECIMAL_PLACES = 8
+RATE_SCALE: int = 10**RATE_DECIMAL_PLACES
+
+
+def to_fixed_point(value: Decimal) -> int:
+    """Convert a rate to an integer scaled by RATE_SCALE (the precision of ExchangeRate.rate)."""
+    return int(quantize_decimal(value).scaleb(RATE_DECIMAL_PLACES))
+
+
+def from_fixed_point(value: int) -> Decimal:
+    """Convert a fixed-point rate back to a Decimal, normalized the same way as ExchangeRate.rate."""
+    return Decimal(value).scaleb(-RATE_DECIMAL_PLACES).normalize()
+
+
+# Below 0.01, a rate keeps fewer than 7 significant digits at RATE_DECIMAL_PLACES
+MIN_PRECISE_FIXED_POINT = RATE_SCALE // 100
+
+
+def cross_fixed_point(pivot_to_base: int, pivot_to_quote: int, base_to_pivot: int = 0, quote_to_pivot: int = 0) -> int:
+    """base -> quote = (pivot -> quote) / (pivot -> base) for fixed-point rates, rounded half up.
+
+    A pivot -> currency leg below MIN_PRECISE_FIXED_POINT (e.g. USD -> BTC, 0.00001667) has lost most
+    of its digits to the fixed scale, so its inverse is used instead when given: base -> quote is then
+    (base -> pivot) x (pivot -> quote), and a small quote leg is divided through as quote -> pivot.
+    0 marks an inverse that is unavailable.
+    """
+    numerator, denominator = RATE_SCALE, 1
+    if pivot_to_base < MIN_PRECISE_FIXED_POINT and base_to_pivot > pivot_to_base:
+        numerator, denominator = numerator * base_to_pivot, denominator * RATE_SCALE
+    else:
+        numerator, denominator = numerator * RATE_SCALE, denominator * pivot_to_base
+    if pivot_to_quote < MIN_PRECISE_FIXED_POINT and quote_to_pivot > pivot_to_quote:
+        numerator, denominator = numerator * RATE_SCALE, denominator * quote_to_pivot
+    else:
+        numerator, denominator = numerator * pivot_to_quote, denominator * RATE_SCALE
+    return (2 * numerator + denominator) // (2 * denominator)
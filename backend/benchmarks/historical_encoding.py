@@ -0,0 +1,78 @@
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.exchange_rates.encoding import encode_historical_response
+from app.models import Currency
+from app.repositories.rate_series import RateSeries
+from app.schema.exchange_rate_response import ExchangeRateData, HistoricalExchangeRateResponse
+from app.utils import from_fixed_point
+
+
+def _build_envelope(data: list[ExchangeRateData], total: int) -> HistoricalExchangeRateResponse:
+    return HistoricalExchangeRateResponse(
+        base_currency_code=Currency("USD"),
+        quote_currency_code=Currency("EUR"),
+        data=data,
+        total=total,
+        page=1,
+        size=total,
+        pages=1,
+        next_cursor=None,
+    )
+
+
+def _build_series(size: int) -> RateSeries:
+    start_date = date(2020, 1, 1)
+    generator = random.Random(42)
+    return RateSeries.from_rates(
+        (start_date + timedelta(days=day), from_fixed_point(generator.randint(1, 10**13))) for day in range(size)
+    )
+
+
+def _encode_json_response(series: RateSeries) -> bytes:
+    data = [ExchangeRateData(rate=rate, date=as_of) for as_of, rate in series]
+    return bytes(JSONResponse(jsonable_encoder(_build_envelope(data, total=len(series)))).body)
+
+
+def _encode_series(series: RateSeries) -> bytes:
+    return encode_historical_response(_build_envelope([], total=len(series)), series)
+
+
+def run_benchmark(rows: int, rounds: int) -> None:
+    series = _build_series(rows)
+    if _encode_series(series) != _encode_json_response(series):
+        raise RuntimeError("Encoded responses differ")
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        _encode_json_response(series)
+    json_response_elapsed = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        _encode_series(series)
+    series_elapsed = (time.perf_counter() - start) / rounds
+
+    print(f"{rows}-row historical page, {rounds} rounds")
+    print(f"  pydantic rows + JSONResponse: {json_response_elapsed * 1000:.3f} ms/page")
+    print(f"  encoded from the rate series: {series_elapsed * 1000:.3f} ms/page")
+
+
+if __name__ == "__main__":
+    """
+    Compare encoding a historical page from its rate series with FastAPI's default JSONResponse rendering.
+
+    Example:
+        uv run python -m benchmarks.historical_encoding --rows 1000
+    """
+    parser = argparse.ArgumentParser(description="Benchmark historical response encoding")
+    parser.add_argument("--rows", type=int, default=1_000, help="Number of rates in the page (default: 1000)")
+    parser.add_argument("--rounds", type=int, default=50, help="Number of timed encodings per path (default: 50)")
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.rounds)
@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime
+
+from tortoise import Tortoise
+from tortoise.queryset import QuerySet
+
+from app.core.database import TORTOISE_ORM
+from app.models import Currency, ExchangeRate
+
+PAGE_SIZE = 1_000
+
+
+async def _measure(call: Callable[[], Awaitable[list[object]]], repeat: int) -> tuple[int, int, float]:
+    """Return the rows read by one call, the peak bytes it allocated and the mean seconds per call."""
+    tracemalloc.start()
+    rows = await call()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await call()
+    return len(rows), peak, (time.perf_counter() - start) / repeat
+
+
+async def run_benchmark(
+    base_currency_code: Currency, quote_currency_code: Currency, start_date: date, end_date: date, repeat: int
+) -> None:
+    def filter_page() -> QuerySet[ExchangeRate]:
+        return (
+            ExchangeRate.filter(
+                base_currency_code=base_currency_code,
+                quote_currency_code=quote_currency_code,
+                as_of__gte=start_date,
+                as_of__lte=end_date,
+            )
+            .order_by("-as_of")
+            .limit(PAGE_SIZE)
+        )
+
+    async def get_models_page() -> list[object]:
+        return list(await filter_page())
+
+    async def get_projected_page() -> list[object]:
+        return list(await filter_page().values_list("as_of", "rate"))
+
+    try:
+        await Tortoise.init(config=TORTOISE_ORM)
+        # Warm the connection pool so neither measurement includes connecting
+        await get_projected_page()
+        models_rows, models_peak, models_elapsed = await _measure(get_models_page, repeat)
+        projected_rows, projected_peak, projected_elapsed = await _measure(get_projected_page, repeat)
+    finally:
+        await Tortoise.close_connections()
+
+    print(f"{base_currency_code}/{quote_currency_code} from {start_date} to {end_date}, pages of {PAGE_SIZE} rates")
+    print(
+        f"  ExchangeRate models:    {models_elapsed * 1000:.3f} ms/page, {models_rows} rows, "
+        f"{models_peak / 1024:.1f} KiB peak"
+    )
+    print(
+        f"  values_list projection: {projected_elapsed * 1000:.3f} ms/page, {projected_rows} rows, "
+        f"{projected_peak / 1024:.1f} KiB peak"
+    )
+
+
+if __name__ == "__main__":
+    """
+    Compare reading a page of historical rates as hydrated ExchangeRate models with reading only
+    the (as_of, rate) columns through values_list, against the configured database.
+
+    Example:
+        uv run python -m benchmarks.historical_series --base USD --quote EUR --start-date 2020-01-01
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark historical pages as ExchangeRate models vs a values_list projection"
+    )
+    parser.add_argument("--base", type=str, default="USD", help="Base currency code (default: USD)")
+    parser.add_argument("--quote", type=str, default="EUR", help="Quote currency code (default: EUR)")
+    parser.add_argument("--start-date", type=str, default="2000-01-01", help="Start date in YYYY-MM-DD format")
+    parser.add_argument("--end-date", type=str, help="End date in YYYY-MM-DD format (default: today)")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of timed calls per path (default: 20)")
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_benchmark(
+            Currency(args.base),
+            Currency(args.quote),
+            datetime.strptime(args.start_date, "%Y-%m-%d").date(),
+            datetime.strptime(args.end_date, "%Y-%m-%d").date() if args.end_date else date.today(),
+            args.repeat,
+        )
+    )
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.integrations.open_exchange_rates import OpenExchangeRatesClient
+from app.integrations.retry_policy import TokenBucket
+
+RESPONSE_BODY = b'{"disclaimer": "", "license": "", "timestamp": 0, "base": "USD", "rates": {"EUR": 0.9}}'
+
+
+async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer every request on a keep-alive connection with the same small JSON body."""
+    try:
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Content-Length: " + str(len(RESPONSE_BODY)).encode() + b"\r\n"
+                b"\r\n" + RESPONSE_BODY
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _time_per_request_client(base_url: str, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{base_url}/historical/2025-01-31.json", params={"app_id": "stub"})
+            response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def _time_pooled_client(base_url: str, requests: int) -> float:
+    start = time.perf_counter()
+    # Measure the connection reuse alone, not the client's default throttle on requests per second
+    rate_limiter = TokenBucket(rate=1_000_000, capacity=requests)
+    async with OpenExchangeRatesClient(rate_limiter=rate_limiter) as client:
+        client.base_url = base_url
+        for _ in range(requests):
+            await client.get("historical/2025-01-31.json")
+    return time.perf_counter() - start
+
+
+async def run_benchmark(requests: int) -> None:
+    server = await asyncio.start_server(_handle_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    async with server:
+        per_request_elapsed = await _time_per_request_client(base_url, requests)
+        pooled_elapsed = await _time_pooled_client(base_url, requests)
+
+    print(f"{requests} requests against a local stub server")
+    print(f"  new client per request: {per_request_elapsed / requests * 1000:.3f} ms/request")
+    print(f"  pooled client:          {pooled_elapsed / requests * 1000:.3f} ms/request")
+
+
+if __name__ == "__main__":
+    """
+    Compare per-request overhead of a fresh httpx client per request with the pooled OpenExchangeRatesClient.
+
+    Example:
+        uv run python -m benchmarks.oxr_client --requests 500
+    """
+    parser = argparse.ArgumentParser(description="Benchmark OpenExchangeRatesClient connection pooling")
+    parser.add_argument("--requests", type=int, default=200, help="Number of requests per client (default: 200)")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.requests))
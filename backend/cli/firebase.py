@@ -29,8 +29,12 @@ async def _get_latest_exchange_rates() -> list[ExchangeRate]:
         rates = await exchange_rate_service.get_latest_rates(
             base_currency_code=Currency("USD"),
         )
+        if not rates:
+            return []
 
-        return rates
+        # Firebase expects a single snapshot date, so leave out quotes that fell back to older dates
+        latest_date = max(rate.as_of for rate in rates)
+        return [rate for rate in rates if rate.as_of == latest_date]
     except Exception as e:
         print(f"Retrieving latest exchange rates failed: {e}", file=sys.stderr)
         return []
@@ -0,0 +1,47 @@
+import asyncio
+import sys
+
+from tortoise import Tortoise
+
+from app.core.database import TORTOISE_ORM
+from app.core.dependencies import get_exchange_rate_service
+from app.repositories.shared_response_cache import close_shared_response_cache, publish_invalidation
+
+
+async def _run_rebuild_catalogs() -> bool:
+    exchange_rate_service = await get_exchange_rate_service()
+
+    try:
+        await Tortoise.init(config=TORTOISE_ORM)
+        await exchange_rate_service.rebuild_catalogs()
+        await publish_invalidation()
+        print("Catalogs rebuilt successfully")
+        return True
+    except Exception as e:
+        print(f"Rebuilding catalogs failed: {e}", file=sys.stderr)
+        return False
+    finally:
+        await close_shared_response_cache()
+        await Tortoise.close_connections()
+
+
+def run_rebuild_catalogs() -> bool:
+    """Rebuild the tables derived from exchange_rates and invalidate every cached rate."""
+
+    try:
+        return asyncio.run(_run_rebuild_catalogs())
+    except Exception as e:
+        print(f"Rebuilding catalogs failed: {e}", file=sys.stderr)
+        return False
+
+
+if __name__ == "__main__":
+    """
+    Rebuild available_dates, currency_pairs and exchange_rate_changes after rates were written
+    directly to the database, and bump the data version.
+
+    Example:
+        uv run python -m cli.rebuild_catalogs
+    """
+    result = run_rebuild_catalogs()
+    sys.exit(0 if result else 1)
@@ -10,12 +10,18 @@ from app.core.dependencies import get_exchange_rate_service
 from app.services.exchange_rate_refresh import ExchangeRateRefresh
 
 
-async def _run_manual_refresh(start_date: date, end_date: date) -> bool:
+def _print_progress(saved_count: int, total_count: int) -> None:
+    print(f"Saved {saved_count}/{total_count} dates")
+
+
+async def _run_manual_refresh(start_date: date, end_date: date, max_concurrency: int) -> bool:
     exchange_rate_service = await get_exchange_rate_service()
     exchange_rate_refresh = ExchangeRateRefresh(
         exchange_rate_service=exchange_rate_service,
         start_date=start_date,
         end_date=end_date,
+        max_concurrency=max_concurrency,
+        progress_callback=_print_progress,
     )
 
     try:
@@ -31,11 +37,13 @@ async def _run_manual_refresh(start_date: date, end_date: date) -> bool:
         await Tortoise.close_connections()
 
 
-def run_manual_refresh(start_date: date, end_date: date) -> bool:
+def run_manual_refresh(
+    start_date: date, end_date: date, max_concurrency: int = ExchangeRateRefresh.MAX_CONCURRENCY
+) -> bool:
     """Run the exchange rate refresh process for the specified date range."""
 
     try:
-        return asyncio.run(_run_manual_refresh(start_date, end_date))
+        return asyncio.run(_run_manual_refresh(start_date, end_date, max_concurrency))
     except Exception as e:
         print(f"Refresh failed: {e}", file=sys.stderr)
         return False
@@ -51,6 +59,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Manually refresh exchange rates for a date range")
     parser.add_argument("--start-date", type=str, help="Start date in YYYY-MM-DD format")
     parser.add_argument("--end-date", type=str, help="End date in YYYY-MM-DD format")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=ExchangeRateRefresh.MAX_CONCURRENCY,
+        help=f"Maximum number of dates fetched in parallel (default: {ExchangeRateRefresh.MAX_CONCURRENCY})",
+    )
     args = parser.parse_args()
 
     start_date = None
@@ -71,6 +85,9 @@ if __name__ == "__main__":
     if start_date and end_date and start_date > end_date:
         print(f"Error: Start date ({start_date}) must be before end date ({end_date}).")
         sys.exit(1)
+    if args.max_concurrency < 1:
+        print(f"Error: Max concurrency ({args.max_concurrency}) must be at least 1.")
+        sys.exit(1)
 
-    result = run_manual_refresh(start_date=start_date, end_date=end_date)
+    result = run_manual_refresh(start_date=start_date, end_date=end_date, max_concurrency=args.max_concurrency)
     sys.exit(0 if result else 1)
@@ -0,0 +1,22 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(_db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "refresh_ledger" (
+    "as_of" DATE NOT NULL PRIMARY KEY,
+    "status" VARCHAR(10) NOT NULL,
+    "attempts" INT NOT NULL DEFAULT 0,
+    "fetched_at" TIMESTAMPTZ,
+    "error" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS "idx_refresh_led_status_1a8f3c" ON "refresh_ledger" ("status", "as_of");
+COMMENT ON COLUMN "refresh_ledger"."status" IS 'PENDING: pending\\nSAVED: saved\\nFAILED: failed';
+COMMENT ON TABLE "refresh_ledger" IS 'Model recording the refresh progress of each date.';"""
+
+
+async def downgrade(_db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "refresh_ledger";"""
@@ -0,0 +1,16 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(_db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "available_dates" (
+    "as_of" DATE NOT NULL PRIMARY KEY,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+COMMENT ON TABLE "available_dates" IS 'Model listing every date that has exchange rates stored.';
+INSERT INTO "available_dates" ("as_of") SELECT DISTINCT "as_of" FROM "exchange_rates" ON CONFLICT DO NOTHING;"""
+
+
+async def downgrade(_db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "available_dates";"""
@@ -0,0 +1,25 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(_db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "currency_pairs" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "base_currency_code" VARCHAR(3) NOT NULL,
+    "quote_currency_code" VARCHAR(3) NOT NULL,
+    "first_date" DATE NOT NULL,
+    "last_date" DATE NOT NULL,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT "uid_currency_pa_base_cu_4e2a91" UNIQUE ("base_currency_code", "quote_currency_code")
+);
+COMMENT ON TABLE "currency_pairs" IS 'Model listing each stored currency pair with the date range of its rates.';
+INSERT INTO "currency_pairs" ("base_currency_code", "quote_currency_code", "first_date", "last_date")
+SELECT "base_currency_code", "quote_currency_code", MIN("as_of"), MAX("as_of")
+FROM "exchange_rates"
+GROUP BY "base_currency_code", "quote_currency_code"
+ON CONFLICT DO NOTHING;"""
+
+
+async def downgrade(_db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "currency_pairs";"""
@@ -0,0 +1,17 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(_db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "data_version" (
+    "id" INT NOT NULL PRIMARY KEY,
+    "version" BIGINT NOT NULL DEFAULT 0,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+COMMENT ON TABLE "data_version" IS 'Model holding a single counter bumped whenever exchange rates are written.';
+INSERT INTO "data_version" ("id", "version") VALUES (1, 1) ON CONFLICT DO NOTHING;"""
+
+
+async def downgrade(_db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "data_version";"""
@@ -0,0 +1,45 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(_db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "exchange_rate_changes" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "base_currency_code" VARCHAR(3) NOT NULL,
+    "quote_currency_code" VARCHAR(3) NOT NULL,
+    "period" VARCHAR(3) NOT NULL,
+    "as_of" DATE NOT NULL,
+    "rate" DECIMAL(18,8) NOT NULL,
+    "previous_as_of" DATE NOT NULL,
+    "previous_rate" DECIMAL(18,8) NOT NULL,
+    "change_percent" DECIMAL(18,8) NOT NULL,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT "uid_exchange_ra_base_cu_8c3d27" UNIQUE ("base_currency_code", "quote_currency_code", "period")
+);
+COMMENT ON TABLE "exchange_rate_changes"
+    IS 'Model holding the change of each currency pair''s latest rate over a period.';
+INSERT INTO "exchange_rate_changes" (
+    "base_currency_code", "quote_currency_code", "period", "as_of", "rate", "previous_as_of", "previous_rate",
+    "change_percent"
+)
+SELECT pairs."base_currency_code", pairs."quote_currency_code", periods.period, latest."as_of", latest."rate",
+    previous."as_of", previous."rate", ROUND((latest."rate" - previous."rate") / previous."rate" * 100, 8)
+FROM "currency_pairs" AS pairs
+CROSS JOIN LATERAL (
+    SELECT "as_of", "rate" FROM "exchange_rates"
+    WHERE "base_currency_code" = pairs."base_currency_code" AND "quote_currency_code" = pairs."quote_currency_code"
+    ORDER BY "as_of" DESC LIMIT 1
+) AS latest
+CROSS JOIN (VALUES ('1d', 1), ('7d', 7), ('30d', 30), ('ytd', NULL)) AS periods(period, days)
+CROSS JOIN LATERAL (
+    SELECT "as_of", "rate" FROM "exchange_rates"
+    WHERE "base_currency_code" = pairs."base_currency_code" AND "quote_currency_code" = pairs."quote_currency_code"
+    AND "as_of" <= COALESCE(latest."as_of" - periods.days, DATE_TRUNC('year', latest."as_of")::date - 1)
+    ORDER BY "as_of" DESC LIMIT 1
+) AS previous
+ON CONFLICT DO NOTHING;"""
+
+
+async def downgrade(_db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "exchange_rate_changes";"""
@@ -28,6 +28,39 @@ EOF
 
 # Import to destination database
 psql "host=$POSTGRES_HOST port=$POSTGRES_PORT dbname=$POSTGRES_DB user=$POSTGRES_USER password=$POSTGRES_PASSWORD" << EOF
-$(if [ "$CLEAR_EXISTING" = true ]; then echo "TRUNCATE TABLE exchange_rates;"; fi)
+$(if [ "$CLEAR_EXISTING" = true ]; then echo "TRUNCATE TABLE exchange_rates, available_dates, currency_pairs, exchange_rate_changes, refresh_ledger;"; fi)
 \COPY exchange_rates(id, as_of, base_currency_code, quote_currency_code, rate, data_source, created_at, updated_at) FROM 'tmp/exchange_rates.csv' WITH CSV HEADER;
+-- Every seeded date may have been rewritten, so mark them all for the rate matrix to reload
+INSERT INTO available_dates(as_of) SELECT DISTINCT as_of FROM exchange_rates
+  ON CONFLICT (as_of) DO UPDATE SET updated_at = CURRENT_TIMESTAMP;
+INSERT INTO currency_pairs(base_currency_code, quote_currency_code, first_date, last_date)
+  SELECT base_currency_code, quote_currency_code, MIN(as_of), MAX(as_of) FROM exchange_rates
+  GROUP BY base_currency_code, quote_currency_code
+  ON CONFLICT (base_currency_code, quote_currency_code) DO UPDATE SET
+    first_date = EXCLUDED.first_date, last_date = EXCLUDED.last_date;
+-- Same query as ExchangeRateService._update_rate_changes, over every pair
+INSERT INTO exchange_rate_changes(
+    base_currency_code, quote_currency_code, period, as_of, rate, previous_as_of, previous_rate, change_percent
+)
+  SELECT pairs.base_currency_code, pairs.quote_currency_code, periods.period, latest.as_of, latest.rate,
+    previous.as_of, previous.rate, ROUND((latest.rate - previous.rate) / previous.rate * 100, 8)
+  FROM currency_pairs AS pairs
+  CROSS JOIN LATERAL (
+    SELECT as_of, rate FROM exchange_rates
+    WHERE base_currency_code = pairs.base_currency_code AND quote_currency_code = pairs.quote_currency_code
+    ORDER BY as_of DESC LIMIT 1
+  ) AS latest
+  CROSS JOIN (VALUES ('1d', 1), ('7d', 7), ('30d', 30), ('ytd', NULL)) AS periods(period, days)
+  CROSS JOIN LATERAL (
+    SELECT as_of, rate FROM exchange_rates
+    WHERE base_currency_code = pairs.base_currency_code AND quote_currency_code = pairs.quote_currency_code
+    AND as_of <= COALESCE(latest.as_of - periods.days, DATE_TRUNC('year', latest.as_of)::date - 1)
+    ORDER BY as_of DESC LIMIT 1
+  ) AS previous
+  ON CONFLICT (base_currency_code, quote_currency_code, period) DO UPDATE SET
+    as_of = EXCLUDED.as_of, rate = EXCLUDED.rate, previous_as_of = EXCLUDED.previous_as_of,
+    previous_rate = EXCLUDED.previous_rate, change_percent = EXCLUDED.change_percent, updated_at = CURRENT_TIMESTAMP;
+-- New data version, so ETags and cached responses for the previous rates are no longer served
+INSERT INTO data_version(id, version, updated_at) VALUES (1, 1, CURRENT_TIMESTAMP)
+  ON CONFLICT (id) DO UPDATE SET version = data_version.version + 1, updated_at = EXCLUDED.updated_at;
 EOF
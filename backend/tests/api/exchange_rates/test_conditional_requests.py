@@ -0,0 +1,131 @@
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.api.exchange_rates.conditional import build_etag, etag_matches
+from app.services.exchange_rate_service import ExchangeRateServiceInterface
+
+ENDPOINTS = [
+    "/api/v1/exchange_rates/available_dates",
+    "/api/v1/exchange_rates/available_currency_pairs",
+    "/api/v1/exchange_rates/USD/EUR/latest",
+    "/api/v1/exchange_rates/USD/latest",
+    "/api/v1/exchange_rates/USD/EUR/historical",
+    "/api/v1/exchange_rates/historical?pairs=USD-EUR,EUR-GBP",
+    "/api/v1/exchange_rates/USD/EUR/aggregates",
+    "/api/v1/exchange_rates/USD/EUR/changes",
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("url", ENDPOINTS)
+@patch("app.api.exchange_rates.conditional.date")
+async def test_api_v1_responses_are_tagged_with_data_version(
+    mock_date: MagicMock,
+    url: str,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2025, 4, 3)
+
+    response = await async_client.get(url)
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"1-2025-04-03"'
+    assert response.headers["last-modified"] == "Thu, 03 Apr 2025 12:00:00 GMT"
+    assert response.headers["cache-control"] == "no-cache"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("url", ENDPOINTS)
+@patch("app.api.exchange_rates.conditional.date")
+async def test_api_v1_matching_etag_returns_not_modified(
+    mock_date: MagicMock,
+    url: str,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2025, 4, 3)
+
+    response = await async_client.get(url, headers={"If-None-Match": '"1-2025-04-03"'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == '"1-2025-04-03"'
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.conditional.date")
+async def test_api_v1_not_modified_skips_endpoint_work(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2025, 4, 3)
+
+    with patch.object(with_test_exchange_rate_service, "get_available_dates", new_callable=AsyncMock) as mock:
+        response = await async_client.get(
+            "/api/v1/exchange_rates/available_dates", headers={"If-None-Match": '"1-2025-04-03"'}
+        )
+
+    assert response.status_code == 304
+    mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.conditional.date")
+async def test_api_v1_stale_etag_returns_full_response(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2025, 4, 4)
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/available_dates", headers={"If-None-Match": '"1-2025-04-03"'}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"1-2025-04-04"'
+    assert response.json()["data"] == ["2025-04-01", "2025-04-02", "2025-04-03"]
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.conditional.date")
+async def test_api_v1_historical_representations_are_tagged_separately(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2025, 4, 3)
+    url = "/api/v1/exchange_rates/USD/EUR/historical"
+
+    json_response = await async_client.get(url)
+    csv_response = await async_client.get(url, headers={"Accept": "text/csv"})
+    assert json_response.headers["etag"] == '"1-2025-04-03"'
+    assert csv_response.headers["etag"] == '"1-2025-04-03-csv"'
+    assert json_response.headers["vary"] == csv_response.headers["vary"] == "Accept"
+
+    # A tag for one representation does not validate another
+    response = await async_client.get(url, headers={"Accept": "text/csv", "If-None-Match": '"1-2025-04-03"'})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    response = await async_client.get(url, headers={"Accept": "text/csv", "If-None-Match": '"1-2025-04-03-csv"'})
+    assert response.status_code == 304
+    assert response.headers["etag"] == '"1-2025-04-03-csv"'
+    assert response.headers["vary"] == "Accept"
+
+
+def test_etag_matches() -> None:
+    etag = build_etag(7, date(2025, 4, 3))
+
+    assert etag == '"7-2025-04-03"'
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"6-2025-04-03", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"6-2025-04-03"', etag)
+    assert build_etag(7, date(2025, 4, 3), "application/x-ndjson") == '"7-2025-04-03-ndjson"'
@@ -0,0 +1,83 @@
+import random
+from datetime import date, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.exchange_rates.encoding import (
+    encode_csv_rows,
+    encode_historical_response,
+    encode_ndjson_rows,
+    format_fixed_point,
+)
+from app.models import Currency
+from app.repositories.rate_series import RateSeries
+from app.schema.exchange_rate_response import ExchangeRateData, HistoricalExchangeRateResponse
+from app.utils import from_fixed_point
+
+
+def _build_envelope(data: list[ExchangeRateData], total: int) -> HistoricalExchangeRateResponse:
+    return HistoricalExchangeRateResponse(
+        base_currency_code=Currency("USD"),
+        quote_currency_code=Currency("EUR"),
+        data=data,
+        total=total,
+        page=1,
+        size=1_000,
+        pages=1,
+        next_cursor=None,
+    )
+
+
+def _build_series(size: int) -> RateSeries:
+    start_date = date(2020, 1, 1)
+    generator = random.Random(42)
+    return RateSeries.from_rates(
+        (start_date + timedelta(days=day), from_fixed_point(generator.randint(1, 10**13))) for day in range(size)
+    )
+
+
+def test_format_fixed_point_matches_decimal() -> None:
+    values = [1, 10, 100_000, 1_000_000, 50_000_000, 100_000_000, 102_000_000, 10**10, 10**12 + 1, 123_456_789_012]
+    generator = random.Random(0)
+    values += [generator.randint(1, 10**16) for _ in range(10_000)]
+    values += [generator.randint(1, 9) * 10 ** generator.randint(0, 16) for _ in range(1_000)]
+
+    for value in values:
+        assert format_fixed_point(value) == str(from_fixed_point(value))
+
+
+def test_encode_historical_response_matches_pydantic() -> None:
+    series = _build_series(50)
+    data = [ExchangeRateData(rate=rate, date=as_of) for as_of, rate in series]
+
+    expected = _build_envelope(data, total=50).model_dump_json().encode()
+    assert encode_historical_response(_build_envelope([], total=50), series) == expected
+
+    expected = _build_envelope([], total=0).model_dump_json().encode()
+    assert encode_historical_response(_build_envelope([], total=0), RateSeries()) == expected
+
+
+def test_encode_export_rows() -> None:
+    series = RateSeries.from_rates(
+        [
+            (date(2024, 1, 1), from_fixed_point(100_000_000)),
+            (date(2024, 1, 2), from_fixed_point(10**10)),
+            (date(2024, 1, 3), from_fixed_point(85_000_000)),
+        ]
+    )
+
+    assert encode_csv_rows(series) == "2024-01-01,1\n2024-01-02,1E+2\n2024-01-03,0.85\n"
+    assert encode_ndjson_rows(series) == "".join(
+        ExchangeRateData(rate=rate, date=as_of).model_dump_json() + "\n" for as_of, rate in series
+    )
+    assert encode_csv_rows(RateSeries()) == ""
+
+
+def test_encode_historical_response_matches_json_response() -> None:
+    """A full page is sent byte for byte as FastAPI's default JSONResponse would send it."""
+    series = _build_series(1_000)
+    data = [ExchangeRateData(rate=rate, date=as_of) for as_of, rate in series]
+
+    expected = JSONResponse(jsonable_encoder(_build_envelope(data, total=1_000))).body
+    assert encode_historical_response(_build_envelope([], total=1_000), series) == expected
@@ -0,0 +1,109 @@
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.repositories.response_cache import historical_response_cache
+from app.schema.exchange_rate_response import RateAggregatesResponse
+from app.services.exchange_rate_service import ExchangeRateServiceInterface
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.date_range.date")
+async def test_api_v1_exchange_rate_aggregates(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2024, 11, 1)
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/aggregates", params={"start_date": "2024-01-01", "window": 2}
+    )
+    assert response.status_code == 200
+
+    response_json = response.json()
+    assert RateAggregatesResponse(**response_json)
+    assert response_json == {
+        "base_currency_code": "USD",
+        "quote_currency_code": "EUR",
+        "interval": "monthly",
+        "window": 2,
+        "data": [
+            {
+                "start_date": "2024-10-10",
+                "end_date": "2024-10-31",
+                "open": "0.98",
+                "high": "0.98",
+                "low": "0.92",
+                "close": "0.92",
+                "change_percent": "-17.85714286",
+                "rolling_mean": "1.02",
+                "rolling_stdev": "0.14142135",
+            },
+            {
+                "start_date": "2024-04-02",
+                "end_date": "2024-04-02",
+                "open": "1.12",
+                "high": "1.12",
+                "low": "1.12",
+                "close": "1.12",
+                "change_percent": "6.66666667",
+                "rolling_mean": "1.085",
+                "rolling_stdev": "0.04949747",
+            },
+            {
+                "start_date": "2024-01-01",
+                "end_date": "2024-01-05",
+                "open": "1",
+                "high": "1.05",
+                "low": "1",
+                "close": "1.05",
+                "change_percent": None,
+                "rolling_mean": None,
+                "rolling_stdev": None,
+            },
+        ],
+    }
+
+    # Served from the cache for the same data version
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/aggregates", params={"start_date": "2024-01-01", "window": 2}
+    )
+    assert response.status_code == 200
+    assert response.json() == response_json
+    assert historical_response_cache.stats().hits == 1
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/aggregates",
+        params={"start_date": "2024-10-01", "interval": "daily", "window": 3, "order": "asc"},
+    )
+    assert response.status_code == 200
+    assert [(row["close"], row["rolling_mean"]) for row in response.json()["data"]] == [
+        ("0.98", None),
+        ("0.95", None),
+        ("0.92", "0.95"),
+    ]
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.date_range.date")
+async def test_api_v1_exchange_rate_aggregates_validation_errors(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2024, 11, 1)
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/aggregates", params={"start_date": "2024-10-01", "end_date": "2024-09-01"}
+    )
+    assert response.status_code == 422
+    assert response.json() == {"detail": "start_date must be before or equal to end_date"}
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/aggregates", params={"interval": "lttb", "window": 1}
+    )
+    assert response.status_code == 422
+    assert {error["loc"][-1] for error in response.json()["detail"]} == {"interval", "window"}
@@ -0,0 +1,41 @@
+import pytest
+from httpx import AsyncClient
+
+from app.schema.exchange_rate_response import ExchangeRateChangesResponse
+from app.services.exchange_rate_service import ExchangeRateServiceInterface
+
+
+@pytest.mark.asyncio
+async def test_api_v1_exchange_rate_changes(
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    response = await async_client.get("/api/v1/exchange_rates/USD/EUR/changes")
+    assert response.status_code == 200
+
+    response_json = response.json()
+    assert ExchangeRateChangesResponse(**response_json)
+    assert response_json == {
+        "base_currency_code": "USD",
+        "quote_currency_code": "EUR",
+        "rate": "0.92",
+        "date": "2024-10-31",
+        "data": [
+            {"period": "1d", "previous_date": "2024-10-22", "previous_rate": "0.95", "change_percent": "-3.15789474"},
+            {"period": "7d", "previous_date": "2024-10-22", "previous_rate": "0.95", "change_percent": "-3.15789474"},
+            {"period": "30d", "previous_date": "2024-04-02", "previous_rate": "1.12", "change_percent": "-17.85714286"},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_api_v1_exchange_rate_changes_not_found(
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    response = await async_client.get("/api/v1/exchange_rates/USD/CHF/changes")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "No exchange rate changes found for USD/CHF"}
+
+    response = await async_client.get("/api/v1/exchange_rates/USD/XYZ/changes")
+    assert response.status_code == 422
@@ -1,10 +1,17 @@
 from datetime import date
-from unittest.mock import MagicMock, patch
+from typing import cast
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from httpx import AsyncClient, Response
+from redis.asyncio import Redis
 
+from app.api.exchange_rates.cursor import encode_cursor
+from app.core.config import settings
+from app.repositories.response_cache import historical_response_cache
+from app.repositories.shared_response_cache import SharedResponseCache
 from app.services.exchange_rate_service import ExchangeRateServiceInterface
+from tests.support.fake_redis import FakeRedis
 
 
 def assert_historical_exchange_rates_response(
@@ -26,6 +33,7 @@ def assert_historical_exchange_rates_response(
         "page",
         "size",
         "pages",
+        "next_cursor",
     }
 
     assert response_json["base_currency_code"] == "USD"
@@ -43,7 +51,7 @@ def assert_historical_exchange_rates_response(
 
 
 @pytest.mark.asyncio
-@patch("app.api.exchange_rates.historical_exchange_rates.date")
+@patch("app.api.exchange_rates.date_range.date")
 async def test_api_v1_historical_exchange_rates(
     mock_date: MagicMock,
     async_client: AsyncClient,
@@ -69,7 +77,136 @@ async def test_api_v1_historical_exchange_rates(
 
 
 @pytest.mark.asyncio
-@patch("app.api.exchange_rates.historical_exchange_rates.date")
+@patch("app.api.exchange_rates.date_range.date")
+async def test_api_v1_historical_exchange_rates_with_resolution(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2024, 11, 1)
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/historical", params={"start_date": "2024-01-01", "resolution": "monthly"}
+    )
+    assert response.status_code == 200
+    assert response.json()["data"] == [
+        {"rate": "0.92", "date": "2024-10-31"},
+        {"rate": "1.12", "date": "2024-04-02"},
+        {"rate": "1.05", "date": "2024-01-05"},
+    ]
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/historical",
+        params={"start_date": "2024-01-01", "order": "asc", "resolution": "lttb", "points": 3},
+    )
+    assert response.status_code == 200
+    assert [row["date"] for row in response.json()["data"]] == ["2024-01-01", "2024-04-02", "2024-10-31"]
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/historical", params={"resolution": "hourly", "points": 2}
+    )
+    assert response.status_code == 422
+    assert {error["loc"][-1] for error in response.json()["detail"]} == {"resolution", "points"}
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.date_range.date")
+async def test_api_v1_historical_exchange_rates_csv(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2024, 11, 1)
+
+    # Pagination does not apply to the CSV export
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/historical",
+        params={"start_date": "2024-01-01", "size": 2, "order": "asc"},
+        headers={"Accept": "text/csv"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="USD-EUR-2024-01-01-2024-11-01.csv"'
+    assert response.headers["vary"] == "Accept"
+    assert response.headers["etag"]
+    assert response.text == (
+        "date,rate\n"
+        "2024-01-01,1\n"
+        "2024-01-02,1.02\n"
+        "2024-01-03,1.04\n"
+        "2024-01-05,1.05\n"
+        "2024-04-02,1.12\n"
+        "2024-10-10,0.98\n"
+        "2024-10-22,0.95\n"
+        "2024-10-31,0.92\n"
+    )
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.date_range.date")
+async def test_api_v1_historical_exchange_rates_negotiates_by_quality(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2024, 11, 1)
+    url = "/api/v1/exchange_rates/USD/EUR/historical"
+    params = {"start_date": "2024-10-01"}
+
+    response = await async_client.get(url, params=params, headers={"Accept": "application/json, text/csv;q=0"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+
+    response = await async_client.get(
+        url, params=params, headers={"Accept": "application/json;q=0.5, application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.date_range.date")
+async def test_api_v1_historical_exchange_rates_ndjson(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2024, 11, 1)
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/historical",
+        params={"start_date": "2024-10-01", "size": 1},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "content-disposition" not in response.headers
+    assert response.text == (
+        '{"rate":"0.92","date":"2024-10-31"}\n'
+        '{"rate":"0.95","date":"2024-10-22"}\n'
+        '{"rate":"0.98","date":"2024-10-10"}\n'
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [{}, {"size": 2, "order": "asc"}])
+async def test_api_v1_historical_exchange_rates_fast_json_responses(
+    params: dict[str, str | int],
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    default_response = await async_client.get("/api/v1/exchange_rates/USD/EUR/historical", params=params)
+    historical_response_cache.reset()
+
+    with patch.object(settings, "fast_json_responses", True):
+        fast_response = await async_client.get("/api/v1/exchange_rates/USD/EUR/historical", params=params)
+
+    assert fast_response.status_code == 200
+    assert fast_response.content == default_response.content
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.date_range.date")
 async def test_api_v1_historical_exchange_rates_with_start_date(
     mock_date: MagicMock,
     async_client: AsyncClient,
@@ -96,7 +233,7 @@ async def test_api_v1_historical_exchange_rates_with_start_date(
 
 
 @pytest.mark.asyncio
-@patch("app.api.exchange_rates.historical_exchange_rates.date")
+@patch("app.api.exchange_rates.date_range.date")
 async def test_api_v1_historical_exchange_rates_with_end_date(
     mock_date: MagicMock,
     async_client: AsyncClient,
@@ -151,7 +288,7 @@ async def test_api_v1_historical_exchange_rates_with_start_and_end_date(
 
 
 @pytest.mark.asyncio
-@patch("app.api.exchange_rates.historical_exchange_rates.date")
+@patch("app.api.exchange_rates.date_range.date")
 async def test_api_v1_historical_exchange_rates_with_limit(
     mock_date: MagicMock,
     async_client: AsyncClient,
@@ -180,7 +317,7 @@ async def test_api_v1_historical_exchange_rates_with_limit(
 
 
 @pytest.mark.asyncio
-@patch("app.api.exchange_rates.historical_exchange_rates.date")
+@patch("app.api.exchange_rates.date_range.date")
 async def test_api_v1_historical_exchange_rates_with_offset_and_limit(
     mock_date: MagicMock,
     async_client: AsyncClient,
@@ -210,7 +347,7 @@ async def test_api_v1_historical_exchange_rates_with_offset_and_limit(
 
 
 @pytest.mark.asyncio
-@patch("app.api.exchange_rates.historical_exchange_rates.date")
+@patch("app.api.exchange_rates.date_range.date")
 async def test_api_v1_historical_exchange_rates_with_order_asc(
     mock_date: MagicMock,
     async_client: AsyncClient,
@@ -236,7 +373,7 @@ async def test_api_v1_historical_exchange_rates_with_order_asc(
 
 
 @pytest.mark.asyncio
-@patch("app.api.exchange_rates.historical_exchange_rates.date")
+@patch("app.api.exchange_rates.date_range.date")
 async def test_api_v1_historical_exchange_rates_with_order_desc(
     mock_date: MagicMock,
     async_client: AsyncClient,
@@ -262,7 +399,7 @@ async def test_api_v1_historical_exchange_rates_with_order_desc(
 
 
 @pytest.mark.asyncio
-@patch("app.api.exchange_rates.historical_exchange_rates.date")
+@patch("app.api.exchange_rates.date_range.date")
 async def test_api_v1_historical_exchange_rates_with_limit_and_order_asc(
     mock_date: MagicMock,
     async_client: AsyncClient,
@@ -291,7 +428,103 @@ async def test_api_v1_historical_exchange_rates_with_limit_and_order_asc(
 
 
 @pytest.mark.asyncio
-@patch("app.api.exchange_rates.historical_exchange_rates.date")
+@patch("app.api.exchange_rates.date_range.date")
+async def test_api_v1_historical_exchange_rates_with_cursor(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    fixed_date = date(2024, 4, 5)
+    mock_date.today.return_value = fixed_date
+
+    response = await async_client.get("/api/v1/exchange_rates/USD/EUR/historical", params={"size": 2, "order": "asc"})
+    assert response.status_code == 200
+    next_cursor = response.json()["next_cursor"]
+    assert next_cursor == encode_cursor(date(2024, 1, 2), "asc")
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/historical", params={"size": 2, "order": "asc", "cursor": next_cursor}
+    )
+    assert response.status_code == 200
+
+    assert_historical_exchange_rates_response(
+        response,
+        data_size=2,
+        first_data={
+            "rate": "1.04",
+            "date": "2024-01-03",
+        },
+        last_data={
+            "rate": "1.05",
+            "date": "2024-01-05",
+        },
+        size=2,
+        pages=4,
+    )
+    assert response.json()["next_cursor"] == encode_cursor(date(2024, 1, 5), "asc")
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.date_range.date")
+async def test_api_v1_historical_exchange_rates_with_cursor_on_last_page(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    fixed_date = date(2024, 4, 5)
+    mock_date.today.return_value = fixed_date
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/historical",
+        params={"size": 2, "order": "asc", "cursor": encode_cursor(date(2024, 1, 5), "asc")},
+    )
+    assert response.status_code == 200
+
+    response_json = response.json()
+    assert response_json["data"] == [{"rate": "1.12", "date": "2024-04-02"}]
+    assert response_json["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.date_range.date")
+async def test_api_v1_historical_exchange_rates_without_total(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    fixed_date = date(2024, 4, 5)
+    mock_date.today.return_value = fixed_date
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/historical", params={"size": 2, "include_total": "false"}
+    )
+    assert response.status_code == 200
+
+    response_json = response.json()
+    assert response_json["total"] is None
+    assert response_json["pages"] is None
+    assert len(response_json["data"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_api_v1_historical_exchange_rates_with_invalid_cursor(
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    response = await async_client.get("/api/v1/exchange_rates/USD/EUR/historical", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "cursor is invalid"}
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/EUR/historical",
+        params={"cursor": encode_cursor(date(2024, 1, 5), "asc"), "order": "desc", "page": 2},
+    )
+    assert response.status_code == 422
+    assert response.json() == {"detail": "page cannot be combined with cursor; cursor does not match order"}
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.date_range.date")
 async def test_api_v1_historical_exchange_rates_with_start_date_after_today(
     mock_date: MagicMock,
     async_client: AsyncClient,
@@ -313,8 +546,11 @@ async def test_api_v1_historical_exchange_rates_without_usd(
     with_test_exchange_rate_service: ExchangeRateServiceInterface,
 ) -> None:
     response = await async_client.get("/api/v1/exchange_rates/JPY/EUR/historical")
-    assert response.status_code == 422
-    assert response.json() == {"detail": "At least one currency must be USD"}
+    assert response.status_code == 200
+
+    response_json = response.json()
+    assert response_json["base_currency_code"] == "JPY"
+    assert response_json["quote_currency_code"] == "EUR"
 
 
 @pytest.mark.asyncio
@@ -336,7 +572,7 @@ async def test_api_v1_historical_exchange_rates_with_start_date_after_end_date(
 
 
 @pytest.mark.asyncio
-@patch("app.api.exchange_rates.historical_exchange_rates.date")
+@patch("app.api.exchange_rates.date_range.date")
 async def test_api_v1_historical_exchange_rates_with_end_date_after_today(
     mock_date: MagicMock,
     async_client: AsyncClient,
@@ -437,3 +673,55 @@ async def test_api_v1_historical_exchange_rates_with_invalid_order(
     response_detail = response.json()["detail"]
     assert len(response_detail) == 1
     assert response_detail[0]["msg"] == "Input should be 'asc' or 'desc'"
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.date_range.date")
+async def test_api_v1_historical_exchange_rates_serves_cached_response(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2025, 4, 1)
+    url = "/api/v1/exchange_rates/USD/EUR/historical"
+
+    first_response = await async_client.get(url, params={"start_date": "2024-01-01"})
+    with patch.object(
+        with_test_exchange_rate_service, "get_historical_series", new_callable=AsyncMock
+    ) as mock_get_historical_series:
+        second_response = await async_client.get(url, params={"start_date": "2024-01-01"})
+
+    mock_get_historical_series.assert_not_called()
+    assert second_response.status_code == 200
+    assert second_response.headers["content-type"] == "application/json"
+    assert second_response.headers["etag"] == first_response.headers["etag"]
+    assert second_response.content == first_response.content
+    assert historical_response_cache.stats().hits == 1
+    assert historical_response_cache.stats().misses == 1
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.date_range.date")
+async def test_api_v1_historical_exchange_rates_shares_cached_response(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2025, 4, 1)
+    url = "/api/v1/exchange_rates/USD/EUR/historical"
+    fake_redis = FakeRedis()
+    shared_cache = SharedResponseCache(client_factory=lambda: cast(Redis, fake_redis), ttl_seconds=60)
+
+    with patch("app.api.exchange_rates.response_caching.shared_response_cache", shared_cache):
+        first_response = await async_client.get(url)
+        # Another worker starts with an empty per-worker cache
+        historical_response_cache.reset()
+        with patch.object(
+            with_test_exchange_rate_service, "get_historical_series", new_callable=AsyncMock
+        ) as mock_get_historical_series:
+            second_response = await async_client.get(url)
+
+    mock_get_historical_series.assert_not_called()
+    assert second_response.status_code == 200
+    assert second_response.content == first_response.content
+    assert historical_response_cache.stats().entries == 1
@@ -92,6 +92,13 @@ async def test_api_v1_latest_exchange_rates_without_usd(
     async_client: AsyncClient,
     with_test_exchange_rate_service: ExchangeRateServiceInterface,
 ) -> None:
+    response = await async_client.get("/api/v1/exchange_rates/GBP/EUR/latest", params={"desired_date": "2024-01-02"})
+    assert response.status_code == 200
+    assert response.json() == {
+        "base_currency_code": "GBP",
+        "quote_currency_code": "EUR",
+        "data": {"rate": "0.93577982", "date": "2024-01-02"},
+    }
+
     response = await async_client.get("/api/v1/exchange_rates/JPY/EUR/latest")
-    assert response.status_code == 422
-    assert response.json() == {"detail": "At least one currency must be USD"}
+    assert response.status_code == 404
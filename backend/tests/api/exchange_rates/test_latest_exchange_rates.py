@@ -0,0 +1,67 @@
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.schema.exchange_rate_response import LatestExchangeRatesResponse
+from app.services.exchange_rate_service import ExchangeRateServiceInterface
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.latest_exchange_rates.date")
+async def test_api_v1_latest_exchange_rates(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2025, 4, 1)
+
+    response = await async_client.get("/api/v1/exchange_rates/USD/latest")
+    assert response.status_code == 200
+
+    response_json = response.json()
+    assert LatestExchangeRatesResponse(**response_json)
+    assert response_json == {
+        "base_currency_code": "USD",
+        "data": [
+            {"quote_currency_code": "EUR", "rate": "1.02", "date": "2025-04-01"},
+            {"quote_currency_code": "GBP", "rate": "1.09", "date": "2025-04-01"},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_api_v1_latest_exchange_rates_with_quotes(
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    response = await async_client.get(
+        "/api/v1/exchange_rates/USD/latest", params={"quotes": "gbp, EUR,GBP,JPY", "desired_date": "2024-01-02"}
+    )
+    assert response.status_code == 200
+
+    # JPY has no rate and is left out
+    assert response.json()["data"] == [
+        {"quote_currency_code": "EUR", "rate": "1.02", "date": "2024-01-02"},
+        {"quote_currency_code": "GBP", "rate": "1.09", "date": "2024-01-02"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_api_v1_latest_exchange_rates_not_found(
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    response = await async_client.get("/api/v1/exchange_rates/USD/latest", params={"quotes": "JPY"})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_api_v1_latest_exchange_rates_validation_errors(
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    response = await async_client.get("/api/v1/exchange_rates/EUR/latest", params={"quotes": "GBP,XYZ,ABC"})
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Invalid quote currency code: XYZ; Invalid quote currency code: ABC"
@@ -0,0 +1,63 @@
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.schema.exchange_rate_response import MultiPairHistoricalExchangeRateResponse
+from app.services.exchange_rate_service import ExchangeRateServiceInterface
+
+
+@pytest.mark.asyncio
+@patch("app.api.exchange_rates.date_range.date")
+async def test_api_v1_multi_pair_historical_exchange_rates(
+    mock_date: MagicMock,
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    mock_date.today.return_value = date(2024, 11, 1)
+
+    response = await async_client.get(
+        "/api/v1/exchange_rates/historical",
+        params={"pairs": "usd-eur, EUR-JPY,USD-EUR", "start_date": "2024-10-01"},
+    )
+    assert response.status_code == 200
+
+    response_json = response.json()
+    assert MultiPairHistoricalExchangeRateResponse(**response_json)
+    assert response_json == {
+        "dates": ["2024-10-31", "2024-10-22", "2024-10-10"],
+        "series": [
+            {"base_currency_code": "USD", "quote_currency_code": "EUR", "rates": ["0.92", "0.95", "0.98"]},
+            {"base_currency_code": "EUR", "quote_currency_code": "JPY", "rates": ["0.92", "0.95", "0.98"]},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_api_v1_multi_pair_historical_exchange_rates_validation_errors(
+    async_client: AsyncClient,
+    with_test_exchange_rate_service: ExchangeRateServiceInterface,
+) -> None:
+    response = await async_client.get(
+        "/api/v1/exchange_rates/historical",
+        params={"pairs": "USD-EUR,USD,USD-XYZ,USD-EUR-JPY", "start_date": "2024-10-01", "end_date": "2024-09-01"},
+    )
+    assert response.status_code == 422
+    assert response.json() == {
+        "detail": "Invalid currency pair: USD; Invalid currency pair: USD-XYZ; Invalid currency pair: USD-EUR-JPY; "
+        "start_date must be before or equal to end_date"
+    }
+
+    quote_currency_codes = ["AUD", "CAD", "CHF", "CNY", "HKD", "INR", "JPY", "KRW", "SGD"]
+
+    # Repeated pairs count once
+    pairs = ",".join(f"USD-{quote}" for quote in quote_currency_codes * 3)
+    response = await async_client.get("/api/v1/exchange_rates/historical", params={"pairs": pairs})
+    assert response.status_code == 200
+    assert len(response.json()["series"]) == 9
+
+    pairs = ",".join(f"{base}-{quote}" for base in ["USD", "EUR", "GBP"] for quote in quote_currency_codes)
+    response = await async_client.get("/api/v1/exchange_rates/historical", params={"pairs": pairs})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "At most 25 currency pairs can be requested"}
@@ -0,0 +1,46 @@
+import pytest
+
+from app.api.exchange_rates.negotiation import (
+    CSV_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    negotiate_media_type,
+    parse_accept,
+)
+
+MEDIA_TYPES = (JSON_MEDIA_TYPE, CSV_MEDIA_TYPE, NDJSON_MEDIA_TYPE)
+
+
+def test_parse_accept() -> None:
+    assert parse_accept("Text/CSV;q=0.5, application/json;charset=utf-8, */*;q=2, text/*;q=x, ,") == {
+        "text/csv": 0.5,
+        "application/json": 1.0,
+        "*/*": 0.0,
+        "text/*": 0.0,
+    }
+    assert parse_accept(None) == {}
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (None, JSON_MEDIA_TYPE),
+        ("", JSON_MEDIA_TYPE),
+        ("*/*", JSON_MEDIA_TYPE),
+        ("text/csv", CSV_MEDIA_TYPE),
+        ("application/x-ndjson", NDJSON_MEDIA_TYPE),
+        ("application/json, text/csv;q=0", JSON_MEDIA_TYPE),
+        ("application/json;q=0.5, text/csv", CSV_MEDIA_TYPE),
+        ("text/csv;q=0.9, application/x-ndjson", NDJSON_MEDIA_TYPE),
+        # A named type beats one only matched by a wildcard at the same q-value
+        ("*/*, text/csv", CSV_MEDIA_TYPE),
+        ("text/*", CSV_MEDIA_TYPE),
+        ("*/*;q=0.1, application/json;q=0", CSV_MEDIA_TYPE),
+        # Nothing acceptable falls back to the default
+        ("image/png", JSON_MEDIA_TYPE),
+        ("text/csv;q=0", JSON_MEDIA_TYPE),
+        ("text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8", JSON_MEDIA_TYPE),
+    ],
+)
+def test_negotiate_media_type(accept: str | None, expected: str) -> None:
+    assert negotiate_media_type(accept, MEDIA_TYPES) == expected
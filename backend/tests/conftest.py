@@ -10,6 +10,10 @@ from app.core.database import TORTOISE_ORM
 from app.core.dependencies import get_exchange_rate_service, get_firebase_service
 from app.core.logger import setup_logging
 from app.main import app
+from app.repositories.currency_pair_catalog import currency_pair_catalog
+from app.repositories.data_version import data_version_cache
+from app.repositories.rate_matrix import rate_matrix
+from app.repositories.response_cache import historical_response_cache
 from app.services.exchange_rate_service import ExchangeRateServiceInterface
 from app.services.firebase_service import FirebaseService
 from tests.support.database_test_helper import DatabaseTestHelper, get_database_test_helper
@@ -43,6 +47,14 @@ async def test_database() -> AsyncGenerator[DatabaseTestHelper]:
     await Tortoise._drop_databases()
 
 
+@pytest.fixture(autouse=True)
+def reset_caches() -> None:
+    rate_matrix.reset()
+    currency_pair_catalog.reset()
+    data_version_cache.reset()
+    historical_response_cache.reset()
+
+
 @pytest.fixture
 async def test_exchange_rate_service() -> ExchangeRateServiceInterface:
     return MockExchangeRateService()
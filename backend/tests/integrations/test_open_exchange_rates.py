@@ -1,5 +1,6 @@
 import json
 import re
+from collections.abc import AsyncGenerator
 from datetime import date
 from importlib import resources
 
@@ -14,12 +15,15 @@ from app.integrations.open_exchange_rates import (
     OpenExchangeRatesClient,
     RequestError,
     RequestLimitError,
+    TimeSeriesResponse,
 )
+from app.integrations.retry_policy import RetryPolicy
 
 
 @pytest.fixture
-def api_client() -> OpenExchangeRatesClient:
-    return OpenExchangeRatesClient()
+async def api_client() -> AsyncGenerator[OpenExchangeRatesClient]:
+    async with OpenExchangeRatesClient(retry_policy=RetryPolicy(max_attempts=1)) as client:
+        yield client
 
 
 @pytest.mark.asyncio
@@ -155,3 +159,127 @@ class TestOpenExchangeRatesApi:
         with pytest.raises(httpx.HTTPStatusError):
             await api_client.get("some_path")
         assert len(httpx_mock.get_requests()) == 1
+
+    async def test_reuses_connection_pool(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            method="GET",
+            url="https://openexchangerates.org/api/some_path?app_id=FAKE_OER_APP_ID",
+            json={},
+            is_reusable=True,
+        )
+
+        async with OpenExchangeRatesClient(timeout=5.0, max_connections=2) as api_client:
+            http_client = api_client._get_http_client()
+            assert http_client.timeout == httpx.Timeout(5.0)
+
+            await api_client.get("some_path")
+            await api_client.get("some_path")
+
+            assert api_client._get_http_client() is http_client
+
+        assert http_client.is_closed
+        assert len(httpx_mock.get_requests()) == 2
+
+    async def test_reopens_connection_pool_after_close(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            method="GET",
+            url="https://openexchangerates.org/api/some_path?app_id=FAKE_OER_APP_ID",
+            json={"success": "yay!"},
+        )
+
+        api_client = OpenExchangeRatesClient()
+        async with api_client:
+            pass
+
+        assert await api_client.get("some_path") == {"success": "yay!"}
+        await api_client.aclose()
+
+    async def test_time_series_for(self, api_client: OpenExchangeRatesClient, httpx_mock: HTTPXMock) -> None:
+        api_client.time_series_max_days = 2
+        time_series = {
+            "disclaimer": "Usage subject to terms: https://openexchangerates.org/terms",
+            "license": "https://openexchangerates.org/license",
+            "base": "USD",
+        }
+        httpx_mock.add_response(
+            method="GET",
+            url="https://openexchangerates.org/api/time-series.json?app_id=FAKE_OER_APP_ID&start=2023-01-01&end=2023-01-02",
+            json=time_series
+            | {
+                "start_date": "2023-01-01",
+                "end_date": "2023-01-02",
+                "rates": {"2023-01-01": {"EUR": 0.93}, "2023-01-02": {"EUR": 0.94}},
+            },
+        )
+        httpx_mock.add_response(
+            method="GET",
+            url="https://openexchangerates.org/api/time-series.json?app_id=FAKE_OER_APP_ID&start=2023-01-03&end=2023-01-03",
+            json=time_series
+            | {"start_date": "2023-01-03", "end_date": "2023-01-03", "rates": {"2023-01-03": {"EUR": 0.95}}},
+        )
+
+        response = await api_client.time_series_for(date(2023, 1, 1), date(2023, 1, 3))
+
+        assert isinstance(response, TimeSeriesResponse)
+        assert response.start_date == date(2023, 1, 1)
+        assert response.end_date == date(2023, 1, 3)
+        assert response.rates == {
+            date(2023, 1, 1): {"EUR": 0.93},
+            date(2023, 1, 2): {"EUR": 0.94},
+            date(2023, 1, 3): {"EUR": 0.95},
+        }
+        assert len(httpx_mock.get_requests()) == 2
+
+    async def test_time_series_for_invalid_range(self, api_client: OpenExchangeRatesClient) -> None:
+        with pytest.raises(ValueError, match="start_date must be before or equal to end_date"):
+            await api_client.time_series_for(date(2023, 1, 2), date(2023, 1, 1))
+
+    async def test_get_retries_transient_errors(self, httpx_mock: HTTPXMock) -> None:
+        url = "https://openexchangerates.org/api/some_path?app_id=FAKE_OER_APP_ID"
+        httpx_mock.add_exception(httpx.ReadTimeout("Timed out"), method="GET", url=url)
+        httpx_mock.add_response(method="GET", url=url, status_code=503, headers={"Retry-After": "0"})
+        httpx_mock.add_response(
+            method="GET",
+            url=url,
+            json={"error": True, "status": 429, "message": "too_many_requests", "description": "Slow down"},
+            status_code=429,
+        )
+        httpx_mock.add_response(method="GET", url=url, json={"success": "yay!"})
+
+        async with OpenExchangeRatesClient(retry_policy=RetryPolicy(base_delay=0)) as api_client:
+            assert await api_client.get("some_path") == {"success": "yay!"}
+
+        assert len(httpx_mock.get_requests()) == 4
+        assert api_client.metrics.requests == 4
+        assert api_client.metrics.retries == 3
+
+    async def test_get_gives_up_after_max_attempts(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            method="GET",
+            url="https://openexchangerates.org/api/some_path?app_id=FAKE_OER_APP_ID",
+            status_code=500,
+            is_reusable=True,
+        )
+
+        async with OpenExchangeRatesClient(retry_policy=RetryPolicy(max_attempts=3, base_delay=0)) as api_client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await api_client.get("some_path")
+
+        assert len(httpx_mock.get_requests()) == 3
+        assert api_client.metrics.retries == 2
+
+    async def test_get_does_not_retry_past_long_retry_after(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            method="GET",
+            url="https://openexchangerates.org/api/some_path?app_id=FAKE_OER_APP_ID",
+            json={"error": True, "status": 429, "message": "too_many_requests", "description": "Quota exceeded"},
+            status_code=429,
+            headers={"Retry-After": "86400"},
+        )
+
+        async with OpenExchangeRatesClient(retry_policy=RetryPolicy(base_delay=0)) as api_client:
+            with pytest.raises(RequestLimitError, match="Quota exceeded") as excinfo:
+                await api_client.get("some_path")
+
+        assert excinfo.value.retry_after == 86400
+        assert len(httpx_mock.get_requests()) == 1
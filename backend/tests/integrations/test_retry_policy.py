@@ -0,0 +1,64 @@
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import pytest
+
+from app.integrations.retry_policy import RetryPolicy, TokenBucket, parse_retry_after
+
+
+class TestRetryPolicy:
+    def test_delay_for_backs_off_exponentially(self) -> None:
+        policy = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=5.0, jitter=0)
+
+        assert [policy.delay_for(attempt) for attempt in range(1, 6)] == [1.0, 2.0, 4.0, 5.0, None]
+
+    def test_delay_for_applies_jitter(self) -> None:
+        policy = RetryPolicy(base_delay=2.0, jitter=0.5)
+
+        for _ in range(20):
+            delay = policy.delay_for(1)
+            assert delay is not None
+            assert 1.0 <= delay <= 3.0
+
+    def test_delay_for_respects_retry_after(self) -> None:
+        policy = RetryPolicy(max_delay=60.0)
+
+        assert policy.delay_for(1, retry_after=30.0) == 30.0
+        assert policy.delay_for(1, retry_after=3600.0) is None
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("not a date") is None
+
+    retry_at = datetime.now(UTC) + timedelta(seconds=90)
+    delay = parse_retry_after(format_datetime(retry_at, usegmt=True))
+    assert delay is not None
+    assert 85 <= delay <= 90
+
+
+class TestTokenBucket:
+    @pytest.mark.asyncio
+    async def test_acquire_throttles_after_burst(self) -> None:
+        now = 0.0
+        sleeps: list[float] = []
+
+        def clock() -> float:
+            return now
+
+        async def sleep(delay: float) -> None:
+            nonlocal now
+            sleeps.append(delay)
+            now += delay
+
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=clock, sleep=sleep)
+
+        assert await bucket.acquire() == 0.0
+        assert await bucket.acquire() == 0.0
+        assert await bucket.acquire() == 0.5
+        assert sleeps == [0.5]
+
+    def test_requires_positive_rate(self) -> None:
+        with pytest.raises(ValueError, match="rate must be positive and capacity at least 1"):
+            TokenBucket(rate=0, capacity=1)
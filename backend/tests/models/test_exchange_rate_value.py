@@ -0,0 +1,23 @@
+from datetime import date
+from decimal import Decimal
+
+from app.models import Currency, ExchangeRateValue
+from tests.support.factories import build_exchange_rate
+
+
+def test_exchange_rate_value_round_trips_model() -> None:
+    exchange_rate = build_exchange_rate(as_of=date(2021, 1, 1), rate=Decimal("0.85"))
+
+    value = ExchangeRateValue.from_model(exchange_rate)
+    assert value == ExchangeRateValue(
+        base_currency_code=Currency("USD"),
+        quote_currency_code=Currency("EUR"),
+        as_of=date(2021, 1, 1),
+        rate=Decimal("0.85"),
+    )
+
+    model = value.to_model()
+    assert model.as_of == date(2021, 1, 1)
+    assert model.base_currency_code == Currency("USD")
+    assert model.quote_currency_code == Currency("EUR")
+    assert model.rate == Decimal("0.85")
@@ -0,0 +1,72 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.models import Currency, CurrencyPair, ExchangeRate
+from app.repositories.currency_pair_catalog import CurrencyPairCatalog
+from app.services.exchange_rate_service import CreateRateParams, ExchangeRateService
+from tests.support.database_test_helper import DatabaseTestHelper
+from tests.support.factories import build_exchange_rate_pair
+
+
+@pytest.fixture(autouse=True)
+async def exchange_rates(test_database: DatabaseTestHelper) -> None:
+    await ExchangeRate.bulk_create(
+        [
+            *build_exchange_rate_pair(
+                quote_currency_code=Currency("EUR"), as_of=date(2023, 1, 1), rate=Decimal("0.85")
+            ),
+            *build_exchange_rate_pair(
+                quote_currency_code=Currency("EUR"), as_of=date(2024, 3, 20), rate=Decimal("0.87")
+            ),
+            # Invalid currencies are skipped
+            *build_exchange_rate_pair(
+                base_currency_code=Currency("BTC"), quote_currency_code=Currency("USD"), as_of=date(2023, 1, 15)
+            ),
+        ]
+    )
+    await ExchangeRateService().rebuild_catalogs()
+
+
+@pytest.mark.asyncio
+async def test_get_pairs() -> None:
+    catalog = CurrencyPairCatalog(ttl_seconds=60)
+
+    assert await catalog.get_pairs() == [
+        CurrencyPair(base_currency_code=Currency("EUR"), quote_currency_code=Currency("USD")),
+        CurrencyPair(base_currency_code=Currency("USD"), quote_currency_code=Currency("EUR")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_date_range() -> None:
+    catalog = CurrencyPairCatalog(ttl_seconds=60)
+
+    assert await catalog.get_date_range("USD", "EUR") == (date(2023, 1, 1), date(2024, 3, 20))
+    assert await catalog.get_date_range("USD", "GBP") is None
+    # Unlike the pair list, invalid currencies are kept
+    assert await catalog.get_date_range("BTC", "USD") == (date(2023, 1, 15), date(2023, 1, 15))
+
+
+@pytest.mark.asyncio
+async def test_uses_snapshot_until_invalidated() -> None:
+    catalog = CurrencyPairCatalog(ttl_seconds=60)
+    usd_gbp = CurrencyPair(base_currency_code=Currency("USD"), quote_currency_code=Currency("GBP"))
+    assert usd_gbp not in await catalog.get_pairs()
+
+    await ExchangeRateService().bulk_create_rates(
+        [
+            CreateRateParams(
+                as_of=date(2024, 3, 21),
+                base_currency_code=Currency("USD"),
+                quote_currency_code=Currency("GBP"),
+                rate=Decimal("0.79"),
+                source="test",
+            )
+        ]
+    )
+    assert usd_gbp not in await catalog.get_pairs()
+
+    catalog.invalidate()
+    assert usd_gbp in await catalog.get_pairs()
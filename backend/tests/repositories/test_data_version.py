@@ -0,0 +1,85 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.models import Currency
+from app.repositories.data_version import EMPTY_DATA_VERSION, DataVersionCache
+from app.repositories.rate_matrix import rate_matrix
+from app.services.exchange_rate_service import CreateRateParams, ExchangeRateService
+from tests.support.database_test_helper import DatabaseTestHelper
+
+
+async def create_rate(as_of: date) -> None:
+    await ExchangeRateService().bulk_create_rates(
+        [
+            CreateRateParams(
+                as_of=as_of,
+                base_currency_code=Currency("USD"),
+                quote_currency_code=Currency("EUR"),
+                rate=Decimal("0.9"),
+                source="test",
+            )
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_returns_empty_version_before_any_write(test_database: DatabaseTestHelper) -> None:
+    assert await DataVersionCache(ttl_seconds=60).get() == EMPTY_DATA_VERSION
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_rates_bumps_version(test_database: DatabaseTestHelper) -> None:
+    cache = DataVersionCache(ttl_seconds=0)
+
+    await create_rate(date(2025, 1, 1))
+    first = await cache.get()
+    await create_rate(date(2025, 1, 2))
+    second = await cache.get()
+
+    assert first.version == 1
+    assert second.version == 2
+    assert second.updated_at >= first.updated_at
+
+
+@pytest.mark.asyncio
+async def test_rebuild_catalogs_bumps_version(test_database: DatabaseTestHelper) -> None:
+    cache = DataVersionCache(ttl_seconds=0)
+    await create_rate(date(2025, 1, 1))
+
+    await ExchangeRateService().rebuild_catalogs()
+
+    assert (await cache.get()).version == 2
+
+
+@pytest.mark.asyncio
+async def test_get_uses_snapshot_until_invalidated(test_database: DatabaseTestHelper) -> None:
+    cache = DataVersionCache(ttl_seconds=60)
+    await create_rate(date(2025, 1, 1))
+    assert (await cache.get()).version == 1
+
+    await create_rate(date(2025, 1, 2))
+    assert (await cache.get()).version == 1
+
+    cache.invalidate()
+    assert (await cache.get()).version == 2
+
+
+@pytest.mark.asyncio
+async def test_version_change_invalidates_rate_matrix(test_database: DatabaseTestHelper) -> None:
+    cache = DataVersionCache(ttl_seconds=0)
+    await create_rate(date(2025, 1, 1))
+    await cache.get()
+    await rate_matrix.ensure_loaded()
+
+    await cache.get()
+    assert not rate_matrix.is_stale
+
+    await create_rate(date(2025, 1, 2))
+    # The previous version is reported while the rate matrix still serves its rates
+    assert (await cache.get()).version == 1
+    assert rate_matrix.is_stale
+
+    await rate_matrix.reload()
+    assert (await cache.get()).version == 2
@@ -0,0 +1,265 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from app.models import Currency, ExchangeRate
+from app.repositories.rate_matrix import RateMatrix
+from app.services.exchange_rate_service import CreateRateParams, ExchangeRateService
+from tests.support.database_test_helper import DatabaseTestHelper
+from tests.support.factories import build_exchange_rate_pair
+
+
+@pytest.fixture(autouse=True)
+async def exchange_rates(test_database: DatabaseTestHelper) -> None:
+    await ExchangeRate.bulk_create(
+        [
+            *build_exchange_rate_pair(
+                quote_currency_code=Currency("EUR"), as_of=date(2023, 1, 1), rate=Decimal("0.85")
+            ),
+            *build_exchange_rate_pair(quote_currency_code=Currency("JPY"), as_of=date(2023, 1, 1), rate=Decimal("100")),
+            *build_exchange_rate_pair(
+                quote_currency_code=Currency("JPY"), as_of=date(2023, 1, 15), rate=Decimal("101")
+            ),
+            *build_exchange_rate_pair(
+                quote_currency_code=Currency("EUR"), as_of=date(2024, 3, 20), rate=Decimal("0.87")
+            ),
+        ]
+    )
+    await ExchangeRateService().rebuild_catalogs()
+
+
+@pytest.mark.asyncio
+async def test_get_latest_rate() -> None:
+    matrix = RateMatrix()
+
+    assert await matrix.get_latest_rate("USD", "EUR", date(2025, 1, 1)) == (date(2024, 3, 20), Decimal("0.87"))
+    assert await matrix.get_latest_rate("USD", "EUR", date(2023, 6, 1)) == (date(2023, 1, 1), Decimal("0.85"))
+    assert await matrix.get_latest_rate("JPY", "USD", date(2024, 1, 1)) == (date(2023, 1, 15), Decimal("0.00990099"))
+
+
+@pytest.mark.asyncio
+async def test_get_latest_rate_not_found() -> None:
+    matrix = RateMatrix()
+
+    assert await matrix.get_latest_rate("USD", "EUR", date(2022, 12, 31)) is None
+    assert await matrix.get_latest_rate("USD", "GBP", date(2025, 1, 1)) is None
+
+
+@pytest.mark.asyncio
+async def test_get_latest_rates() -> None:
+    matrix = RateMatrix()
+
+    assert await matrix.get_latest_rates("USD", None, date(2024, 1, 1)) == {
+        "EUR": (date(2023, 1, 1), Decimal("0.85")),
+        "JPY": (date(2023, 1, 15), Decimal("101")),
+    }
+    assert await matrix.get_latest_rates("USD", ["EUR", "GBP"], date(2025, 1, 1)) == {
+        "EUR": (date(2024, 3, 20), Decimal("0.87")),
+    }
+    assert await matrix.get_latest_rates("GBP", None, date(2025, 1, 1)) == {}
+
+
+@pytest.mark.asyncio
+async def test_get_latest_rate_derives_cross_rates_through_usd() -> None:
+    matrix = RateMatrix()
+
+    # EUR and JPY are both stored against USD only on 2023-01-01
+    assert await matrix.get_latest_rate("EUR", "JPY", date(2025, 1, 1)) == (date(2023, 1, 1), Decimal("117.64705882"))
+    assert await matrix.get_latest_rate("JPY", "EUR", date(2025, 1, 1)) == (date(2023, 1, 1), Decimal("0.0085"))
+    assert await matrix.get_latest_rate("EUR", "JPY", date(2022, 12, 31)) is None
+    assert await matrix.get_latest_rate("EUR", "GBP", date(2025, 1, 1)) is None
+    assert await matrix.get_latest_rates("EUR", None, date(2025, 1, 1)) == {
+        "JPY": (date(2023, 1, 1), Decimal("117.64705882")),
+        "USD": (date(2024, 3, 20), Decimal("1.14942529")),
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_series() -> None:
+    matrix = RateMatrix()
+
+    assert list(await matrix.get_series("USD", "JPY", date(2023, 1, 1), date(2025, 1, 1))) == [
+        (date(2023, 1, 1), Decimal("100")),
+        (date(2023, 1, 15), Decimal("101")),
+    ]
+    assert list(await matrix.get_series("USD", "EUR", date(2023, 1, 2), date(2025, 1, 1))) == [
+        (date(2024, 3, 20), Decimal("0.87")),
+    ]
+    assert len(await matrix.get_series("USD", "GBP", date(2023, 1, 1), date(2025, 1, 1))) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_series_derives_cross_rates_through_usd() -> None:
+    matrix = RateMatrix()
+
+    assert list(await matrix.get_series("EUR", "JPY", date(2023, 1, 1), date(2025, 1, 1))) == [
+        (date(2023, 1, 1), Decimal("117.64705882")),
+    ]
+    assert len(await matrix.get_series("EUR", "JPY", date(2023, 1, 2), date(2025, 1, 1))) == 0
+
+    # Without the inverse rows, the USD legs alone are enough
+    await ExchangeRate.filter(quote_currency_code="USD").delete()
+    matrix.invalidate()
+    await matrix.reload()
+    assert list(await matrix.get_series("EUR", "JPY", date(2023, 1, 1), date(2025, 1, 1))) == [
+        (date(2023, 1, 1), Decimal("117.64705882")),
+    ]
+    assert await matrix.count_rates("EUR", "JPY", date(2023, 1, 1), date(2025, 1, 1)) == 1
+
+
+@pytest.mark.asyncio
+async def test_cross_rates_use_the_inverse_of_small_usd_legs() -> None:
+    # USD -> BTC is stored as 0.00001667, but BTC -> USD keeps every digit as 59999.16001176
+    await ExchangeRate.bulk_create(
+        build_exchange_rate_pair(
+            quote_currency_code=Currency("BTC"), as_of=date(2024, 3, 20), rate=Decimal("0.0000166669")
+        )
+    )
+    matrix = RateMatrix()
+
+    # 59999.16001176 x 0.87, where 0.87 / 0.00001667 would give 52189.56208758
+    expected = (date(2024, 3, 20), Decimal("52199.26921023"))
+    assert await matrix.get_latest_rate("BTC", "EUR", date(2025, 1, 1)) == expected
+    assert list(await matrix.get_series("BTC", "EUR", date(2024, 1, 1), date(2025, 1, 1))) == [expected]
+    assert await matrix.get_latest_rate("EUR", "BTC", date(2025, 1, 1)) == (date(2024, 3, 20), Decimal("0.00001916"))
+
+
+@pytest.mark.asyncio
+async def test_count_rates() -> None:
+    matrix = RateMatrix()
+
+    assert await matrix.count_rates("USD", "JPY", date(2023, 1, 1), date(2023, 12, 31)) == 2
+    assert await matrix.count_rates("JPY", "USD", date(2023, 1, 2), date(2023, 1, 15)) == 1
+    assert await matrix.count_rates("USD", "EUR", date(2023, 1, 1), date(2025, 1, 1)) == 2
+    assert await matrix.count_rates("USD", "EUR", date(2023, 1, 2), date(2024, 3, 19)) == 0
+    assert await matrix.count_rates("USD", "GBP", date(2023, 1, 1), date(2025, 1, 1)) == 0
+
+
+@pytest.mark.asyncio
+async def test_load_skips_dates_committed_after_the_date_list_was_read() -> None:
+    # Rates whose dates are not in available_dates yet, as if a refresh committed them mid-load
+    await ExchangeRate.bulk_create(
+        [
+            *build_exchange_rate_pair(quote_currency_code=Currency("EUR"), as_of=date(2023, 6, 1), rate=Decimal("0.9")),
+            *build_exchange_rate_pair(
+                quote_currency_code=Currency("EUR"), as_of=date(2024, 3, 21), rate=Decimal("0.88")
+            ),
+        ]
+    )
+    matrix = RateMatrix()
+
+    assert await matrix.get_latest_rate("USD", "EUR", date(2025, 1, 1)) == (date(2024, 3, 20), Decimal("0.87"))
+    assert await matrix.count_rates("USD", "EUR", date(2023, 1, 1), date(2025, 1, 1)) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_latest_rate_uses_snapshot_until_reloaded() -> None:
+    matrix = RateMatrix()
+    assert await matrix.get_latest_rate("USD", "GBP", date(2025, 1, 1)) is None
+
+    await ExchangeRate.bulk_create(
+        build_exchange_rate_pair(quote_currency_code=Currency("GBP"), as_of=date(2024, 3, 20), rate=Decimal("0.79"))
+    )
+    assert await matrix.get_latest_rate("USD", "GBP", date(2025, 1, 1)) is None
+
+    # The snapshot keeps being served while it reloads in the background
+    matrix.invalidate()
+    assert await matrix.get_latest_rate("USD", "GBP", date(2025, 1, 1)) is None
+
+    await matrix.reload()
+    assert await matrix.get_latest_rate("USD", "GBP", date(2025, 1, 1)) == (date(2024, 3, 20), Decimal("0.79"))
+
+
+@pytest.mark.asyncio
+async def test_update_appends_new_dates() -> None:
+    matrix = RateMatrix()
+    await matrix.ensure_loaded()
+    series = matrix.series[matrix.pair_ordinals[("USD", "EUR")]]
+
+    await ExchangeRateService().bulk_create_rates(
+        [
+            CreateRateParams(
+                as_of=date(2024, 3, 21),
+                base_currency_code=Currency("USD"),
+                quote_currency_code=quote_currency_code,
+                rate=rate,
+                source="test",
+            )
+            for quote_currency_code, rate in [(Currency("EUR"), Decimal("0.88")), (Currency("GBP"), Decimal("0.79"))]
+        ]
+    )
+    matrix.invalidate()
+
+    with patch.object(matrix, "_load", wraps=matrix._load) as mock_load:
+        await matrix.reload()
+        assert await matrix.get_latest_rate("USD", "EUR", date(2025, 1, 1)) == (date(2024, 3, 21), Decimal("0.88"))
+    mock_load.assert_called_once_with(append=True)
+
+    assert await matrix.get_latest_rate("USD", "GBP", date(2025, 1, 1)) == (date(2024, 3, 21), Decimal("0.79"))
+    assert await matrix.count_rates("USD", "EUR", date(2023, 1, 1), date(2025, 1, 1)) == 3
+    assert await matrix.count_rates("USD", "JPY", date(2023, 1, 1), date(2025, 1, 1)) == 2
+    assert await matrix.get_latest_rate("EUR", "GBP", date(2025, 1, 1)) == (date(2024, 3, 21), Decimal("0.89772727"))
+    # The snapshot served before the update is left untouched
+    assert len(series) == 2
+
+
+@pytest.mark.asyncio
+async def test_update_reloads_when_loaded_dates_change() -> None:
+    matrix = RateMatrix()
+    await matrix.ensure_loaded()
+    service = ExchangeRateService()
+
+    # Backfilled date before the snapshot's last date
+    await service.create_rate(date(2023, 6, 1), Currency("USD"), Currency("EUR"), Decimal("0.9"), "test")
+    matrix.invalidate()
+    with patch.object(matrix, "_load", wraps=matrix._load) as mock_load:
+        await matrix.reload()
+        assert await matrix.count_rates("USD", "EUR", date(2023, 1, 1), date(2025, 1, 1)) == 3
+    mock_load.assert_called_once_with(append=False)
+
+    # Rewritten rate, without any new date
+    await service.bulk_create_rates(
+        [
+            CreateRateParams(
+                as_of=date(2023, 6, 1),
+                base_currency_code=Currency("USD"),
+                quote_currency_code=Currency("EUR"),
+                rate=Decimal("0.91"),
+                source="test",
+            )
+        ]
+    )
+    matrix.invalidate()
+    await matrix.reload()
+    assert await matrix.get_latest_rate("USD", "EUR", date(2023, 12, 31)) == (date(2023, 6, 1), Decimal("0.91"))
+
+    # Dates re-inserted, e.g. by a reseed
+    await ExchangeRate.filter(as_of=date(2023, 6, 1)).update(rate=Decimal("0.92"))
+    await service.rebuild_catalogs()
+    await service.create_rate(date(2024, 3, 21), Currency("USD"), Currency("EUR"), Decimal("0.88"), "test")
+    matrix.invalidate()
+    with patch.object(matrix, "_load", wraps=matrix._load) as mock_load:
+        await matrix.reload()
+        assert await matrix.get_latest_rate("USD", "EUR", date(2023, 12, 31)) == (date(2023, 6, 1), Decimal("0.92"))
+    mock_load.assert_called_once_with(append=False)
+
+    # Rewritten rate in the same batch as a new date
+    await service.bulk_create_rates(
+        [
+            CreateRateParams(
+                as_of=as_of,
+                base_currency_code=Currency("USD"),
+                quote_currency_code=Currency("EUR"),
+                rate=rate,
+                source="test",
+            )
+            for as_of, rate in ((date(2023, 6, 1), Decimal("0.8")), (date(2024, 3, 22), Decimal("0.87")))
+        ]
+    )
+    matrix.invalidate()
+    with patch.object(matrix, "_load", wraps=matrix._load) as mock_load:
+        await matrix.reload()
+        assert await matrix.get_latest_rate("USD", "EUR", date(2023, 12, 31)) == (date(2023, 6, 1), Decimal("0.8"))
+    mock_load.assert_called_once_with(append=False)
@@ -0,0 +1,150 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.repositories.rate_series import RateAggregate, RateSeries, aggregate_series, align_series
+from app.utils import to_fixed_point
+
+SERIES = RateSeries.from_rates(
+    [
+        (date(2024, 1, 1), Decimal("1.1")),
+        (date(2024, 1, 2), Decimal("1.2")),
+        (date(2024, 1, 5), Decimal("1.5")),
+    ]
+)
+
+
+def test_rate_series_round_trips_rates() -> None:
+    assert len(SERIES) == 3
+    assert list(SERIES) == [
+        (date(2024, 1, 1), Decimal("1.1")),
+        (date(2024, 1, 2), Decimal("1.2")),
+        (date(2024, 1, 5), Decimal("1.5")),
+    ]
+
+
+def test_rate_series_slicing() -> None:
+    assert [as_of for as_of, _rate in SERIES.between(date(2024, 1, 2), date(2024, 1, 4))] == [date(2024, 1, 2)]
+    assert [as_of for as_of, _rate in SERIES.after(date(2024, 1, 1))] == [date(2024, 1, 2), date(2024, 1, 5)]
+    assert [as_of for as_of, _rate in SERIES.before(date(2024, 1, 2))] == [date(2024, 1, 1)]
+    assert [as_of for as_of, _rate in SERIES[::-1][:2]] == [date(2024, 1, 5), date(2024, 1, 2)]
+
+
+def test_rate_series_last_on_or_before() -> None:
+    assert SERIES.last_on_or_before(date(2024, 1, 4).toordinal()) == (date(2024, 1, 2), Decimal("1.2"))
+    assert SERIES.last_on_or_before(date(2023, 12, 31).toordinal()) is None
+
+
+def test_rate_series_resample_to_periods() -> None:
+    series = RateSeries.from_rates(
+        [
+            (date(2024, 1, 29), Decimal("1.1")),  # Monday
+            (date(2024, 1, 31), Decimal("1.2")),
+            (date(2024, 2, 4), Decimal("1.3")),  # Sunday
+            (date(2024, 2, 5), Decimal("1.4")),
+            (date(2024, 3, 1), Decimal("1.5")),
+        ]
+    )
+
+    assert list(series.resample("weekly")) == [
+        (date(2024, 2, 4), Decimal("1.3")),
+        (date(2024, 2, 5), Decimal("1.4")),
+        (date(2024, 3, 1), Decimal("1.5")),
+    ]
+    assert list(series.resample("monthly")) == [
+        (date(2024, 1, 31), Decimal("1.2")),
+        (date(2024, 2, 5), Decimal("1.4")),
+        (date(2024, 3, 1), Decimal("1.5")),
+    ]
+    assert series.resample("daily") is series
+    assert len(RateSeries().resample("monthly")) == 0
+
+
+def test_rate_series_resample_lttb() -> None:
+    start_date = date(2024, 1, 1)
+    # Flat series with a single spike, which LTTB must keep
+    series = RateSeries.from_rates(
+        (start_date + timedelta(days=day), Decimal("5") if day == 37 else Decimal("1")) for day in range(100)
+    )
+
+    resampled = series.resample("lttb", points=10)
+
+    assert len(resampled) == 10
+    assert resampled.date_ordinals[0] == series.date_ordinals[0]
+    assert resampled.date_ordinals[-1] == series.date_ordinals[-1]
+    assert (start_date + timedelta(days=37), Decimal("5")) in list(resampled)
+    assert list(resampled.date_ordinals) == sorted(resampled.date_ordinals)
+    assert series.resample("lttb", points=100) == series
+
+
+def test_aggregate_series() -> None:
+    series = RateSeries.from_rates(
+        [
+            (date(2024, 1, 29), Decimal("1.1")),  # Monday
+            (date(2024, 1, 31), Decimal("1.3")),
+            (date(2024, 2, 4), Decimal("1.2")),  # Sunday
+            (date(2024, 2, 5), Decimal("1.5")),
+            (date(2024, 2, 13), Decimal("1.35")),
+        ]
+    )
+
+    assert aggregate_series(series, "weekly", window=2) == [
+        RateAggregate(
+            start_ordinal=date(2024, 1, 29).toordinal(),
+            end_ordinal=date(2024, 2, 4).toordinal(),
+            open=to_fixed_point(Decimal("1.1")),
+            high=to_fixed_point(Decimal("1.3")),
+            low=to_fixed_point(Decimal("1.1")),
+            close=to_fixed_point(Decimal("1.2")),
+            change_percent=None,
+            rolling_mean=None,
+            rolling_stdev=None,
+        ),
+        RateAggregate(
+            start_ordinal=date(2024, 2, 5).toordinal(),
+            end_ordinal=date(2024, 2, 5).toordinal(),
+            open=to_fixed_point(Decimal("1.5")),
+            high=to_fixed_point(Decimal("1.5")),
+            low=to_fixed_point(Decimal("1.5")),
+            close=to_fixed_point(Decimal("1.5")),
+            change_percent=to_fixed_point(Decimal("25")),
+            rolling_mean=to_fixed_point(Decimal("1.35")),
+            rolling_stdev=to_fixed_point(Decimal("0.21213203")),
+        ),
+        RateAggregate(
+            start_ordinal=date(2024, 2, 13).toordinal(),
+            end_ordinal=date(2024, 2, 13).toordinal(),
+            open=to_fixed_point(Decimal("1.35")),
+            high=to_fixed_point(Decimal("1.35")),
+            low=to_fixed_point(Decimal("1.35")),
+            close=to_fixed_point(Decimal("1.35")),
+            change_percent=to_fixed_point(Decimal("-10")),
+            rolling_mean=to_fixed_point(Decimal("1.425")),
+            rolling_stdev=to_fixed_point(Decimal("0.10606601")),
+        ),
+    ]
+
+    assert [aggregate.close for aggregate in aggregate_series(series, "daily", window=2)] == list(series.rates)
+    assert aggregate_series(RateSeries(), "monthly", window=2) == []
+
+    with pytest.raises(ValueError):
+        aggregate_series(series, "monthly", window=1)
+
+
+def test_align_series() -> None:
+    other = RateSeries.from_rates([(date(2024, 1, 2), Decimal("2.2")), (date(2024, 1, 3), Decimal("2.3"))])
+
+    date_ordinals, aligned_rates = align_series([SERIES, other, RateSeries()], descending=True)
+
+    assert [date.fromordinal(ordinal) for ordinal in date_ordinals] == [
+        date(2024, 1, 5),
+        date(2024, 1, 3),
+        date(2024, 1, 2),
+        date(2024, 1, 1),
+    ]
+    assert aligned_rates == [
+        [150_000_000, None, 120_000_000, 110_000_000],
+        [None, 230_000_000, 220_000_000, None],
+        [None, None, None, None],
+    ]
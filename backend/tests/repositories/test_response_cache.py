@@ -0,0 +1,44 @@
+from app.repositories.response_cache import ResponseCache, ResponseCacheStats
+
+
+def test_get_counts_hits_and_misses() -> None:
+    cache = ResponseCache(max_bytes=100)
+
+    assert cache.get("a") is None
+    cache.put("a", b"12345")
+    assert cache.get("a") == b"12345"
+
+    assert cache.stats() == ResponseCacheStats(hits=1, misses=1, evictions=0, entries=1, size_bytes=5)
+
+
+def test_put_evicts_least_recently_used_entries() -> None:
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"
+
+    cache.put("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.get("c") == b"1234"
+    assert cache.stats().evictions == 1
+    assert cache.stats().size_bytes == 8
+
+
+def test_put_replaces_existing_entry() -> None:
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("a", b"123456")
+
+    assert cache.get("a") == b"123456"
+    assert cache.stats().size_bytes == 6
+
+
+def test_put_skips_entries_larger_than_the_cache() -> None:
+    cache = ResponseCache(max_bytes=4)
+    cache.put("a", b"12")
+    cache.put("b", b"12345")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"12"
@@ -0,0 +1,93 @@
+import asyncio
+from typing import cast
+from unittest.mock import patch
+
+import pytest
+from redis.asyncio import Redis
+
+from app.repositories.shared_response_cache import SharedResponseCache
+from tests.support.fake_redis import FakeRedis
+
+
+@pytest.fixture
+def redis_client() -> FakeRedis:
+    return FakeRedis()
+
+
+@pytest.fixture
+def shared_cache(redis_client: FakeRedis) -> SharedResponseCache:
+    return SharedResponseCache(client_factory=lambda: cast(Redis, redis_client), ttl_seconds=60)
+
+
+@pytest.mark.asyncio
+async def test_put_and_get(shared_cache: SharedResponseCache, redis_client: FakeRedis) -> None:
+    key = ("USD", "EUR", 1)
+    assert await shared_cache.get(key) is None
+
+    await shared_cache.put(key, b'{"data":[]}')
+
+    assert await shared_cache.get(key) == b'{"data":[]}'
+    assert redis_client.expirations == {"exchange_house:responses:USD:EUR:1": 60}
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_are_cache_misses(shared_cache: SharedResponseCache, redis_client: FakeRedis) -> None:
+    redis_client.available = False
+
+    await shared_cache.put(("USD", "EUR", 1), b"{}")
+    await shared_cache.publish_invalidation()
+
+    assert await shared_cache.get(("USD", "EUR", 1)) is None
+
+
+@pytest.mark.asyncio
+async def test_unexpected_errors_are_cache_misses(shared_cache: SharedResponseCache) -> None:
+    with patch.object(FakeRedis, "get", side_effect=RuntimeError("Event loop is closed")):
+        assert await shared_cache.get(("USD", "EUR", 1)) is None
+
+    with patch.object(FakeRedis, "publish", side_effect=RuntimeError("Event loop is closed")):
+        await shared_cache.publish_invalidation()
+
+
+def test_creates_a_client_per_event_loop() -> None:
+    clients: list[FakeRedis] = []
+
+    def client_factory() -> Redis:
+        clients.append(FakeRedis())
+        return cast(Redis, clients[-1])
+
+    shared_cache = SharedResponseCache(client_factory=client_factory, ttl_seconds=60)
+
+    async def publish_twice() -> None:
+        await shared_cache.publish_invalidation()
+        await shared_cache.publish_invalidation()
+
+    # Like consecutive Celery task runs, each in its own asyncio.run
+    asyncio.run(publish_twice())
+    asyncio.run(publish_twice())
+
+    assert len(clients) == 2
+
+
+@pytest.mark.asyncio
+async def test_close(shared_cache: SharedResponseCache, redis_client: FakeRedis) -> None:
+    await shared_cache.put(("USD", "EUR", 1), b"{}")
+
+    await shared_cache.close()
+    await shared_cache.close()
+
+    assert redis_client.closed
+
+
+@pytest.mark.asyncio
+async def test_listen_calls_back_on_invalidation(shared_cache: SharedResponseCache) -> None:
+    invalidated = asyncio.Event()
+    listener = asyncio.create_task(shared_cache.listen(invalidated.set))
+    await asyncio.sleep(0)
+
+    await shared_cache.publish_invalidation()
+    await asyncio.wait_for(invalidated.wait(), timeout=1)
+
+    listener.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listener
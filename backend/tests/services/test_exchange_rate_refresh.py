@@ -1,15 +1,21 @@
+import asyncio
 import json
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 from importlib import resources
+from typing import Any
+from unittest.mock import patch
 
 import pytest
 from pytest_httpx import HTTPXMock
 
-from app.models import Currency
+from app.integrations.open_exchange_rates import HistoricalRatesResponse, OpenExchangeRatesClient, RequestLimitError
+from app.integrations.retry_policy import RetryPolicy
+from app.models import Currency, RefreshStatus
 from app.models.exchange_rate import ExchangeRate
 from app.services.exchange_rate_refresh import ExchangeRateRefresh
-from app.services.exchange_rate_service import ExchangeRateService
+from app.services.exchange_rate_service import CreateRateParams, ExchangeRateService
+from app.services.refresh_ledger_service import RefreshLedgerService
 from tests.support.database_test_helper import DatabaseTestHelper
 
 
@@ -90,3 +96,296 @@ async def test_exchange_rate_refresh_handles_api_error(
     # Verify no records were created
     record_count = await test_database.count_records(ExchangeRate)
     assert record_count == 0
+
+
+@pytest.mark.asyncio
+async def test_exchange_rate_refresh_fetches_concurrently(
+    httpx_mock: HTTPXMock, test_database: DatabaseTestHelper
+) -> None:
+    start_date = date(2025, 1, 27)
+    end_date = date(2025, 2, 1)
+
+    fixture_data = json.loads(
+        resources.files("tests.support.open_exchange_rates").joinpath("historical.json").read_text()
+    )
+    for day in range(27, 33):
+        target_date = date(2025, 1, 1) + timedelta(days=day - 1)
+        httpx_mock.add_response(
+            method="GET",
+            url=f"https://openexchangerates.org/api/historical/{target_date}.json?app_id=FAKE_OER_APP_ID",
+            json=fixture_data,
+            status_code=200,
+        )
+
+    progress: list[tuple[int, int]] = []
+    subject = ExchangeRateRefresh(
+        start_date=start_date,
+        end_date=end_date,
+        exchange_rate_service=ExchangeRateService(),
+        max_concurrency=3,
+        progress_callback=lambda saved, total: progress.append((saved, total)),
+    )
+    subject.WRITE_BATCH_SIZE = 4
+
+    assert await subject.save()
+
+    assert progress == [(4, 6), (6, 6)]
+    assert len(httpx_mock.get_requests()) == 6
+    assert await test_database.count_records(ExchangeRate) == 168 * 2 * 6
+
+
+@pytest.mark.asyncio
+async def test_exchange_rate_refresh_saves_fetched_rates_before_raising(
+    httpx_mock: HTTPXMock, test_database: DatabaseTestHelper
+) -> None:
+    start_date = date(2025, 1, 30)
+    end_date = date(2025, 2, 1)
+
+    fixture_data = json.loads(
+        resources.files("tests.support.open_exchange_rates").joinpath("historical.json").read_text()
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url="https://openexchangerates.org/api/historical/2025-01-30.json?app_id=FAKE_OER_APP_ID",
+        json=fixture_data,
+        status_code=200,
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url="https://openexchangerates.org/api/historical/2025-01-31.json?app_id=FAKE_OER_APP_ID",
+        json={"error": True, "status": 429, "message": "too_many_requests", "description": "Limit reached"},
+        status_code=429,
+    )
+
+    subject = ExchangeRateRefresh(
+        start_date=start_date,
+        end_date=end_date,
+        exchange_rate_service=ExchangeRateService(),
+        max_concurrency=1,
+        api_client=OpenExchangeRatesClient(retry_policy=RetryPolicy(max_attempts=1)),
+    )
+
+    with pytest.raises(RequestLimitError, match="Limit reached"):
+        await subject.save()
+
+    # 2025-02-01 is never requested once the limit is hit, but 2025-01-30 is kept
+    assert len(httpx_mock.get_requests()) == 2
+    assert await ExchangeRate.filter(as_of=date(2025, 1, 30)).count() == 168 * 2
+    assert await test_database.count_records(ExchangeRate) == 168 * 2
+
+    ledger_entries = await RefreshLedgerService().get_entries(start_date, end_date)
+    assert [(entry.as_of, entry.status, entry.attempts) for entry in ledger_entries] == [
+        (date(2025, 1, 30), RefreshStatus.SAVED, 1),
+        (date(2025, 1, 31), RefreshStatus.FAILED, 1),
+    ]
+    assert ledger_entries[1].error == "Limit reached"
+
+
+@pytest.mark.asyncio
+async def test_exchange_rate_refresh_resumes_from_ledger(
+    httpx_mock: HTTPXMock, test_database: DatabaseTestHelper
+) -> None:
+    start_date = date(2025, 1, 29)
+    end_date = date(2025, 2, 1)
+    refresh_ledger = RefreshLedgerService()
+
+    # 2025-01-29 was saved by an earlier run; 2025-01-30 was interrupted mid-fetch; 2025-01-31 failed
+    await refresh_ledger.mark_saved([date(2025, 1, 29)])
+    await refresh_ledger.mark_pending([date(2025, 1, 30), date(2025, 1, 31)])
+    await refresh_ledger.mark_failed([date(2025, 1, 31)], "Limit reached")
+    # 2025-02-01 has rates stored but is not in the ledger yet
+    await ExchangeRateService().bulk_create_rates(
+        [
+            CreateRateParams(
+                as_of=date(2025, 2, 1),
+                base_currency_code=Currency("USD"),
+                quote_currency_code=Currency("EUR"),
+                rate=Decimal("0.9"),
+                source="test",
+            )
+        ]
+    )
+
+    fixture_data = json.loads(
+        resources.files("tests.support.open_exchange_rates").joinpath("historical.json").read_text()
+    )
+    for target_date in ("2025-01-30", "2025-01-31"):
+        httpx_mock.add_response(
+            method="GET",
+            url=f"https://openexchangerates.org/api/historical/{target_date}.json?app_id=FAKE_OER_APP_ID",
+            json=fixture_data,
+        )
+
+    subject = ExchangeRateRefresh(
+        start_date=start_date,
+        end_date=end_date,
+        exchange_rate_service=ExchangeRateService(),
+        refresh_ledger=refresh_ledger,
+    )
+
+    assert await subject.save()
+
+    assert len(httpx_mock.get_requests()) == 2
+    ledger_entries = await refresh_ledger.get_entries(start_date, end_date)
+    assert [(entry.as_of, entry.status, entry.attempts) for entry in ledger_entries] == [
+        (date(2025, 1, 29), RefreshStatus.SAVED, 0),
+        (date(2025, 1, 30), RefreshStatus.SAVED, 2),
+        (date(2025, 1, 31), RefreshStatus.SAVED, 2),
+        (date(2025, 2, 1), RefreshStatus.SAVED, 0),
+    ]
+    assert all(entry.error is None for entry in ledger_entries)
+
+
+def test_exchange_rate_refresh_requires_positive_concurrency() -> None:
+    with pytest.raises(ValueError, match="max_concurrency must be at least 1"):
+        ExchangeRateRefresh(exchange_rate_service=ExchangeRateService(), max_concurrency=0)
+
+
+def build_time_series_response(start_date: date, end_date: date) -> dict[str, Any]:
+    fixture_data = json.loads(
+        resources.files("tests.support.open_exchange_rates").joinpath("historical.json").read_text()
+    )
+    days = (end_date - start_date).days + 1
+    return {
+        "disclaimer": fixture_data["disclaimer"],
+        "license": fixture_data["license"],
+        "start_date": str(start_date),
+        "end_date": str(end_date),
+        "base": "USD",
+        "rates": {str(start_date + timedelta(days=day)): fixture_data["rates"] for day in range(days)},
+    }
+
+
+@pytest.mark.asyncio
+async def test_exchange_rate_refresh_uses_time_series_for_contiguous_dates(
+    httpx_mock: HTTPXMock, test_database: DatabaseTestHelper
+) -> None:
+    start_date = date(2025, 1, 1)
+    end_date = date(2025, 1, 10)
+
+    httpx_mock.add_response(
+        method="GET",
+        url="https://openexchangerates.org/api/time-series.json?app_id=FAKE_OER_APP_ID&start=2025-01-01&end=2025-01-06",
+        json=build_time_series_response(date(2025, 1, 1), date(2025, 1, 6)),
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url="https://openexchangerates.org/api/time-series.json?app_id=FAKE_OER_APP_ID&start=2025-01-07&end=2025-01-10",
+        json=build_time_series_response(date(2025, 1, 7), date(2025, 1, 10)),
+    )
+
+    subject = ExchangeRateRefresh(
+        start_date=start_date,
+        end_date=end_date,
+        exchange_rate_service=ExchangeRateService(),
+        time_series_min_days=3,
+    )
+    subject.api_client.time_series_max_days = 6
+
+    assert await subject.save()
+
+    assert len(httpx_mock.get_requests()) == 2
+    assert await test_database.count_records(ExchangeRate) == 168 * 2 * 10
+
+
+@pytest.mark.asyncio
+async def test_exchange_rate_refresh_falls_back_to_daily_requests(
+    httpx_mock: HTTPXMock, test_database: DatabaseTestHelper
+) -> None:
+    start_date = date(2025, 1, 1)
+    end_date = date(2025, 1, 3)
+
+    httpx_mock.add_response(
+        method="GET",
+        url="https://openexchangerates.org/api/time-series.json?app_id=FAKE_OER_APP_ID&start=2025-01-01&end=2025-01-03",
+        json={"error": True, "status": 403, "message": "not_allowed", "description": "Not available on your plan"},
+        status_code=403,
+    )
+    fixture_data = json.loads(
+        resources.files("tests.support.open_exchange_rates").joinpath("historical.json").read_text()
+    )
+    for day in range(1, 4):
+        httpx_mock.add_response(
+            method="GET",
+            url=f"https://openexchangerates.org/api/historical/2025-01-0{day}.json?app_id=FAKE_OER_APP_ID",
+            json=fixture_data,
+        )
+
+    subject = ExchangeRateRefresh(
+        start_date=start_date,
+        end_date=end_date,
+        exchange_rate_service=ExchangeRateService(),
+        time_series_min_days=3,
+    )
+    # Each daily request waits for the others, so they only complete if all three run at once
+    in_flight = 0
+    all_in_flight = asyncio.Event()
+    historical_rates_for = subject.api_client.historical_rates_for
+
+    async def wait_for_all_in_flight(target_date: date) -> HistoricalRatesResponse:
+        nonlocal in_flight
+        in_flight += 1
+        if in_flight == 3:
+            all_in_flight.set()
+        await asyncio.wait_for(all_in_flight.wait(), timeout=5)
+        return await historical_rates_for(target_date)
+
+    with patch.object(subject.api_client, "historical_rates_for", wait_for_all_in_flight):
+        assert await subject.save()
+
+    assert len(httpx_mock.get_requests()) == 4
+    assert await test_database.count_records(ExchangeRate) == 168 * 2 * 3
+
+
+@pytest.mark.asyncio
+async def test_exchange_rate_refresh_daily_fallback_fails_only_failing_dates(
+    httpx_mock: HTTPXMock, test_database: DatabaseTestHelper
+) -> None:
+    start_date = date(2025, 1, 1)
+    end_date = date(2025, 1, 6)
+
+    httpx_mock.add_response(
+        method="GET",
+        url="https://openexchangerates.org/api/time-series.json?app_id=FAKE_OER_APP_ID&start=2025-01-01&end=2025-01-03",
+        json={"error": True, "status": 403, "message": "not_allowed", "description": "Not available on your plan"},
+        status_code=403,
+    )
+    fixture_data = json.loads(
+        resources.files("tests.support.open_exchange_rates").joinpath("historical.json").read_text()
+    )
+    for day in range(1, 5):
+        httpx_mock.add_response(
+            method="GET",
+            url=f"https://openexchangerates.org/api/historical/2025-01-0{day}.json?app_id=FAKE_OER_APP_ID",
+            json=fixture_data,
+        )
+    httpx_mock.add_response(
+        method="GET",
+        url="https://openexchangerates.org/api/historical/2025-01-05.json?app_id=FAKE_OER_APP_ID",
+        json={"error": True, "status": 429, "message": "too_many_requests", "description": "Limit reached"},
+        status_code=429,
+    )
+
+    subject = ExchangeRateRefresh(
+        start_date=start_date,
+        end_date=end_date,
+        exchange_rate_service=ExchangeRateService(),
+        max_concurrency=1,
+        time_series_min_days=3,
+        api_client=OpenExchangeRatesClient(retry_policy=RetryPolicy(max_attempts=1)),
+    )
+    subject.api_client.time_series_max_days = 3
+
+    with pytest.raises(RequestLimitError, match="Limit reached"):
+        await subject.save()
+
+    # The second time-series window is fetched day by day too, keeping 2025-01-04 when 2025-01-05 fails
+    assert await test_database.count_records(ExchangeRate) == 168 * 2 * 4
+    ledger_entries = await RefreshLedgerService().get_entries(start_date, end_date)
+    assert [(entry.as_of, entry.status) for entry in ledger_entries] == [
+        (date(2025, 1, 1), RefreshStatus.SAVED),
+        (date(2025, 1, 2), RefreshStatus.SAVED),
+        (date(2025, 1, 3), RefreshStatus.SAVED),
+        (date(2025, 1, 4), RefreshStatus.SAVED),
+        (date(2025, 1, 5), RefreshStatus.FAILED),
+    ]
@@ -1,14 +1,20 @@
 from datetime import date
 from decimal import Decimal
 from typing import Literal
+from unittest.mock import patch
 
 import pytest
+from tortoise import Tortoise
 
 from app.models import Currency
 from app.models.currency_pair import CurrencyPair
+from app.models.currency_pair_catalog_entry import CurrencyPairCatalogEntry
 from app.models.exchange_rate import ExchangeRate
-from app.services.exchange_rate_service import ExchangeRateService
-from app.utils import quantize_decimal
+from app.models.exchange_rate_change import ExchangeRateChange
+from app.models.exchange_rate_date import ExchangeRateDate
+from app.repositories.currency_pair_catalog import currency_pair_catalog
+from app.services.exchange_rate_service import CreateRateParams, ExchangeRateService
+from app.utils import quantize_decimal, to_fixed_point
 from tests.support.database_test_helper import DatabaseTestHelper
 from tests.support.factories import build_exchange_rate_pair
 
@@ -55,6 +61,7 @@ async def exchange_rates(test_database: DatabaseTestHelper) -> list[ExchangeRate
         ),
     ]
     await ExchangeRate.bulk_create(exchange_rates)
+    await ExchangeRateService().rebuild_catalogs()
 
     return exchange_rates
 
@@ -70,6 +77,14 @@ async def test_get_available_dates() -> None:
     assert results[2] == date(2023, 1, 20)
 
 
+@pytest.mark.asyncio
+async def test_get_available_dates_in_range() -> None:
+    service = ExchangeRateService()
+    results = await service.get_available_dates(start_date=date(2023, 1, 10), end_date=date(2023, 1, 15))
+
+    assert results == [date(2023, 1, 15)]
+
+
 @pytest.mark.asyncio
 async def test_get_currency_pairs() -> None:
     service = ExchangeRateService()
@@ -165,6 +180,21 @@ async def test_get_latest_rates_success() -> None:
     assert result_2.as_of == date(2023, 1, 20)
 
 
+@pytest.mark.asyncio
+async def test_get_latest_rates_for_quotes() -> None:
+    service = ExchangeRateService()
+    results = await service.get_latest_rates(
+        Currency("USD"), [Currency("JPY"), Currency("USD"), Currency("GBP")], as_of=date(2023, 1, 19)
+    )
+
+    assert [(str(result.quote_currency_code), result.as_of) for result in results] == [
+        ("JPY", date(2023, 1, 15)),
+        ("USD", date(2023, 1, 19)),
+    ]
+    assert quantize_decimal(results[0].rate) == quantize_decimal("101")
+    assert quantize_decimal(results[1].rate) == quantize_decimal("1")
+
+
 @pytest.mark.asyncio
 async def test_get_historical_rates_success() -> None:
     base_currency_code = Currency("USD")
@@ -186,6 +216,37 @@ async def test_get_historical_rates_success() -> None:
     assert total == 2
 
 
+@pytest.mark.asyncio
+async def test_get_historical_rates_without_usd() -> None:
+    service = ExchangeRateService()
+    results, total = await service.get_historical_rates(
+        base_currency_code=Currency("EUR"),
+        quote_currency_code=Currency("JPY"),
+        start_date=date(2023, 1, 1),
+        end_date=date(2023, 12, 31),
+        limit=1,
+        sort_order="desc",
+    )
+
+    assert total == 2
+    assert len(results) == 1
+    assert results[0].base_currency_code == Currency("EUR")
+    assert results[0].quote_currency_code == Currency("JPY")
+    assert results[0].as_of == date(2023, 1, 20)
+    assert results[0].rate == Decimal("117.24137931")
+
+    results, _total = await service.get_historical_rates(
+        base_currency_code=Currency("EUR"),
+        quote_currency_code=Currency("JPY"),
+        start_date=date(2023, 1, 1),
+        end_date=date(2023, 12, 31),
+        sort_order="desc",
+        after=date(2023, 1, 20),
+    )
+
+    assert [(result.as_of, result.rate) for result in results] == [(date(2023, 1, 1), Decimal("117.64705882"))]
+
+
 @pytest.mark.asyncio
 async def test_get_historical_rates_not_found() -> None:
     base_currency_code = Currency("USD")
@@ -242,6 +303,147 @@ async def test_get_historical_rates_with_sort_order_desc() -> None:
     assert total == 2
 
 
+@pytest.mark.asyncio
+async def test_get_historical_rates_after() -> None:
+    service = ExchangeRateService()
+    results, total = await service.get_historical_rates(
+        base_currency_code=Currency("USD"),
+        quote_currency_code=Currency("JPY"),
+        start_date=date(2023, 1, 1),
+        limit=1,
+        after=date(2023, 1, 1),
+    )
+
+    assert [result.as_of for result in results] == [date(2023, 1, 15)]
+    assert total == 3
+
+    results, total = await service.get_historical_rates(
+        base_currency_code=Currency("USD"),
+        quote_currency_code=Currency("JPY"),
+        start_date=date(2023, 1, 1),
+        sort_order="desc",
+        after=date(2023, 1, 20),
+    )
+
+    assert [result.as_of for result in results] == [date(2023, 1, 15), date(2023, 1, 1)]
+    assert total == 3
+
+
+@pytest.mark.asyncio
+async def test_get_historical_rates_without_total() -> None:
+    service = ExchangeRateService()
+    results, total = await service.get_historical_rates(
+        base_currency_code=Currency("USD"),
+        quote_currency_code=Currency("JPY"),
+        start_date=date(2023, 1, 1),
+        include_total=False,
+    )
+
+    assert len(results) == 3
+    assert total is None
+
+
+@pytest.mark.asyncio
+async def test_get_historical_rates_total_within_range() -> None:
+    service = ExchangeRateService()
+    results, total = await service.get_historical_rates(
+        base_currency_code=Currency("USD"),
+        quote_currency_code=Currency("JPY"),
+        start_date=date(2023, 1, 2),
+        end_date=date(2023, 1, 15),
+        limit=1,
+    )
+
+    assert [result.as_of for result in results] == [date(2023, 1, 15)]
+    assert total == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_rates_success(test_database: DatabaseTestHelper) -> None:
+    service = ExchangeRateService()
+    await service.bulk_create_rates(
+        [
+            CreateRateParams(
+                as_of=date(2023, 1, 30),
+                base_currency_code=Currency("USD"),
+                quote_currency_code=Currency("EUR"),
+                rate=Decimal("0.9"),
+                source="test",
+            ),
+            CreateRateParams(
+                as_of=date(2023, 1, 31),
+                base_currency_code=Currency("USD"),
+                quote_currency_code=Currency("JPY"),
+                rate=Decimal("103"),
+                source="test",
+            ),
+            CreateRateParams(
+                as_of=date(2023, 1, 31),
+                base_currency_code=Currency("USD"),
+                quote_currency_code=Currency("USD"),
+                rate=Decimal("1"),
+                source="test",
+            ),
+        ]
+    )
+
+    assert await test_database.count_records(ExchangeRate) == 16
+
+    inverse_rate = await ExchangeRate.get(as_of=date(2023, 1, 31), base_currency_code="JPY", quote_currency_code="USD")
+    assert inverse_rate.rate == quantize_decimal(1 / Decimal("103"))
+    assert inverse_rate.data_source == "test"
+
+    assert await service.get_available_dates() == [
+        date(2023, 1, 1),
+        date(2023, 1, 15),
+        date(2023, 1, 20),
+        date(2023, 1, 30),
+        date(2023, 1, 31),
+    ]
+
+    usd_jpy = await CurrencyPairCatalogEntry.get(base_currency_code="USD", quote_currency_code="JPY")
+    assert (usd_jpy.first_date, usd_jpy.last_date) == (date(2023, 1, 1), date(2023, 1, 31))
+    eur_usd = await CurrencyPairCatalogEntry.get(base_currency_code="EUR", quote_currency_code="USD")
+    assert (eur_usd.first_date, eur_usd.last_date) == (date(2023, 1, 1), date(2023, 1, 30))
+
+    usd_jpy_changes = await service.get_rate_changes(Currency("USD"), Currency("JPY"))
+    assert [
+        (change.period, change.as_of, change.previous_as_of, change.change_percent) for change in usd_jpy_changes
+    ] == [
+        ("1d", date(2023, 1, 31), date(2023, 1, 20), Decimal("0.98039216")),
+        ("7d", date(2023, 1, 31), date(2023, 1, 20), Decimal("0.98039216")),
+        ("30d", date(2023, 1, 31), date(2023, 1, 1), Decimal("3")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_rates_updates_existing_rates(test_database: DatabaseTestHelper) -> None:
+    service = ExchangeRateService()
+    await service.bulk_create_rates(
+        [
+            CreateRateParams(
+                as_of=date(2023, 1, 1),
+                base_currency_code=Currency("USD"),
+                quote_currency_code=Currency("EUR"),
+                rate=Decimal("0.8"),
+                source="corrected",
+            ),
+        ]
+    )
+
+    assert await test_database.count_records(ExchangeRate) == 12
+
+    forward_rate = await ExchangeRate.get(as_of=date(2023, 1, 1), base_currency_code="USD", quote_currency_code="EUR")
+    assert forward_rate.rate == Decimal("0.8")
+    assert forward_rate.data_source == "corrected"
+
+    inverse_rate = await ExchangeRate.get(as_of=date(2023, 1, 1), base_currency_code="EUR", quote_currency_code="USD")
+    assert inverse_rate.rate == Decimal("1.25")
+
+    usd_eur = await CurrencyPairCatalogEntry.get(base_currency_code="USD", quote_currency_code="EUR")
+    assert (usd_eur.first_date, usd_eur.last_date) == (date(2023, 1, 1), date(2023, 1, 20))
+
+
 @pytest.mark.asyncio
 async def test_create_rate_success() -> None:
     base_currency_code = Currency("USD")
@@ -268,6 +470,67 @@ async def test_create_rate_success() -> None:
     assert result[1].as_of == as_of
     assert result[1].data_source == source
 
+    assert as_of in await service.get_available_dates()
+
+
+@pytest.mark.asyncio
+async def test_rebuild_catalogs(test_database: DatabaseTestHelper) -> None:
+    await test_database.clear_table(ExchangeRateDate)
+    service = ExchangeRateService()
+    assert await service.get_available_dates() == []
+
+    await service.rebuild_catalogs()
+
+    assert await service.get_available_dates() == [date(2023, 1, 1), date(2023, 1, 15), date(2023, 1, 20)]
+
+
+@pytest.mark.asyncio
+async def test_get_rate_changes(test_database: DatabaseTestHelper) -> None:
+    service = ExchangeRateService()
+    changes = await service.get_rate_changes(Currency("USD"), Currency("JPY"))
+
+    assert [
+        (change.period, change.as_of, change.rate, change.previous_as_of, change.previous_rate, change.change_percent)
+        for change in changes
+    ] == [
+        ("1d", date(2023, 1, 20), Decimal("102"), date(2023, 1, 15), Decimal("101"), Decimal("0.99009901")),
+        ("7d", date(2023, 1, 20), Decimal("102"), date(2023, 1, 1), Decimal("100"), Decimal("2")),
+    ]
+
+    # Derived from the rate matrix the same way for pairs without stored changes
+    await test_database.clear_table(ExchangeRateChange)
+    assert [
+        (change.period, change.as_of, change.rate, change.previous_as_of, change.previous_rate, change.change_percent)
+        for change in await service.get_rate_changes(Currency("USD"), Currency("JPY"))
+    ] == [
+        ("1d", date(2023, 1, 20), Decimal("102"), date(2023, 1, 15), Decimal("101"), Decimal("0.99009901")),
+        ("7d", date(2023, 1, 20), Decimal("102"), date(2023, 1, 1), Decimal("100"), Decimal("2")),
+    ]
+
+    cross_changes = await service.get_rate_changes(Currency("EUR"), Currency("JPY"))
+    assert [(change.period, change.previous_as_of, change.change_percent) for change in cross_changes] == [
+        ("1d", date(2023, 1, 1), Decimal("-0.34482758")),
+        ("7d", date(2023, 1, 1), Decimal("-0.34482758")),
+    ]
+
+    assert await service.get_rate_changes(Currency("USD"), Currency("CHF")) == []
+
+
+@pytest.mark.asyncio
+async def test_rebuild_catalogs_rebuilds_rate_changes(test_database: DatabaseTestHelper) -> None:
+    await test_database.clear_table(ExchangeRateChange)
+    service = ExchangeRateService()
+
+    await service.rebuild_catalogs()
+
+    usd_eur = await ExchangeRateChange.get(base_currency_code="USD", quote_currency_code="EUR", period="1d")
+    assert (usd_eur.as_of, usd_eur.previous_as_of, usd_eur.change_percent) == (
+        date(2023, 1, 20),
+        date(2023, 1, 1),
+        Decimal("2.35294118"),
+    )
+    assert await test_database.count_records(ExchangeRateChange) == 8
+
 
 @pytest.mark.asyncio
 async def test_create_rate_failure() -> None:
@@ -284,3 +547,218 @@ async def test_create_rate_failure() -> None:
 
     expected_message = f"Failed to create exchange rate for {base_currency_code} to {quote_currency_code} on {as_of}"
     assert expected_message in str(err.value)
+
+
+@pytest.mark.asyncio
+async def test_get_historical_series_with_resolution() -> None:
+    service = ExchangeRateService()
+    series, total = await service.get_historical_series(
+        Currency("USD"),
+        Currency("JPY"),
+        start_date=date(2022, 12, 1),
+        end_date=date(2023, 1, 31),
+        sort_order="desc",
+        limit=1,
+        resolution="weekly",
+    )
+
+    # Weeks of 2023-01-01, 2023-01-15 and 2023-01-20, paged after downsampling
+    assert total == 3
+    assert list(series) == [(date(2023, 1, 20), Decimal("102"))]
+
+    series, total = await service.get_historical_series(
+        Currency("USD"), Currency("JPY"), start_date=date(2022, 12, 1), end_date=date(2023, 1, 31), resolution="monthly"
+    )
+    assert total == 1
+    assert list(series) == [(date(2023, 1, 20), Decimal("102"))]
+
+
+@pytest.mark.asyncio
+async def test_get_rate_aggregates() -> None:
+    service = ExchangeRateService()
+    aggregates = await service.get_rate_aggregates(
+        Currency("USD"), Currency("JPY"), start_date=date(2022, 12, 1), end_date=date(2023, 1, 31), interval="daily"
+    )
+
+    assert [
+        (aggregate.change_percent, aggregate.rolling_mean, aggregate.rolling_stdev) for aggregate in aggregates
+    ] == [
+        (None, None, None),
+        *(
+            (to_fixed_point(Decimal(change)), to_fixed_point(Decimal(mean)), to_fixed_point(Decimal("0.70710678")))
+            for change, mean in [("1", "100.5"), ("0.99009901", "101.5")]
+        ),
+    ]
+
+    (aggregate,) = await service.get_rate_aggregates(
+        Currency("USD"), Currency("JPY"), start_date=date(2022, 12, 1), end_date=date(2023, 1, 31)
+    )
+    assert (aggregate.open, aggregate.high, aggregate.low, aggregate.close) == (
+        to_fixed_point(Decimal("100")),
+        to_fixed_point(Decimal("102")),
+        to_fixed_point(Decimal("100")),
+        to_fixed_point(Decimal("102")),
+    )
+    assert aggregate.start_ordinal == date(2023, 1, 1).toordinal()
+    assert aggregate.end_ordinal == date(2023, 1, 20).toordinal()
+
+
+@pytest.mark.asyncio
+async def test_get_historical_series_for_pairs() -> None:
+    service = ExchangeRateService()
+    results = await service.get_historical_series_for_pairs(
+        [
+            CurrencyPair(base_currency_code=Currency("USD"), quote_currency_code=Currency("JPY")),
+            CurrencyPair(base_currency_code=Currency("EUR"), quote_currency_code=Currency("JPY")),
+            CurrencyPair(base_currency_code=Currency("USD"), quote_currency_code=Currency("GBP")),
+        ],
+        start_date=date(2023, 1, 10),
+        end_date=date(2023, 1, 31),
+    )
+
+    assert [list(series) for series in results] == [
+        [(date(2023, 1, 15), Decimal("101")), (date(2023, 1, 20), Decimal("102"))],
+        [(date(2023, 1, 20), Decimal("117.24137931"))],
+        [],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_historical_rates() -> None:
+    service = ExchangeRateService()
+    chunks = [
+        list(chunk)
+        async for chunk in service.iter_historical_rates(
+            Currency("USD"), Currency("JPY"), date(2023, 1, 1), date(2023, 1, 31), sort_order="desc", chunk_size=2
+        )
+    ]
+
+    assert chunks == [
+        [(date(2023, 1, 20), Decimal("102")), (date(2023, 1, 15), Decimal("101"))],
+        [(date(2023, 1, 1), Decimal("100"))],
+    ]
+
+    chunks = [
+        list(chunk)
+        async for chunk in service.iter_historical_rates(
+            Currency("USD"), Currency("JPY"), date(2023, 1, 1), date(2023, 1, 31), chunk_size=1
+        )
+    ]
+    assert chunks == [
+        [(date(2023, 1, 1), Decimal("100"))],
+        [(date(2023, 1, 15), Decimal("101"))],
+        [(date(2023, 1, 20), Decimal("102"))],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_historical_rates_does_not_hold_a_connection_between_chunks() -> None:
+    service = ExchangeRateService()
+    chunks = service.iter_historical_rates(
+        Currency("USD"), Currency("JPY"), date(2023, 1, 1), date(2023, 1, 31), chunk_size=1
+    )
+    assert list(await anext(chunks)) == [(date(2023, 1, 1), Decimal("100"))]
+
+    # No snapshot is kept open while the export is paused, so rates saved meanwhile are exported
+    await service.bulk_create_rates(
+        [
+            CreateRateParams(
+                as_of=date(2023, 1, 10),
+                base_currency_code=Currency("USD"),
+                quote_currency_code=Currency("JPY"),
+                rate=Decimal("100.5"),
+                source="test",
+            )
+        ]
+    )
+    assert [rate async for chunk in chunks for rate in chunk] == [
+        (date(2023, 1, 10), Decimal("100.5")),
+        (date(2023, 1, 15), Decimal("101")),
+        (date(2023, 1, 20), Decimal("102")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_historical_rates_without_usd() -> None:
+    service = ExchangeRateService()
+    rates = [
+        rate
+        async for chunk in service.iter_historical_rates(
+            Currency("EUR"), Currency("JPY"), date(2023, 1, 1), date(2023, 1, 31)
+        )
+        for rate in chunk
+    ]
+
+    # Matches the cross rates derived by the rate matrix
+    series, _total = await service.get_historical_series(
+        Currency("EUR"), Currency("JPY"), start_date=date(2023, 1, 1), end_date=date(2023, 1, 31)
+    )
+    assert rates == list(series)
+    assert rates == [(date(2023, 1, 1), Decimal("117.64705882")), (date(2023, 1, 20), Decimal("117.24137931"))]
+
+    # Small USD legs are taken through their inverse, as in the rate matrix
+    await ExchangeRate.bulk_create(
+        build_exchange_rate_pair(
+            quote_currency_code=Currency("BTC"), as_of=date(2023, 1, 20), rate=Decimal("0.0000166669")
+        )
+    )
+    # Rates inserted directly are not in the pair catalog until it is updated
+    await CurrencyPairCatalogEntry.filter(base_currency_code="USD", quote_currency_code="BTC").update(
+        last_date=date(2023, 1, 20)
+    )
+    currency_pair_catalog.invalidate()
+    rates = [
+        rate
+        async for chunk in service.iter_historical_rates(
+            Currency("BTC"), Currency("JPY"), date(2023, 1, 20), date(2023, 1, 31)
+        )
+        for rate in chunk
+    ]
+    assert rates == [(date(2023, 1, 20), Decimal("6119914.32119952"))]
+
+
+@pytest.mark.asyncio
+async def test_iter_historical_rates_reads_only_the_stored_date_range() -> None:
+    service = ExchangeRateService()
+    client = Tortoise.get_connection("default")
+    await currency_pair_catalog.ensure_loaded()
+
+    with patch.object(client, "execute_query", wraps=client.execute_query) as mock_execute_query:
+        # Pairs without stored rates are not queried
+        assert [
+            chunk
+            async for chunk in service.iter_historical_rates(
+                Currency("USD"), Currency("GBP"), date(2000, 1, 1), date(2023, 12, 31)
+            )
+        ] == []
+        mock_execute_query.assert_not_called()
+
+        # A full chunk ending on the pair's last date is not followed by a query for the dates after it
+        chunks = [
+            list(chunk)
+            async for chunk in service.iter_historical_rates(
+                Currency("USD"), Currency("JPY"), date(2000, 1, 1), date(2023, 12, 31), chunk_size=3
+            )
+        ]
+
+    assert chunks == [
+        [(date(2023, 1, 1), Decimal("100")), (date(2023, 1, 15), Decimal("101")), (date(2023, 1, 20), Decimal("102"))]
+    ]
+    mock_execute_query.assert_called_once()
+    assert mock_execute_query.call_args.args[1][2:4] == [date(2023, 1, 1), date(2023, 1, 20)]
+
+
+@pytest.mark.asyncio
+async def test_historical_series_does_not_build_models() -> None:
+    service = ExchangeRateService()
+    rates, rates_total = await service.get_historical_rates(
+        Currency("USD"), Currency("EUR"), start_date=date(2023, 1, 1), end_date=date(2023, 1, 31)
+    )
+
+    with patch.object(ExchangeRate, "__init__", side_effect=AssertionError("ExchangeRate was instantiated")):
+        series, series_total = await service.get_historical_series(
+            Currency("USD"), Currency("EUR"), start_date=date(2023, 1, 1), end_date=date(2023, 1, 31)
+        )
+
+    assert list(series) == [(rate.as_of, rate.rate) for rate in rates]
+    assert series_total == rates_total == 2
@@ -0,0 +1,51 @@
+from datetime import UTC, date, datetime
+
+import pytest
+
+from app.models import RefreshLedgerEntry, RefreshStatus
+from app.services.refresh_ledger_service import RefreshLedgerService
+from tests.support.database_test_helper import DatabaseTestHelper
+
+
+@pytest.mark.asyncio
+async def test_mark_pending_counts_attempts(test_database: DatabaseTestHelper) -> None:
+    service = RefreshLedgerService()
+
+    await service.mark_pending([date(2025, 1, 1), date(2025, 1, 2)])
+    await service.mark_failed([date(2025, 1, 2)], "Limit reached")
+    await service.mark_pending([date(2025, 1, 2)])
+
+    entries = await service.get_entries(date(2025, 1, 1), date(2025, 1, 31))
+    assert [(entry.as_of, entry.status, entry.attempts) for entry in entries] == [
+        (date(2025, 1, 1), RefreshStatus.PENDING, 1),
+        (date(2025, 1, 2), RefreshStatus.PENDING, 2),
+    ]
+    assert all(entry.error is None for entry in entries)
+
+
+@pytest.mark.asyncio
+async def test_mark_failed_records_error(test_database: DatabaseTestHelper) -> None:
+    service = RefreshLedgerService()
+
+    await service.mark_pending([date(2025, 1, 1)])
+    await service.mark_failed([date(2025, 1, 1)], "Limit reached")
+
+    entry = await RefreshLedgerEntry.get(as_of=date(2025, 1, 1))
+    assert entry.status == RefreshStatus.FAILED
+    assert entry.attempts == 1
+    assert entry.error == "Limit reached"
+    assert entry.fetched_at is None
+
+
+@pytest.mark.asyncio
+async def test_get_saved_dates(test_database: DatabaseTestHelper) -> None:
+    service = RefreshLedgerService()
+    fetched_at = datetime(2025, 1, 5, 12, tzinfo=UTC)
+
+    await service.mark_pending([date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)])
+    await service.mark_saved([date(2025, 1, 1), date(2025, 1, 3), date(2025, 2, 1)], fetched_at=fetched_at)
+
+    assert await service.get_saved_dates(date(2025, 1, 1), date(2025, 1, 31)) == {date(2025, 1, 1), date(2025, 1, 3)}
+    entry = await RefreshLedgerEntry.get(as_of=date(2025, 1, 3))
+    assert entry.fetched_at == fetched_at
+    assert await test_database.count_records(RefreshLedgerEntry) == 4
@@ -0,0 +1,60 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+from redis.exceptions import ConnectionError
+
+
+class FakePubSub:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.messages: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def subscribe(self, channel: str) -> None:
+        self.redis.subscribers.setdefault(channel, []).append(self)
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        while True:
+            yield await self.messages.get()
+
+    async def aclose(self) -> None:
+        for subscribers in self.redis.subscribers.values():
+            if self in subscribers:
+                subscribers.remove(self)
+
+
+class FakeRedis:
+    """In-memory stand-in for the parts of redis.asyncio.Redis used by the shared response cache."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+        self.expirations: dict[str, int | None] = {}
+        self.subscribers: dict[str, list[FakePubSub]] = {}
+        self.available = True
+        self.closed = False
+
+    def _check_available(self) -> None:
+        if not self.available:
+            raise ConnectionError("Redis is unavailable")
+
+    async def get(self, key: str) -> bytes | None:
+        self._check_available()
+        return self.values.get(key)
+
+    async def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        self._check_available()
+        self.values[key] = value
+        self.expirations[key] = ex
+
+    async def publish(self, channel: str, message: str) -> int:
+        self._check_available()
+        subscribers = self.subscribers.get(channel, [])
+        for subscriber in subscribers:
+            subscriber.messages.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(subscribers)
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self)
+
+    async def aclose(self) -> None:
+        self.closed = True
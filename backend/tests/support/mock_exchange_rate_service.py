@@ -1,15 +1,30 @@
-from datetime import date
+from collections.abc import AsyncIterator
+from datetime import UTC, date, datetime
 from decimal import Decimal
 from typing import Literal
 
-from app.models import Currency, CurrencyPair, ExchangeRate
+from app.models import Currency, CurrencyPair, ExchangeRate, ExchangeRateChange, ExchangeRateValue
+from app.repositories.data_version import DataVersionSnapshot
+from app.repositories.rate_series import (
+    DEFAULT_LTTB_POINTS,
+    AggregateInterval,
+    RateAggregate,
+    RateSeries,
+    Resolution,
+    aggregate_series,
+)
 from app.services.exchange_rate_service import ExchangeRateServiceInterface
 from tests.support.factories import build_exchange_rate
 
 
 class MockExchangeRateService(ExchangeRateServiceInterface):
-    async def get_available_dates(self) -> list[date]:
-        return [date(2025, 4, 1), date(2025, 4, 2), date(2025, 4, 3)]
+    async def get_available_dates(self, start_date: date | None = None, end_date: date | None = None) -> list[date]:
+        available_dates = [date(2025, 4, 1), date(2025, 4, 2), date(2025, 4, 3)]
+        return [
+            available_date
+            for available_date in available_dates
+            if (start_date is None or available_date >= start_date) and (end_date is None or available_date <= end_date)
+        ]
 
     async def get_currency_pairs(self) -> list[CurrencyPair]:
         return [
@@ -23,6 +38,9 @@ class MockExchangeRateService(ExchangeRateServiceInterface):
             CurrencyPair(base_currency_code=Currency("USD"), quote_currency_code=Currency("SGD")),
         ]
 
+    async def get_data_version(self) -> DataVersionSnapshot:
+        return DataVersionSnapshot(version=1, updated_at=datetime(2025, 4, 3, 12, tzinfo=UTC))
+
     async def get_latest_rate(
         self, base_currency_code: Currency, quote_currency_code: Currency, as_of: date | None = None
     ) -> ExchangeRate | None:
@@ -50,9 +68,48 @@ class MockExchangeRateService(ExchangeRateServiceInterface):
                 rate=Decimal("1.09000000"),
                 as_of=as_of,
             )
+        elif base_currency_code == Currency("GBP") and quote_currency_code == Currency("EUR"):
+            return build_exchange_rate(
+                base_currency_code=base_currency_code,
+                quote_currency_code=quote_currency_code,
+                rate=Decimal("0.93577982"),
+                as_of=as_of,
+            )
 
         return None
 
+    async def get_latest_rates(
+        self,
+        base_currency_code: Currency,
+        quote_currency_codes: list[Currency] | None = None,
+        as_of: date | None = None,
+    ) -> list[ExchangeRate]:
+        if quote_currency_codes is None:
+            quote_currency_codes = [Currency("EUR"), Currency("GBP")]
+
+        latest_rates = []
+        for quote_currency_code in sorted(quote_currency_codes):
+            latest_rate = await self.get_latest_rate(base_currency_code, quote_currency_code, as_of)
+            if latest_rate is not None:
+                latest_rates.append(latest_rate)
+
+        return latest_rates
+
+    async def get_latest_rate_value(
+        self, base_currency_code: Currency, quote_currency_code: Currency, as_of: date | None = None
+    ) -> ExchangeRateValue | None:
+        latest_rate = await self.get_latest_rate(base_currency_code, quote_currency_code, as_of)
+        return ExchangeRateValue.from_model(latest_rate) if latest_rate is not None else None
+
+    async def get_latest_rate_values(
+        self,
+        base_currency_code: Currency,
+        quote_currency_codes: list[Currency] | None = None,
+        as_of: date | None = None,
+    ) -> list[ExchangeRateValue]:
+        latest_rates = await self.get_latest_rates(base_currency_code, quote_currency_codes, as_of)
+        return [ExchangeRateValue.from_model(latest_rate) for latest_rate in latest_rates]
+
     async def get_historical_rates(
         self,
         base_currency_code: Currency,
@@ -62,7 +119,9 @@ class MockExchangeRateService(ExchangeRateServiceInterface):
         limit: int | None = None,
         offset: int | None = None,
         sort_order: Literal["asc", "desc"] = "asc",
-    ) -> tuple[list[ExchangeRate], int]:
+        after: date | None = None,
+        include_total: bool = True,
+    ) -> tuple[list[ExchangeRate], int | None]:
         rates = [
             build_exchange_rate(
                 as_of=date(2024, 1, 1),
@@ -113,7 +172,7 @@ class MockExchangeRateService(ExchangeRateServiceInterface):
                 rate=Decimal("0.92000000"),
             ),
         ]
-        total = len(rates)
+        total = len(rates) if include_total else None
 
         if start_date is not None:
             rates = [rate for rate in rates if rate.as_of >= start_date]
@@ -121,6 +180,12 @@ class MockExchangeRateService(ExchangeRateServiceInterface):
         if end_date is not None:
             rates = [rate for rate in rates if rate.as_of <= end_date]
 
+        if after is not None:
+            if sort_order == "desc":
+                rates = [rate for rate in rates if rate.as_of < after]
+            else:
+                rates = [rate for rate in rates if rate.as_of > after]
+
         if offset is not None:
             rates = rates[offset:]
 
@@ -131,3 +196,112 @@ class MockExchangeRateService(ExchangeRateServiceInterface):
             rates.reverse()
 
         return rates, total
+
+    async def get_historical_series(
+        self,
+        base_currency_code: Currency,
+        quote_currency_code: Currency,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        sort_order: Literal["asc", "desc"] = "asc",
+        after: date | None = None,
+        include_total: bool = True,
+        resolution: Resolution = "daily",
+        points: int = DEFAULT_LTTB_POINTS,
+    ) -> tuple[RateSeries, int | None]:
+        rates, total = await self.get_historical_rates(
+            base_currency_code=base_currency_code,
+            quote_currency_code=quote_currency_code,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            offset=offset,
+            sort_order=sort_order,
+            after=after,
+            include_total=include_total,
+        )
+        series = RateSeries.from_rates(sorted((rate.as_of, rate.rate) for rate in rates))
+        series = series.resample(resolution, points)
+        return series[::-1] if sort_order == "desc" else series, total
+
+    async def get_historical_series_for_pairs(
+        self,
+        currency_pairs: list[CurrencyPair],
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[RateSeries]:
+        series_list = []
+        for pair in currency_pairs:
+            series, _total = await self.get_historical_series(
+                base_currency_code=pair.base_currency_code,
+                quote_currency_code=pair.quote_currency_code,
+                start_date=start_date,
+                end_date=end_date,
+                include_total=False,
+            )
+            series_list.append(series)
+        return series_list
+
+    async def get_rate_aggregates(
+        self,
+        base_currency_code: Currency,
+        quote_currency_code: Currency,
+        start_date: date,
+        end_date: date,
+        interval: AggregateInterval = "monthly",
+        window: int = 2,
+    ) -> list[RateAggregate]:
+        series, _total = await self.get_historical_series(
+            base_currency_code=base_currency_code,
+            quote_currency_code=quote_currency_code,
+            start_date=start_date,
+            end_date=end_date,
+            include_total=False,
+        )
+        return aggregate_series(series, interval, window)
+
+    async def get_rate_changes(
+        self, base_currency_code: Currency, quote_currency_code: Currency
+    ) -> list[ExchangeRateChange]:
+        if base_currency_code != Currency("USD") or quote_currency_code != Currency("EUR"):
+            return []
+
+        return [
+            ExchangeRateChange(
+                base_currency_code=base_currency_code,
+                quote_currency_code=quote_currency_code,
+                period=period,
+                as_of=date(2024, 10, 31),
+                rate=Decimal("0.92"),
+                previous_as_of=previous_as_of,
+                previous_rate=previous_rate,
+                change_percent=change_percent,
+            )
+            for period, previous_as_of, previous_rate, change_percent in [
+                ("1d", date(2024, 10, 22), Decimal("0.95"), Decimal("-3.15789474")),
+                ("7d", date(2024, 10, 22), Decimal("0.95"), Decimal("-3.15789474")),
+                ("30d", date(2024, 4, 2), Decimal("1.12"), Decimal("-17.85714286")),
+            ]
+        ]
+
+    async def iter_historical_rates(
+        self,
+        base_currency_code: Currency,
+        quote_currency_code: Currency,
+        start_date: date,
+        end_date: date,
+        sort_order: Literal["asc", "desc"] = "asc",
+        chunk_size: int = 1_000,
+    ) -> AsyncIterator[RateSeries]:
+        series, _total = await self.get_historical_series(
+            base_currency_code=base_currency_code,
+            quote_currency_code=quote_currency_code,
+            start_date=start_date,
+            end_date=end_date,
+            sort_order=sort_order,
+            include_total=False,
+        )
+        for start_index in range(0, len(series), chunk_size):
+            yield series[start_index : start_index + chunk_size]
@@ -5,10 +5,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from app.models import Currency
+from app.models import Currency, ExchangeRateChange
 from app.services.exchange_rate_service import ExchangeRateServiceInterface
 from app.tasks.notifications import send_exchange_rate_refresh_email
-from tests.support.factories import build_exchange_rate
 
 
 @pytest.fixture
@@ -25,21 +24,28 @@ def mock_logger() -> Generator[AsyncMock]:
 async def test_send_exchange_rate_refresh_email_success() -> None:
     mock_exchange_rate_service = MagicMock(spec=ExchangeRateServiceInterface)
 
-    latest_rate = build_exchange_rate(
-        as_of=date(2024, 5, 2),
+    daily_change = ExchangeRateChange(
         base_currency_code=Currency("SGD"),
         quote_currency_code=Currency("USD"),
+        period="1d",
+        as_of=date(2024, 5, 2),
         rate=Decimal("0.75"),
+        previous_as_of=date(2024, 5, 1),
+        previous_rate=Decimal("0.72"),
+        change_percent=Decimal("4.16666667"),
     )
-
-    previous_rate = build_exchange_rate(
-        as_of=date(2024, 5, 1),
+    weekly_change = ExchangeRateChange(
         base_currency_code=Currency("SGD"),
         quote_currency_code=Currency("USD"),
-        rate=Decimal("0.72"),
+        period="7d",
+        as_of=date(2024, 5, 2),
+        rate=Decimal("0.75"),
+        previous_as_of=date(2024, 4, 25),
+        previous_rate=Decimal("0.7"),
+        change_percent=Decimal("7.14285714"),
     )
 
-    mock_exchange_rate_service.get_historical_rates.return_value = [latest_rate, previous_rate], 2
+    mock_exchange_rate_service.get_rate_changes.return_value = [daily_change, weekly_change]
 
     with (
         patch("app.tasks.notifications.email_settings") as mock_email_settings,
@@ -52,14 +58,12 @@ async def test_send_exchange_rate_refresh_email_success() -> None:
 
         await send_exchange_rate_refresh_email(exchange_rate_service=mock_exchange_rate_service)
 
-        mock_exchange_rate_service.get_historical_rates.assert_called_once_with(
-            base_currency_code=Currency("SGD"), quote_currency_code=Currency("USD"), limit=2, sort_order="desc"
-        )
+        mock_exchange_rate_service.get_rate_changes.assert_called_once_with(Currency("SGD"), Currency("USD"))
 
-        expected_subject = f"[ExchangeHouse] Exchange rates for {latest_rate.as_of}"
+        expected_subject = f"[ExchangeHouse] Exchange rates for {daily_change.as_of}"
         expected_body_content = [
-            f"SGDUSD rate for {latest_rate.as_of} = {latest_rate.rate:.4f}",
-            f"(4.17% from {previous_rate.as_of})",
+            f"SGDUSD rate for {daily_change.as_of} = {daily_change.rate:.4f}",
+            f"(4.17% from {daily_change.previous_as_of})",
         ]
 
         mock_email_service_class.assert_called_once()
@@ -83,7 +87,7 @@ async def test_send_exchange_rate_refresh_email_no_admin_email(mock_logger: Magi
 
         await send_exchange_rate_refresh_email(exchange_rate_service=mock_exchange_rate_service)
 
-        mock_exchange_rate_service.get_historical_rates.assert_not_called()
+        mock_exchange_rate_service.get_rate_changes.assert_not_called()
         mock_email_service_class.assert_not_called()
         mock_logger.warning.assert_called_once_with("No admin email found")
 
@@ -92,32 +96,8 @@ async def test_send_exchange_rate_refresh_email_no_admin_email(mock_logger: Magi
 async def test_send_exchange_rate_refresh_email_not_enough_rates(mock_logger: MagicMock) -> None:
     mock_exchange_rate_service = AsyncMock(spec=ExchangeRateServiceInterface)
 
-    latest_rate = build_exchange_rate(
-        as_of=date(2024, 5, 2),
-        base_currency_code=Currency("SGD"),
-        quote_currency_code=Currency("USD"),
-        rate=Decimal("0.75"),
-    )
-    mock_exchange_rate_service.get_historical_rates.return_value = [latest_rate], 1
-
-    with (
-        patch("app.tasks.notifications.email_settings") as mock_email_settings,
-        patch("app.tasks.notifications.EmailService") as mock_email_service_class,
-    ):
-        mock_email_settings.admin_email = "admin@example.com"
-
-        await send_exchange_rate_refresh_email(exchange_rate_service=mock_exchange_rate_service)
-
-        mock_exchange_rate_service.get_historical_rates.assert_called_once()
-        mock_email_service_class.assert_not_called()
-        mock_logger.warning.assert_called_once_with("Not enough exchange rates found")
-
-
-@pytest.mark.asyncio
-async def test_send_exchange_rate_refresh_email_empty_rates(mock_logger: MagicMock) -> None:
-    mock_exchange_rate_service = AsyncMock(spec=ExchangeRateServiceInterface)
-
-    mock_exchange_rate_service.get_historical_rates.return_value = [], 0
+    # No earlier rate to compare the latest one with
+    mock_exchange_rate_service.get_rate_changes.return_value = []
 
     with (
         patch("app.tasks.notifications.email_settings") as mock_email_settings,
@@ -127,6 +107,6 @@ async def test_send_exchange_rate_refresh_email_empty_rates(mock_logger: MagicMo
 
         await send_exchange_rate_refresh_email(exchange_rate_service=mock_exchange_rate_service)
 
-        mock_exchange_rate_service.get_historical_rates.assert_called_once()
+        mock_exchange_rate_service.get_rate_changes.assert_called_once()
         mock_email_service_class.assert_not_called()
         mock_logger.warning.assert_called_once_with("Not enough exchange rates found")